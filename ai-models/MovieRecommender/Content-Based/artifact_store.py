@@ -0,0 +1,182 @@
+"""
+Memory-map edilebilir content artefakt düzeni.
+
+``tfidf_matrix.npz`` ve ``metadata.parquet`` her yüklemede sıkıştırılmış
+veriyi açıp process'e özel belleğe kopyalar. Burada aynı veriler sıkıştırılmamış
+``.npy`` dizileri ve ofset indeksli metin blob'ları olarak yazılır; okurken
+``np.load(mmap_mode="r")`` kullanıldığı için birden fazla api_server worker'ı
+işletim sisteminin sayfa önbelleğindeki tek kopyayı paylaşır.
+
+Düzen::
+
+    tfidf_csr-<sürüm>/        data.npy, indices.npy, indptr.npy, shape.npy
+    metadata_store-<sürüm>/   <kolon>.npy (sayısal kolonlar)
+                              <kolon>.bin + <kolon>.offsets.npy (metin kolonları)
+
+Buradaki ``save_*`` fonksiyonları verilen klasöre doğrudan yazar; mmap ile
+açık dosyaların üzerine yazılmaması için data_pipeline her build'de yeni
+sürümlü klasör yayınlar ve ``content_meta.json``'u (``mmap_layout``) en son
+bu klasörlere çevirir.
+"""
+from __future__ import annotations
+
+import mmap
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+CSR_FILES = ("data.npy", "indices.npy", "indptr.npy", "shape.npy")
+NUMERIC_COLUMNS = {
+    "tmdb_id": np.int64,
+    "matrix_index": np.int32,
+    "vote_average": np.float32,
+    "vote_count": np.int32,
+}
+# Sonradan eklenen kolonlar; eski artefaktlarda yoksa yükleyici varsayılana düşer
+OPTIONAL_NUMERIC_COLUMNS = {
+    "release_year": np.int16,
+}
+TEXT_COLUMNS = ("title", "genres", "overview")
+
+
+def _index_dtype(max_value: int) -> type:
+    return np.int32 if max_value <= np.iinfo(np.int32).max else np.int64
+
+
+def save_csr(directory: Path, matrix: sparse.csr_matrix) -> None:
+    """CSR dizilerini sıkıştırmadan ayrı ``.npy`` dosyalarına yazar."""
+    directory.mkdir(parents=True, exist_ok=True)
+    matrix = sparse.csr_matrix(matrix)
+    if not matrix.has_sorted_indices:
+        matrix = matrix.sorted_indices()  # kopya; çağıranın matrisi değişmez
+    idx_dtype = _index_dtype(max(matrix.nnz, matrix.shape[1]))
+    np.save(directory / "data.npy", matrix.data.astype(np.float32, copy=False))
+    np.save(directory / "indices.npy", matrix.indices.astype(idx_dtype, copy=False))
+    np.save(directory / "indptr.npy", matrix.indptr.astype(idx_dtype, copy=False))
+    np.save(directory / "shape.npy", np.asarray(matrix.shape, dtype=np.int64))
+
+
+def csr_exists(directory: Path) -> bool:
+    return all((directory / name).exists() for name in CSR_FILES)
+
+
+def load_csr(directory: Path, *, mmap: bool = True) -> sparse.csr_matrix:
+    """
+    CSR matrisini diziler üzerinden kopyasız kurar.
+
+    ``mmap=True`` iken diziler salt okunur memmap'tir; matrisi yerinde
+    değiştiren işlemler (``sort_indices`` vb.) hata verir.
+    """
+    mode = "r" if mmap else None
+    data = np.load(directory / "data.npy", mmap_mode=mode)
+    indices = np.load(directory / "indices.npy", mmap_mode=mode)
+    indptr = np.load(directory / "indptr.npy", mmap_mode=mode)
+    shape = tuple(int(x) for x in np.load(directory / "shape.npy"))
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    # Dosyalar save_csr ile sıralı yazıldı; scipy'nin tekrar kontrol etmesine gerek yok.
+    matrix.has_sorted_indices = True
+    return matrix
+
+
+class TextColumn:
+    """
+    UTF-8 blob + ofset dizisinden satır bazlı okunan metin kolonu.
+
+    Sadece istenen satırlar decode edilir; blob memmap olduğundan okunmayan
+    metinler RAM'e girmez.
+    """
+
+    def __init__(self, blob: bytes | mmap.mmap | memoryview, offsets: np.ndarray) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def open(cls, directory: Path, name: str) -> "TextColumn":
+        offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode="r")
+        blob_path = directory / f"{name}.bin"
+        if blob_path.stat().st_size == 0:
+            return cls(b"", offsets)
+        with blob_path.open("rb") as f:
+            blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(blob, offsets)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "TextColumn":
+        blob, offsets = encode_text(values)
+        return cls(blob, offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        start = int(self._offsets[row])
+        end = int(self._offsets[row + 1])
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    def take(self, rows: Sequence[int]) -> list[str]:
+        return [self[int(row)] for row in rows]
+
+    def tolist(self) -> list[str]:
+        if len(self) == 0:
+            return []
+        start = int(self._offsets[0])
+        end = int(self._offsets[-1])
+        text = bytes(self._blob[start:end]).decode("utf-8")
+        if len(text) != end - start:
+            # Çok baytlı karakter var: byte ofsetleri karakter sınırı değil.
+            return [self[i] for i in range(len(self))]
+        bounds = (np.asarray(self._offsets) - start).tolist()
+        return [text[bounds[i]:bounds[i + 1]] for i in range(len(self))]
+
+
+def encode_text(values: Iterable[str]) -> tuple[bytes, np.ndarray]:
+    encoded = [("" if pd.isna(v) else str(v)).encode("utf-8") for v in values]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+def save_text_column(directory: Path, name: str, values: Iterable[str]) -> None:
+    blob, offsets = encode_text(values)
+    (directory / f"{name}.bin").write_bytes(blob)
+    np.save(directory / f"{name}.offsets.npy", offsets)
+
+
+def save_metadata_store(directory: Path, metadata: pd.DataFrame) -> None:
+    """
+    Metadata'yı kolon kolon yazar; satır sırası ``matrix_index`` sırasıdır.
+
+    Sayısal kolonlarda NaN ``vote_average`` korunur, ``vote_count`` 0 ile doldurulur.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    ordered = metadata.sort_values("matrix_index", kind="stable")
+    columns = dict(NUMERIC_COLUMNS)
+    columns.update({name: dtype for name, dtype in OPTIONAL_NUMERIC_COLUMNS.items() if name in ordered})
+    for name, dtype in columns.items():
+        column = pd.to_numeric(ordered[name], errors="coerce")
+        if np.issubdtype(dtype, np.integer):
+            column = column.fillna(0)
+        np.save(directory / f"{name}.npy", column.to_numpy(dtype=dtype))
+    for name in TEXT_COLUMNS:
+        save_text_column(directory, name, ordered[name].tolist())
+
+
+def metadata_store_exists(directory: Path) -> bool:
+    required = [f"{name}.npy" for name in NUMERIC_COLUMNS]
+    for name in TEXT_COLUMNS:
+        required += [f"{name}.bin", f"{name}.offsets.npy"]
+    return all((directory / name).exists() for name in required)
+
+
+def load_numeric_column(directory: Path, name: str) -> np.ndarray:
+    return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+
+def load_optional_numeric_column(directory: Path, name: str) -> np.ndarray | None:
+    path = directory / f"{name}.npy"
+    return np.load(path, mmap_mode="r") if path.exists() else None
@@ -3,6 +3,9 @@ from __future__ import annotations
 import argparse
 import ast
 import json
+import os
+import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Tuple
@@ -12,6 +15,15 @@ from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 import pickle
 
+import artifact_store as store
+import recommender_content as rc
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from src import atomic_io  # noqa: E402
+from src.stage_timer import StageTimer  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR / "models"
@@ -25,6 +37,8 @@ DEFAULT_METADATA_PATH = MODELS_DIR / "metadata.parquet"
 VECTORIZER_PATH = MODELS_DIR / "tfidf_vectorizer.pkl"
 MATRIX_PATH = MODELS_DIR / "tfidf_matrix.npz"
 META_JSON_PATH = MODELS_DIR / "content_meta.json"
+CSR_DIR = MODELS_DIR / "tfidf_csr"
+METADATA_STORE_DIR = MODELS_DIR / "metadata_store"
 ARTIFACT_PATHS = (
     VECTORIZER_PATH,
     MATRIX_PATH,
@@ -88,6 +102,11 @@ def parse_args() -> argparse.Namespace:
         default=3,
         help="Genre'ların tekrar sayısı (ağırlık). Varsayılan: 3",
     )
+    parser.add_argument(
+        "--export-mmap",
+        action="store_true",
+        help="Mevcut npz/parquet artefaktlarını yeniden eğitmeden mmap düzenine çevir",
+    )
     parser.add_argument(
         "--rebuild",
         "--overwrite",
@@ -213,6 +232,7 @@ def prepare_metadata(
     use_keywords: bool = True,
     use_credits: bool = True,
     genre_weight: int = 3,
+    timer: StageTimer | None = None,
 ) -> pd.DataFrame:
     """
     Metadata'yı hazırla ve zenginleştirilmiş content string oluştur.
@@ -221,7 +241,26 @@ def prepare_metadata(
         genre_weight: Genre'ların kaç kez tekrarlanacağı (ağırlıklandırma için)
         use_keywords: Keywords.csv'den anahtar kelimeler ekle
         use_credits: Credits.csv'den oyuncu/yönetmen ekle
+        timer: Verilirse "parse" ve "enrich" aşamaları buna kaydedilir
     """
+    timer = timer if timer is not None else StageTimer()
+    with timer.stage("parse") as stage:
+        work = _parse_metadata(df, use_keywords=use_keywords, use_credits=use_credits, genre_weight=genre_weight)
+        stage.rows = len(work)
+    with timer.stage("enrich") as stage:
+        work = _build_content(work, min_content_chars=min_content_chars, to_lower=to_lower)
+        stage.rows = len(work)
+    return work
+
+
+def _parse_metadata(
+    df: pd.DataFrame,
+    *,
+    use_keywords: bool,
+    use_credits: bool,
+    genre_weight: int,
+) -> pd.DataFrame:
+    """Genre/keywords/cast/crew alanlarını parse edip metin kolonlarını ekler."""
     work = df.copy()
     work["id"] = pd.to_numeric(work.get("id"), errors="coerce").astype("Int64")
     work = work.dropna(subset=["id"])
@@ -233,6 +272,7 @@ def prepare_metadata(
         "overview",
         "vote_average",
         "vote_count",
+        "release_date",
     ]
     for col in keep_cols:
         if col not in work.columns:
@@ -241,6 +281,8 @@ def prepare_metadata(
 
     work["title"] = work["title"].fillna("Untitled").astype(str)
     work["overview"] = work["overview"].fillna("").astype(str)
+    # Aynı adlı filmleri ayırt etmek için (başlık çözümlemesi); 0 = bilinmiyor
+    work["release_year"] = pd.to_datetime(work["release_date"], errors="coerce").dt.year.fillna(0).astype(int)
     work["genres_list"] = work["genres"].apply(parse_genres)
     
     # Genre'ları ağırlıklandır (tekrarla)
@@ -281,6 +323,11 @@ def prepare_metadata(
             work["director_str"] = work["id"].map(director_map).fillna("")
             print(f"   ✅ Cast/Crew eklendi: {len(cast_map):,} film")
 
+    return work
+
+
+def _build_content(work: pd.DataFrame, *, min_content_chars: int, to_lower: bool) -> pd.DataFrame:
+    """Ağırlıklı content metnini oluşturur, kısa ve tekrar eden kayıtları eler."""
     if to_lower:
         work["overview"] = work["overview"].str.lower()
         work["genres_str"] = work["genres_str"].str.lower()
@@ -322,28 +369,101 @@ def build_tfidf(
     return vectorizer, matrix
 
 
+# Tüm yazımlar geçici dosya + os.replace ile yapılır (bkz. src/atomic_io.py):
+# çalışan sunucular bu dosyaları açık tutarken yarım dosya görmez.
+
 def save_sparse_matrix(path: Path, matrix: sparse.csr_matrix) -> None:
-    sparse.save_npz(path, matrix.astype("float32"))
+    atomic_io.replace_file(path, lambda f: sparse.save_npz(f, matrix.astype("float32")))
 
 
 def save_pickle(obj, path: Path) -> None:
-    with path.open("wb") as f:
-        pickle.dump(obj, f)
+    atomic_io.replace_file(path, lambda f: pickle.dump(obj, f))
 
 
 def save_metadata(df: pd.DataFrame, path: Path) -> Path:
     try:
-        df.to_parquet(path, index=False)
+        atomic_io.replace_file(path, lambda f: df.to_parquet(f, index=False))
         return path
     except Exception:
         fallback = path.with_suffix(".pkl")
-        df.to_pickle(fallback)
+        atomic_io.replace_file(fallback, lambda f: df.to_pickle(f))
         return fallback
 
 
 def save_meta_json(meta: dict, path: Path) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
+    payload = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+    atomic_io.replace_file(path, lambda f: f.write(payload))
+
+
+def load_meta_json(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_mmap_artifacts(matrix: sparse.csr_matrix, metadata: pd.DataFrame) -> dict:
+    """
+    Matris ve metadata'yı sıkıştırılmamış, memmap ile paylaşılabilir düzende yazar.
+
+    Her çağrı yeni sürümlü klasörler (``tfidf_csr-<sürüm>``) yayınlar; çalışan
+    sunucuların mmap ile açtığı eski klasörlere dokunulmaz. Dönen düzen meta'ya
+    yazılınca yükleyiciler yeni klasörlere geçer; bu yüzden meta en son kaydedilmelidir.
+    ``matrix`` satırları zaten normalize edilmiş olmalıdır (bkz. ``rc.normalize_matrix_rows``).
+    """
+    version = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{os.getpid()}"
+    csr_dir = CSR_DIR.with_name(f"{CSR_DIR.name}-{version}")
+    metadata_dir = METADATA_STORE_DIR.with_name(f"{METADATA_STORE_DIR.name}-{version}")
+    atomic_io.publish_dir(csr_dir, lambda tmp: store.save_csr(tmp, matrix))
+    atomic_io.publish_dir(metadata_dir, lambda tmp: store.save_metadata_store(tmp, metadata))
+    return {
+        "csr_dir": csr_dir.name,
+        "metadata_store_dir": metadata_dir.name,
+        "text_columns": list(store.TEXT_COLUMNS),
+    }
+
+
+def prune_mmap_generations(*layouts: dict) -> None:
+    """
+    ``layouts``'ta geçmeyen eski store klasörlerini siler.
+
+    Yeni meta kaydedildikten sonra çağrılır; bir önceki düzen de korunur ki
+    meta'yı değişimden hemen önce okuyan process'ler klasörünü bulabilsin.
+    """
+    keep = {name for layout in layouts for name in (layout.get("csr_dir"), layout.get("metadata_store_dir"))}
+    for base in (CSR_DIR, METADATA_STORE_DIR):
+        for path in base.parent.glob(f"{base.name}*"):
+            is_generation = path.name == base.name or path.name.startswith(f"{base.name}-")
+            if is_generation and path.is_dir() and path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def export_mmap_artifacts() -> None:
+    """
+    Mevcut npz/parquet artefaktlarından mmap düzenini üretir (yeniden eğitim yok).
+
+    Eski (normalize edilmemiş) ``tfidf_matrix.npz`` de normalize haliyle yerine
+    yazılır; meta'daki ``rows_l2_normalized`` iki düzen için de doğru olur.
+    """
+    if not MATRIX_PATH.exists() or not DEFAULT_METADATA_PATH.exists():
+        raise SystemExit("Önce pipeline'ı çalıştırın: npz/parquet artefaktları bulunamadı.")
+    matrix = rc.normalize_matrix_rows(sparse.load_npz(MATRIX_PATH))
+    metadata = pd.read_parquet(DEFAULT_METADATA_PATH)
+    save_sparse_matrix(MATRIX_PATH, matrix)
+    layout = save_mmap_artifacts(matrix, metadata)
+
+    meta = load_meta_json(META_JSON_PATH)
+    previous_layout = meta.get("mmap_layout") or {}
+    meta.update(
+        {
+            "matrix_dtype": "float32",
+            "rows_l2_normalized": True,
+            "mmap_layout": layout,
+        }
+    )
+    save_meta_json(meta, META_JSON_PATH)
+    prune_mmap_generations(layout, previous_layout)
+    print(f"✅ mmap düzeni yazıldı: {layout['csr_dir']}, {layout['metadata_store_dir']}")
 
 
 def run_pipeline(args: argparse.Namespace) -> None:
@@ -359,8 +479,11 @@ def run_pipeline(args: argparse.Namespace) -> None:
     print("🎬 CONTENT-BASED MODEL OLUŞTURMA")
     print("=" * 60)
     
+    timer = StageTimer()
     print("\n📂 Metadata yükleniyor...")
-    raw_df = load_raw_metadata(args.source)
+    with timer.stage("load") as stage:
+        raw_df = load_raw_metadata(args.source)
+        stage.rows = len(raw_df)
     print(f"   → {len(raw_df):,} satır okundu")
 
     print("\n🧹 Veri zenginleştiriliyor...")
@@ -378,17 +501,21 @@ def run_pipeline(args: argparse.Namespace) -> None:
         use_keywords=use_keywords,
         use_credits=use_credits,
         genre_weight=args.genre_weight,
+        timer=timer,
     )
     if prepared.empty:
         raise RuntimeError("Temizlenen metadata boş kaldı!")
     print(f"   → {len(prepared):,} film kaldı")
 
     print("🧠 TF-IDF vektörleri hesaplanıyor...")
-    vectorizer, matrix = build_tfidf(
-        prepared["content"].tolist(),
-        max_features=args.max_features,
-        ngram_range=(args.ngram_min, args.ngram_max),
-    )
+    with timer.stage("tfidf") as stage:
+        vectorizer, matrix = build_tfidf(
+            prepared["content"].tolist(),
+            max_features=args.max_features,
+            ngram_range=(args.ngram_min, args.ngram_max),
+        )
+        matrix = rc.normalize_matrix_rows(matrix)
+        stage.rows = matrix.shape[0]
     print(f"   → Matris boyutu: {matrix.shape[0]:,} film × {matrix.shape[1]:,} feature")
 
     prepared = prepared.assign(matrix_index=range(len(prepared)))
@@ -400,6 +527,7 @@ def run_pipeline(args: argparse.Namespace) -> None:
             "overview",
             "vote_average",
             "vote_count",
+            "release_year",
             "matrix_index",
         ]
     ].rename(
@@ -410,9 +538,12 @@ def run_pipeline(args: argparse.Namespace) -> None:
     )
 
     print("💾 Artefaktlar kaydediliyor...")
-    save_pickle(vectorizer, VECTORIZER_PATH)
-    save_sparse_matrix(MATRIX_PATH, matrix)
-    metadata_path = save_metadata(metadata_to_save, DEFAULT_METADATA_PATH)
+    with timer.stage("save") as stage:
+        save_pickle(vectorizer, VECTORIZER_PATH)
+        save_sparse_matrix(MATRIX_PATH, matrix)
+        metadata_path = save_metadata(metadata_to_save, DEFAULT_METADATA_PATH)
+        mmap_layout = save_mmap_artifacts(matrix, metadata_to_save)
+        stage.rows = len(metadata_to_save)
 
     meta_payload = {
         "generated_at": datetime.utcnow().isoformat() + "Z",
@@ -426,20 +557,31 @@ def run_pipeline(args: argparse.Namespace) -> None:
         "use_keywords": use_keywords,
         "use_credits": use_credits,
         "genre_weight": args.genre_weight,
+        "matrix_dtype": "float32",
+        "rows_l2_normalized": True,
         "metadata_path": str(metadata_path),
         "vectorizer_path": str(VECTORIZER_PATH),
         "matrix_path": str(MATRIX_PATH),
+        "mmap_layout": mmap_layout,
+        "build_stages": timer.as_dict(),
     }
+    previous_layout = load_meta_json(META_JSON_PATH).get("mmap_layout") or {}
     save_meta_json(meta_payload, META_JSON_PATH)
+    prune_mmap_generations(mmap_layout, previous_layout)
+    print(timer.report())
 
     print("✅ Pipeline tamamlandı!")
     print(f"   • Vectorizer: {VECTORIZER_PATH}")
     print(f"   • TF-IDF matrix: {MATRIX_PATH}")
     print(f"   • Metadata: {metadata_path}")
+    print(f"   • mmap düzeni: {mmap_layout['csr_dir']}, {mmap_layout['metadata_store_dir']}")
     print(f"   • Meta JSON: {META_JSON_PATH}")
 
 
 if __name__ == "__main__":
     CLI_ARGS = parse_args()
-    run_pipeline(CLI_ARGS)
+    if CLI_ARGS.export_mmap:
+        export_mmap_artifacts()
+    else:
+        run_pipeline(CLI_ARGS)
 
@@ -107,20 +107,11 @@ def diagnose():
             user_tmdb_ids.append(tmdb_id)
     
     if len(user_tmdb_ids) >= 3:
-        # Film çiftleri arasındaki benzerliği hesapla
-        from sklearn.metrics.pairwise import cosine_similarity
-        
-        similarities = []
-        for i, id1 in enumerate(user_tmdb_ids[:10]):
-            for id2 in user_tmdb_ids[i+1:10]:
-                idx1 = bundle.id_to_index.get(id1)
-                idx2 = bundle.id_to_index.get(id2)
-                if idx1 is not None and idx2 is not None:
-                    sim = cosine_similarity(
-                        bundle.matrix[idx1], 
-                        bundle.matrix[idx2]
-                    )[0][0]
-                    similarities.append(sim)
+        # Film çiftleri arasındaki benzerliği hesapla (tek pairwise çarpım)
+        sample_indices = [bundle.id_to_index[tid] for tid in user_tmdb_ids[:10]]
+        sim_matrix = rc.pairwise_similarity(sample_indices, bundle)
+        upper = np.triu_indices(len(sample_indices), k=1)
+        similarities = sim_matrix[upper].tolist()
         
         if similarities:
             print(f"   • Örnek kullanıcı #{sample_user} ({len(user_tmdb_ids)} film)")
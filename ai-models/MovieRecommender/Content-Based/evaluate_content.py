@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import math
 import random
-from sklearn.metrics.pairwise import cosine_similarity
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Sequence
 
+import numpy as np
 import pandas as pd
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -19,12 +23,20 @@ if str(BASE_DIR) not in __import__("sys").path:
 
 import recommender_content as rc  # noqa: E402
 import user_profile as up  # noqa: E402
+from src.id_links import IdLinks, load_id_links  # noqa: E402  (rc proje kökünü path'e ekler)
 
 
-def load_ratings(path: Path) -> pd.DataFrame:
+RATING_DTYPES = {"userId": "int32", "movieId": "int32", "rating": "float32", "timestamp": "int64"}
+
+
+def load_ratings(path: Path, usecols: Sequence[str] | None = None) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"ratings verisi bulunamadı: {path}")
-    df = pd.read_csv(path)
+    if usecols is None:
+        df = pd.read_csv(path)
+    else:
+        dtypes = {col: RATING_DTYPES[col] for col in usecols if col in RATING_DTYPES}
+        df = pd.read_csv(path, usecols=list(usecols), dtype=dtypes)
     expected = {"userId", "movieId", "rating"}
     if not expected.issubset(df.columns):
         raise ValueError("ratings.csv beklenen kolonlara sahip değil.")
@@ -47,300 +59,458 @@ def build_movieid_to_tmdb(links_df: pd.DataFrame) -> dict[int, int]:
     return links_df.drop_duplicates(subset="movieId").set_index("movieId")["tmdbId"].to_dict()
 
 
-def _compute_batch_similarity(
-    bundle: rc.ArtifactBundle,
-    tmdb_ids: list[int],
-) -> dict[tuple[int, int], float]:
+@dataclass(frozen=True)
+class EvaluationDataset:
     """
-    Verilen film listesi için tüm çiftlerin benzerliğini tek seferde hesapla.
-    Çok daha hızlı! O(n) matrix lookup + O(n²) memory ama tek batch cosine.
+    Kullanıcıya göre gruplanmış beğeni verisi.
+
+    ``user_ids`` ratings dosyasındaki ilk görülme sırasındadır (``unique()`` ile aynı).
+    Kullanıcı ``i``'nin katalogda eşleşen beğenileri
+    ``tmdb_ids[offsets[i]:offsets[i + 1]]`` aralığındadır ve dosyadaki satır
+    sırasını korur; böylece kullanıcı verisine erişim O(1) dilimlemedir.
+    ``liked_counts`` eşleme öncesi eşik üstü beğeni sayısıdır (min_liked kontrolü).
     """
-    indices = []
-    valid_ids = []
-    for tid in tmdb_ids:
-        idx = bundle.id_to_index.get(tid)
-        if idx is not None:
-            indices.append(idx)
-            valid_ids.append(tid)
-    
-    if len(indices) < 2:
-        return {}
-    
-    # Tek seferde tüm benzerlik matrisini hesapla
-    subset_matrix = bundle.matrix[indices]
-    sim_matrix = cosine_similarity(subset_matrix)
-    
-    # Dict olarak döndür
-    result = {}
-    for i, id1 in enumerate(valid_ids):
-        for j, id2 in enumerate(valid_ids):
-            if i != j:
-                result[(id1, id2)] = float(sim_matrix[i, j])
-    
-    return result
 
+    user_ids: np.ndarray
+    offsets: np.ndarray
+    liked_counts: np.ndarray
+    tmdb_ids: np.ndarray
+    ratings: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def user_slice(self, position: int) -> tuple[np.ndarray, np.ndarray]:
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.tmdb_ids[start:end], self.ratings[start:end]
 
-def _find_similar_movie_to_hide_fast(
-    sim_dict: dict[tuple[int, int], float],
-    tmdb_ids: list[int],
+
+def build_evaluation_dataset(
+    ratings_df: pd.DataFrame,
+    links: IdLinks,
+    bundle: rc.ArtifactBundle,
+    *,
+    rating_threshold: float,
+) -> EvaluationDataset:
+    """Beğenileri tek geçişte filtreler, TMDB id'ye eşler ve kullanıcıya göre gruplar."""
+    user_codes, user_ids = pd.factorize(ratings_df["userId"])
+    n_users = len(user_ids)
+
+    liked_mask = (ratings_df["rating"] >= rating_threshold).to_numpy()
+    liked_codes = user_codes[liked_mask]
+    liked_counts = np.bincount(liked_codes, minlength=n_users)
+
+    tmdb = links.movie_to_tmdb(ratings_df.loc[liked_mask, "movieId"].to_numpy())
+    mapped = tmdb >= 0
+    mapped[mapped] = np.isin(tmdb[mapped], np.asarray(bundle.tmdb_ids))
+
+    codes = liked_codes[mapped]
+    order = np.argsort(codes, kind="stable")
+    tmdb_ids = tmdb[mapped][order]
+    ratings = ratings_df.loc[liked_mask, "rating"].to_numpy(dtype=float)[mapped][order]
+    counts = np.bincount(codes, minlength=n_users)
+    offsets = np.zeros(n_users + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    return EvaluationDataset(
+        user_ids=np.asarray(user_ids, dtype=np.int64),
+        offsets=offsets,
+        liked_counts=liked_counts,
+        tmdb_ids=tmdb_ids,
+        ratings=ratings,
+    )
+
+
+def _user_similarity_matrix(
+    bundle: rc.ArtifactBundle,
+    tmdb_ids: np.ndarray,
+) -> np.ndarray:
+    """
+    Kullanıcının filmleri arasındaki (n × n) benzerlik matrisi.
+
+    Katalogda olmayan filmlerin ve aynı TMDB id'li çiftlerin (köşegen dahil)
+    benzerliği 0 kabul edilir.
+    """
+    n = len(tmdb_ids)
+    sim = np.zeros((n, n), dtype=float)
+    rows = [bundle.id_to_index.get(int(tid)) for tid in tmdb_ids]
+    known = np.flatnonzero([row is not None for row in rows])
+    if len(known) < 2:
+        return sim
+
+    # Satırlar normalize, tek dot çarpımı yeterli
+    sim[np.ix_(known, known)] = rc.pairwise_similarity([rows[i] for i in known], bundle)
+    sim[tmdb_ids[:, None] == tmdb_ids[None, :]] = 0.0
+    return sim
+
+
+def _pick_similar_movie_to_hide(
+    sim: np.ndarray,
+    tmdb_ids: np.ndarray,
+    hidden: np.ndarray,
     min_similarity: float,
     rng: random.Random,
-    already_hidden: set[int] | None = None,
 ) -> tuple[int, float] | None:
     """
-    Hızlı versiyon: Önceden hesaplanmış benzerlik dict'i kullanır.
-    
+    Kalan filmlerden en az biriyle ``min_similarity`` kadar benzer bir film seçer.
+
+    ``hidden`` daha önce gizlenen pozisyonların maskesidir. Adaylar arasında
+    seçim ``rng.shuffle`` ile yapılır.
+
     Returns: (hidden_tmdb_id, max_similarity) veya None
     """
-    if already_hidden is None:
-        already_hidden = set()
-    
-    available = [tid for tid in tmdb_ids if tid not in already_hidden]
-    
-    if len(available) < 2:
+    available = ~hidden
+    if available.sum() < 2:
         return None
-    
-    candidates = []
-    
-    for candidate_id in available:
-        # Bu film gizlenirse, kalanlarla max benzerlik
-        remaining = [tid for tid in available if tid != candidate_id]
-        
-        max_sim = 0.0
-        for other_id in remaining:
-            key = (candidate_id, other_id)
-            sim = sim_dict.get(key, 0.0)
-            if sim > max_sim:
-                max_sim = sim
-        
-        if max_sim >= min_similarity:
-            candidates.append((candidate_id, max_sim))
-    
-    if not candidates:
+
+    # Bu film gizlenirse, kalanlarla max benzerlik
+    max_sim = np.where(available[None, :], sim, 0.0).max(axis=1)
+    candidates = np.flatnonzero(available & (max_sim >= min_similarity))
+    if len(candidates) == 0:
         return None
-    
+
     # Rastgele bir aday seç
-    rng.shuffle(candidates)
-    return candidates[0]
+    order = list(range(len(candidates)))
+    rng.shuffle(order)
+    chosen = candidates[order[0]]
+    return int(tmdb_ids[chosen]), float(max_sim[chosen])
 
 
-def evaluate(
-    ratings_path: Path,
-    links_path: Path,
-    *,
-    n_users: int,
-    top_n: int,
-    mode: str,
-    rating_threshold: float,
-    min_liked: int,
-    method: str,
-    seed: int,
-    restrict_to_links: bool = False,
-    n_hidden: int = 1,
-    smart_hide: bool = True,
-    min_hide_similarity: float = 0.05,
-) -> dict:
+DEFAULT_BLOCK_SIZE = 64
+MAX_SAMPLES = 15
+
+
+@dataclass(frozen=True)
+class EvalConfig:
+    """Bir değerlendirme koşusunun veri setinden bağımsız parametreleri."""
+
+    n_users: int
+    top_n: int
+    mode: str
+    min_liked: int
+    method: str
+    seed: int
+    n_hidden: int = 1
+    smart_hide: bool = True
+    min_hide_similarity: float = 0.05
+    batched: bool = False
+
+    @property
+    def effective_min_liked(self) -> int:
+        # min_liked, en az n_hidden + 1 film gerektirir (gizlenecek + kalan)
+        return max(self.min_liked, self.n_hidden + 2)
+
+
+def user_rng(seed: int, user_id: int) -> random.Random:
     """
-    Content-Based model değerlendirmesi.
-    
-    Leave-K-Out yaklaşımı:
-    - n_hidden=1: Klasik leave-one-out (tek film gizle)
-    - n_hidden>1: Birden fazla film gizle, kaç tanesi yakalandığına bak
-    
-    Smart Hide (Akıllı Gizleme):
-    - smart_hide=True: Gizlenen film, kalan filmlerle belirli bir benzerliğin üzerinde olmalı
-    - min_hide_similarity: Minimum benzerlik eşiği (varsayılan: 0.05)
-    - Bu sayede "içerik olarak benzemeyen" filmler gizlenmez, değerlendirme daha adil olur
-    
-    Metrikler:
-    - hit_rate: Toplam hit sayısı / Toplam gizlenen film sayısı
-    - recall@n: Her kullanıcı için gizlenenlerden kaçı Top-N'de
-    - precision@n: Her kullanıcı için Top-N'den kaçı gizlenenlerden
+    Kullanıcıya özel RNG. Sadece ``(seed, userId)``'ye bağlı olduğu için sonuç,
+    kullanıcının hangi worker'da veya hangi sırada işlendiğinden bağımsızdır.
     """
-    ratings_df = load_ratings(ratings_path)
-    links_df = load_links(links_path)
-    movie_map = build_movieid_to_tmdb(links_df)
-    allowed_tmdb_ids: set[int] | None = None
-    if restrict_to_links:
-        allowed_tmdb_ids = set(links_df["tmdbId"].astype(int).tolist())
-    bundle = rc.load_artifacts()
+    return random.Random(f"{seed}:{int(user_id)}")
+
+
+def _eligible_positions(dataset: EvaluationDataset, cfg: EvalConfig) -> list[int]:
+    """Seed ile karıştırılmış kullanıcı sırası; yeterli beğenisi olmayanlar elenir."""
+    rng = random.Random(cfg.seed)
+    positions = list(range(len(dataset)))
+    rng.shuffle(positions)
+    mapped_counts = np.diff(dataset.offsets)
+    return [
+        pos
+        for pos in positions
+        if dataset.liked_counts[pos] >= cfg.effective_min_liked
+        and mapped_counts[pos] >= cfg.n_hidden + 1
+    ]
+
+
+@dataclass(frozen=True)
+class HeldOutUser:
+    """Gizleme adımından sonra bir kullanıcının kalan ve gizlenen filmleri."""
+
+    user_id: int
+    remaining_ids: list[int]
+    remaining_ratings: list[float]
+    hidden_ids: list[int]
+    hidden_ratings: list[float]
+    hidden_similarities: list[float]
+
+
+SKIPPED_NO_SIMILAR = {"status": "skipped_no_similar"}
+
+
+def _hold_out_user(
+    dataset: EvaluationDataset,
+    position: int,
+    cfg: EvalConfig,
+    bundle: rc.ArtifactBundle,
+) -> HeldOutUser | dict | None:
+    """
+    Kullanıcının filmlerinden ``n_hidden`` tanesini gizler.
+
+    Akıllı gizleme yeterli benzer film bulamazsa ``SKIPPED_NO_SIMILAR``,
+    geriye film kalmazsa ``None`` döner.
+    """
+    user_id = int(dataset.user_ids[position])
+    user_tmdb, user_ratings = dataset.user_slice(position)
+    tmdb_ids = user_tmdb.tolist()
+    tmdb_ratings = user_ratings.tolist()
+    rng = user_rng(cfg.seed, user_id)
+
+    # Film gizleme stratejisi
+    hidden_movies = []
+    hidden_ratings_list = []
+    hidden_similarities = []
+
+    if cfg.smart_hide:
+        # Akıllı gizleme: Benzer filmleri gizle
+        # Önce tüm benzerlik matrisini tek seferde hesapla
+        sim_matrix = _user_similarity_matrix(bundle, user_tmdb)
+        hidden_mask = np.zeros(len(tmdb_ids), dtype=bool)
+
+        for _ in range(cfg.n_hidden):
+            result = _pick_similar_movie_to_hide(
+                sim_matrix, user_tmdb, hidden_mask, cfg.min_hide_similarity, rng
+            )
+
+            if result is None:
+                break
+
+            hidden_id, sim = result
+            hidden_idx = tmdb_ids.index(hidden_id)
+
+            hidden_movies.append(hidden_id)
+            hidden_ratings_list.append(tmdb_ratings[hidden_idx])
+            hidden_similarities.append(sim)
+            hidden_mask |= user_tmdb == hidden_id
+
+        if len(hidden_movies) < cfg.n_hidden:
+            return SKIPPED_NO_SIMILAR
+    else:
+        # Klasik rastgele gizleme
+        all_indices = list(range(len(tmdb_ids)))
+        rng.shuffle(all_indices)
+        hidden_indices = sorted(all_indices[:cfg.n_hidden], reverse=True)
+
+        for idx in hidden_indices:
+            hidden_movies.append(tmdb_ids[idx])
+            hidden_ratings_list.append(tmdb_ratings[idx])
+
+    # Kalan filmler
+    hidden_set = set(hidden_movies)
+    remaining_ids = [tid for tid in tmdb_ids if tid not in hidden_set]
+    remaining_ratings = [
+        tmdb_ratings[i] for i, tid in enumerate(tmdb_ids) if tid not in hidden_set
+    ]
+
+    if len(remaining_ids) < 1:
+        return None
+
+    return HeldOutUser(
+        user_id=user_id,
+        remaining_ids=remaining_ids,
+        remaining_ratings=remaining_ratings,
+        hidden_ids=hidden_movies,
+        hidden_ratings=hidden_ratings_list,
+        hidden_similarities=hidden_similarities,
+    )
+
+
+def _score_user(
+    held: HeldOutUser,
+    rec_list: list[int],
+    cfg: EvalConfig,
+    bundle: rc.ArtifactBundle,
+    allowed_tmdb_ids: set[int] | None,
+) -> dict | None:
+    """Sıralı öneri id listesinden kullanıcının metrik kaydını çıkarır."""
+    top_n = cfg.top_n
+    if allowed_tmdb_ids is not None:
+        rec_list = [tid for tid in rec_list if tid in allowed_tmdb_ids]
+    if not rec_list:
+        return None
+
+    # Öneri listesindeki film ID'leri
+    rec_ids = set(rec_list)
+    hidden_set = set(held.hidden_ids)
+
+    # Her gizlenen film için hit kontrolü
+    user_hits = 0
+    dcg = 0.0
+    first_hit_rank = None
+    hit_details = []
+    for i, (hidden_movie, hidden_rating) in enumerate(zip(held.hidden_ids, held.hidden_ratings)):
+        try:
+            rank = rec_list.index(hidden_movie) + 1
+            hit = rank <= top_n
+        except ValueError:
+            rank = None
+            hit = False
+
+        if hit:
+            user_hits += 1
+            dcg += 1.0 / math.log2(rank + 1)
+            if first_hit_rank is None or rank < first_hit_rank:
+                first_hit_rank = rank
+
+        row = bundle.id_to_index.get(hidden_movie)
+        detail = {
+            "tmdb_id": hidden_movie,
+            "title": bundle.titles[row] if row is not None else "Unknown",
+            "rating": hidden_rating,
+            "hit": hit,
+            "rank": rank,
+        }
+        if held.hidden_similarities:
+            detail["similarity_to_remaining"] = round(held.hidden_similarities[i], 3)
+        hit_details.append(detail)
+
+    # İdeal sıralama: gizlenen filmlerin hepsi listenin başında
+    n_ideal = min(len(held.hidden_ids), top_n)
+    idcg = sum(1.0 / math.log2(r + 1) for r in range(1, n_ideal + 1))
+
+    # Precision@N: Top-N'den kaçı gizlenenlerden
+    precision_hits = len(hidden_set & rec_ids)
+    similarities = held.hidden_similarities
+    return {
+        "status": "tested",
+        "user_id": held.user_id,
+        "n_hidden": len(held.hidden_ids),
+        "hits": user_hits,
+        "recall": user_hits / len(held.hidden_ids),
+        "precision": precision_hits / min(top_n, len(rec_list)),
+        "ndcg": dcg / idcg if idcg > 0 else 0.0,
+        "mrr": 1.0 / first_hit_rank if first_hit_rank else 0.0,
+        "hide_similarity": sum(similarities) / len(similarities) if similarities else None,
+        "hidden_movies": hit_details,
+    }
+
+
+def _evaluate_user(
+    dataset: EvaluationDataset,
+    position: int,
+    cfg: EvalConfig,
+    bundle: rc.ArtifactBundle,
+    allowed_tmdb_ids: set[int] | None,
+) -> dict | None:
+    """
+    Tek kullanıcı için leave-K-out sonucu.
+
+    Dönen kayıt ``status`` alanı taşır: ``"tested"`` veya ``"skipped_no_similar"``;
+    kullanıcı hiç test edilemediyse ``None``.
+    """
+    held = _hold_out_user(dataset, position, cfg, bundle)
+    if not isinstance(held, HeldOutUser):
+        return held
+
+    # Öneri üret
+    if cfg.mode == "profile":
+        profile = up.build_user_profile(held.remaining_ids, ratings=held.remaining_ratings)
+        scores = rc.similarity_to_all(profile, bundle)
+        recs = rc.scores_to_dataframe(
+            scores, bundle, exclude_ids=held.remaining_ids, top_n=cfg.top_n
+        )
+    else:
+        recs = rc.recommend_multi(
+            held.remaining_ids,
+            top_n=cfg.top_n,
+            method=cfg.method,
+        )
+
+    if recs.empty:
+        return None
+    return _score_user(held, recs["tmdb_id"].tolist(), cfg, bundle, allowed_tmdb_ids)
+
+
+def _evaluate_block_batched(
+    dataset: EvaluationDataset,
+    positions: Sequence[int],
+    cfg: EvalConfig,
+    bundle: rc.ArtifactBundle,
+    allowed_tmdb_ids: set[int] | None,
+) -> list[dict | None]:
+    """
+    Bir kullanıcı bloğunu tek matris çarpımıyla değerlendirir.
+
+    Gizleme adımı kullanıcı başına yapılır; kalan filmlerden kurulan profiller
+    ``rc.recommend_batch`` ile birlikte skorlanır ve hit sıraları DataFrame
+    kurulmadan top-N id dizilerinden okunur. Sonuçlar ``_evaluate_user`` ile aynıdır.
+    """
+    records: list = [_hold_out_user(dataset, pos, cfg, bundle) for pos in positions]
+    held_slots = [i for i, held in enumerate(records) if isinstance(held, HeldOutUser)]
+    if not held_slots:
+        return records
+
+    held_users = [records[i] for i in held_slots]
+    liked = [held.remaining_ids for held in held_users]
+    if cfg.mode == "profile":
+        batch = up.recommend_batch_with_profile(
+            liked,
+            ratings=[held.remaining_ratings for held in held_users],
+            top_n=cfg.top_n,
+        )
+    else:
+        batch = rc.recommend_batch(liked, top_n=cfg.top_n, method=cfg.method)
+
+    for slot, held, rows, rec_row in zip(held_slots, held_users, batch.rows, batch.tmdb_ids):
+        rec_list = rec_row[rows >= 0].tolist()
+        records[slot] = (
+            _score_user(held, rec_list, cfg, bundle, allowed_tmdb_ids) if rec_list else None
+        )
+    return records
 
-    rng = random.Random(seed)
-    user_ids = ratings_df["userId"].unique().tolist()
-    rng.shuffle(user_ids)
 
+def _reduce_records(records, cfg: EvalConfig) -> dict:
+    """
+    Kullanıcı kayıtlarını karıştırılmış kullanıcı sırasında toplar.
+
+    ``n_users`` kullanıcı test edilince durur; toplama sırası sabit olduğundan
+    sonuç worker sayısından bağımsız olarak bit bit aynıdır.
+    """
     # Toplam istatistikler
     total_hits = 0
     total_hidden = 0
     tested_users = 0
     skipped_no_similar = 0
     users_with_hit = 0  # En az 1 hit alan kullanıcı sayısı
-    
+
     # Kullanıcı bazlı recall/precision
     user_recalls: list[float] = []
     user_precisions: list[float] = []
+    user_ndcgs: list[float] = []
+    user_mrrs: list[float] = []
     avg_hide_similarities: list[float] = []
-    
     samples: list[dict] = []
-    title_lookup = (
-        bundle.metadata.drop_duplicates(subset="tmdb_id")
-        .set_index("tmdb_id")["title"]
-        .to_dict()
-    )
-
-    # min_liked, en az n_hidden + 1 film gerektirir (gizlenecek + kalan)
-    effective_min_liked = max(min_liked, n_hidden + 2)
 
-    for user_id in user_ids:
-        user_ratings = ratings_df[ratings_df["userId"] == user_id]
-        liked = user_ratings[user_ratings["rating"] >= rating_threshold]
-        if len(liked) < effective_min_liked:
+    for record in records:
+        if record is None:
             continue
-
-        tmdb_ids = []
-        tmdb_ratings = []
-        for _, row in liked.iterrows():
-            tmdb_id = movie_map.get(int(row["movieId"]))
-            if tmdb_id is None:
-                continue
-            if tmdb_id not in bundle.id_to_index:
-                continue
-            tmdb_ids.append(tmdb_id)
-            tmdb_ratings.append(float(row["rating"]))
-
-        # En az n_hidden + 1 film olmalı (gizlenecekler + en az 1 kalan)
-        if len(tmdb_ids) < n_hidden + 1:
+        if record["status"] == "skipped_no_similar":
+            skipped_no_similar += 1
             continue
 
-        # Film gizleme stratejisi
-        hidden_movies = []
-        hidden_ratings_list = []
-        hidden_similarities = []
-        
-        if smart_hide:
-            # Akıllı gizleme: Benzer filmleri gizle (HIZLI VERSİYON)
-            # Önce tüm benzerlik matrisini tek seferde hesapla
-            sim_dict = _compute_batch_similarity(bundle, tmdb_ids)
-            
-            already_hidden: set[int] = set()
-            for _ in range(n_hidden):
-                result = _find_similar_movie_to_hide_fast(
-                    sim_dict, tmdb_ids, min_hide_similarity, rng, already_hidden
-                )
-                
-                if result is None:
-                    break
-                
-                hidden_id, sim = result
-                hidden_idx = tmdb_ids.index(hidden_id)
-                
-                hidden_movies.append(hidden_id)
-                hidden_ratings_list.append(tmdb_ratings[hidden_idx])
-                hidden_similarities.append(sim)
-                already_hidden.add(hidden_id)
-            
-            if len(hidden_movies) < n_hidden:
-                skipped_no_similar += 1
-                continue
-        else:
-            # Klasik rastgele gizleme
-            all_indices = list(range(len(tmdb_ids)))
-            rng.shuffle(all_indices)
-            hidden_indices = sorted(all_indices[:n_hidden], reverse=True)
-            
-            for idx in hidden_indices:
-                hidden_movies.append(tmdb_ids[idx])
-                hidden_ratings_list.append(tmdb_ratings[idx])
-        
-        # Kalan filmler
-        hidden_set = set(hidden_movies)
-        remaining_ids = [tid for tid in tmdb_ids if tid not in hidden_set]
-        remaining_ratings = [
-            tmdb_ratings[i] for i, tid in enumerate(tmdb_ids) if tid not in hidden_set
-        ]
-
-        if len(remaining_ids) < 1:
-            continue
-
-        # Öneri üret
-        if mode == "profile":
-            profile = up.build_user_profile(remaining_ids, ratings=remaining_ratings)
-            scores = cosine_similarity(profile.reshape(1, -1), bundle.matrix).ravel()
-            recs = rc.scores_to_dataframe(scores, bundle, exclude_ids=remaining_ids, top_n=top_n)
-        else:
-            recs = rc.recommend_multi(
-                remaining_ids,
-                top_n=top_n,
-                method=method,
-            )
-
-        if recs.empty:
-            continue
-
-        if allowed_tmdb_ids is not None:
-            recs = recs[recs["tmdb_id"].isin(allowed_tmdb_ids)]
-            if recs.empty:
-                continue
-
-        # Öneri listesindeki film ID'leri
-        rec_ids = set(recs["tmdb_id"].tolist())
-        
-        # Her gizlenen film için hit kontrolü
-        user_hits = 0
-        hit_details = []
-        for i, (hidden_movie, hidden_rating) in enumerate(zip(hidden_movies, hidden_ratings_list)):
-            try:
-                rank = recs["tmdb_id"].tolist().index(hidden_movie) + 1
-                hit = rank <= top_n
-            except ValueError:
-                rank = None
-                hit = False
-            
-            if hit:
-                user_hits += 1
-                total_hits += 1
-            
-            detail = {
-                "tmdb_id": hidden_movie,
-                "title": title_lookup.get(hidden_movie, "Unknown"),
-                "rating": hidden_rating,
-                "hit": hit,
-                "rank": rank,
-            }
-            if hidden_similarities:
-                detail["similarity_to_remaining"] = round(hidden_similarities[i], 3)
-            hit_details.append(detail)
-        
-        total_hidden += len(hidden_movies)
+        total_hits += record["hits"]
+        total_hidden += record["n_hidden"]
         tested_users += 1
-        
-        # Kullanıcı en az 1 film buldu mu?
-        if user_hits > 0:
+        if record["hits"] > 0:
             users_with_hit += 1
-        
-        if hidden_similarities:
-            avg_hide_similarities.append(sum(hidden_similarities) / len(hidden_similarities))
-        
-        # Kullanıcı bazlı Recall@N: gizlenenlerden kaçı Top-N'de
-        user_recall = user_hits / len(hidden_movies)
-        user_recalls.append(user_recall)
-        
-        # Kullanıcı bazlı Precision@N: Top-N'den kaçı gizlenenlerden
-        precision_hits = len(hidden_set & rec_ids)
-        user_precision = precision_hits / min(top_n, len(recs)) if len(recs) > 0 else 0.0
-        user_precisions.append(user_precision)
-        
+        if record["hide_similarity"] is not None:
+            avg_hide_similarities.append(record["hide_similarity"])
+        user_recalls.append(record["recall"])
+        user_precisions.append(record["precision"])
+        user_ndcgs.append(record["ndcg"])
+        user_mrrs.append(record["mrr"])
+
         # Örnek kaydet
-        if len(samples) < 15:
+        if len(samples) < MAX_SAMPLES:
             samples.append({
-                "userId": int(user_id),
-                "n_hidden": len(hidden_movies),
-                "hits": user_hits,
-                "recall": round(user_recall, 3),
-                "hidden_movies": hit_details,
+                "userId": record["user_id"],
+                "n_hidden": record["n_hidden"],
+                "hits": record["hits"],
+                "recall": round(record["recall"], 3),
+                "hidden_movies": record["hidden_movies"],
             })
 
-        if tested_users >= n_users:
+        if tested_users >= cfg.n_users:
             break
 
     # Ortalama metrikler
@@ -348,8 +518,10 @@ def evaluate(
     hit_rate_user = users_with_hit / tested_users if tested_users > 0 else 0.0  # Kullanıcı bazlı (klasik)
     avg_recall = sum(user_recalls) / len(user_recalls) if user_recalls else 0.0
     avg_precision = sum(user_precisions) / len(user_precisions) if user_precisions else 0.0
+    avg_ndcg = sum(user_ndcgs) / len(user_ndcgs) if user_ndcgs else 0.0
+    avg_mrr = sum(user_mrrs) / len(user_mrrs) if user_mrrs else 0.0
     avg_hide_sim = sum(avg_hide_similarities) / len(avg_hide_similarities) if avg_hide_similarities else 0.0
-    
+
     return {
         "hit_rate": hit_rate_film,  # Eski uyumluluk için (film bazlı)
         "hit_rate_user": hit_rate_user,  # Kullanıcı bazlı (klasik)
@@ -357,17 +529,200 @@ def evaluate(
         "hits": total_hits,
         "total_hidden": total_hidden,
         "tested": tested_users,
-        "n_hidden": n_hidden,
+        "n_hidden": cfg.n_hidden,
         "avg_recall": avg_recall,
         "avg_precision": avg_precision,
-        "smart_hide": smart_hide,
-        "min_hide_similarity": min_hide_similarity,
+        "avg_ndcg": avg_ndcg,
+        "avg_mrr": avg_mrr,
+        "batched": cfg.batched,
+        "smart_hide": cfg.smart_hide,
+        "min_hide_similarity": cfg.min_hide_similarity,
         "avg_hide_similarity": avg_hide_sim,
         "skipped_no_similar": skipped_no_similar,
         "samples": samples,
     }
 
 
+# --- Process havuzu ---
+# Worker'lar veri setini initializer ile bir kez alır; TF-IDF matrisini kendileri
+# yükler (mmap düzeni varsa sayfa önbelleğindeki tek kopya paylaşılır).
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(dataset: EvaluationDataset, allowed_tmdb_ids: set[int] | None) -> None:
+    _WORKER_STATE["dataset"] = dataset
+    _WORKER_STATE["allowed"] = allowed_tmdb_ids
+    _WORKER_STATE["bundle"] = rc.load_artifacts()
+
+
+def _run_block(dataset, positions, cfg, bundle, allowed_tmdb_ids) -> list[dict | None]:
+    if cfg.batched:
+        return _evaluate_block_batched(dataset, positions, cfg, bundle, allowed_tmdb_ids)
+    return [_evaluate_user(dataset, pos, cfg, bundle, allowed_tmdb_ids) for pos in positions]
+
+
+def _evaluate_block(positions: list[int], cfg: EvalConfig) -> list[dict | None]:
+    state = _WORKER_STATE
+    return _run_block(state["dataset"], positions, cfg, state["bundle"], state["allowed"])
+
+
+def _iter_records_serial(dataset, positions, cfg, bundle, allowed_tmdb_ids, *, block_size: int):
+    if not cfg.batched:
+        # Kullanıcı kullanıcı: n_users'a ulaşınca fazladan iş yapılmaz
+        block_size = 1
+    for i in range(0, len(positions), block_size):
+        yield from _run_block(dataset, positions[i:i + block_size], cfg, bundle, allowed_tmdb_ids)
+
+
+def _iter_records_parallel(executor: ProcessPoolExecutor, positions, cfg, *, workers: int, block_size: int):
+    """
+    Blokları sırayla havuza gönderir ve sonuçları yine sırayla verir.
+
+    Aynı anda en fazla ``2 × workers`` blok beklemede tutulur; tüketici
+    (``_reduce_records``) durduğunda kalan bloklar iptal edilir.
+    """
+    blocks = [positions[i:i + block_size] for i in range(0, len(positions), block_size)]
+    pending: deque = deque()
+    next_block = 0
+    try:
+        while next_block < len(blocks) or pending:
+            while next_block < len(blocks) and len(pending) < 2 * workers:
+                pending.append(executor.submit(_evaluate_block, blocks[next_block], cfg))
+                next_block += 1
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def evaluate_variants(
+    ratings_path: Path,
+    links_path: Path,
+    configs: Sequence[EvalConfig],
+    *,
+    rating_threshold: float,
+    restrict_to_links: bool = False,
+    workers: int = 1,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> list[dict]:
+    """
+    Aynı veri seti üzerinde birden fazla parametre setini değerlendirir.
+
+    Veri seti bir kez kurulur; ``workers > 1`` ise tüm varyantlar aynı process
+    havuzunu kullanır. Her varyantın sonucu ``workers`` değerinden bağımsızdır.
+    """
+    ratings_df = load_ratings(ratings_path, usecols=("userId", "movieId", "rating"))
+    links = load_id_links(links_path)
+    allowed_tmdb_ids: set[int] | None = None
+    if restrict_to_links:
+        allowed_tmdb_ids = set(links.tmdb_ids.tolist())
+    bundle = rc.load_artifacts()
+    dataset = build_evaluation_dataset(
+        ratings_df, links, bundle, rating_threshold=rating_threshold
+    )
+    del ratings_df
+
+    if workers <= 1:
+        return [
+            _reduce_records(
+                _iter_records_serial(
+                    dataset,
+                    _eligible_positions(dataset, cfg),
+                    cfg,
+                    bundle,
+                    allowed_tmdb_ids,
+                    block_size=block_size,
+                ),
+                cfg,
+            )
+            for cfg in configs
+        ]
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(dataset, allowed_tmdb_ids),
+    ) as executor:
+        for cfg in configs:
+            records = _iter_records_parallel(
+                executor,
+                _eligible_positions(dataset, cfg),
+                cfg,
+                workers=workers,
+                block_size=block_size,
+            )
+            results.append(_reduce_records(records, cfg))
+            records.close()
+    return results
+
+
+def evaluate(
+    ratings_path: Path,
+    links_path: Path,
+    *,
+    n_users: int,
+    top_n: int,
+    mode: str,
+    rating_threshold: float,
+    min_liked: int,
+    method: str,
+    seed: int,
+    restrict_to_links: bool = False,
+    n_hidden: int = 1,
+    smart_hide: bool = True,
+    min_hide_similarity: float = 0.05,
+    workers: int = 1,
+    batched: bool = False,
+) -> dict:
+    """
+    Content-Based model değerlendirmesi.
+    
+    Leave-K-Out yaklaşımı:
+    - n_hidden=1: Klasik leave-one-out (tek film gizle)
+    - n_hidden>1: Birden fazla film gizle, kaç tanesi yakalandığına bak
+    
+    Smart Hide (Akıllı Gizleme):
+    - smart_hide=True: Gizlenen film, kalan filmlerle belirli bir benzerliğin üzerinde olmalı
+    - min_hide_similarity: Minimum benzerlik eşiği (varsayılan: 0.05)
+    - Bu sayede "içerik olarak benzemeyen" filmler gizlenmez, değerlendirme daha adil olur
+
+    Paralel çalışma:
+    - workers>1: Kullanıcılar process havuzuna bloklar halinde dağıtılır
+    - Her kullanıcının RNG'si (seed, userId)'den türetilir; sonuçlar worker sayısından bağımsızdır
+
+    Batched mod:
+    - batched=True: Bir bloktaki tüm kullanıcı profilleri tek matris çarpımıyla skorlanır
+    - Hit sıraları DataFrame kurulmadan top-N dizilerinden okunur (sonuçlar aynıdır)
+    
+    Metrikler:
+    - hit_rate: Toplam hit sayısı / Toplam gizlenen film sayısı
+    - recall@n: Her kullanıcı için gizlenenlerden kaçı Top-N'de
+    - precision@n: Her kullanıcı için Top-N'den kaçı gizlenenlerden
+    - ndcg@n / mrr@n: Gizlenen filmlerin Top-N içindeki sırasına duyarlı metrikler
+    """
+    cfg = EvalConfig(
+        n_users=n_users,
+        top_n=top_n,
+        mode=mode,
+        min_liked=min_liked,
+        method=method,
+        seed=seed,
+        n_hidden=n_hidden,
+        smart_hide=smart_hide,
+        min_hide_similarity=min_hide_similarity,
+        batched=batched,
+    )
+    return evaluate_variants(
+        ratings_path,
+        links_path,
+        [cfg],
+        rating_threshold=rating_threshold,
+        restrict_to_links=restrict_to_links,
+        workers=workers,
+    )[0]
+
+
 # Eski API uyumluluğu için wrapper (n_hidden=1 varsayılan)
 def evaluate_legacy(
     ratings_path: Path,
@@ -451,6 +806,17 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Akıllı gizlemeyi kapat (rastgele gizle)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Paralel worker process sayısı (sonuçlar worker sayısından bağımsızdır)",
+    )
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="Kullanıcı bloklarını tek matris çarpımıyla skorla (hızlı mod)",
+    )
     parser.add_argument(
         "--min-hide-sim",
         type=float,
@@ -479,6 +845,8 @@ def main() -> None:
         n_hidden=args.n_hidden,
         smart_hide=smart_hide,
         min_hide_similarity=args.min_hide_sim,
+        workers=args.workers,
+        batched=args.batched,
     )
     
     n_hidden = result.get("n_hidden", 1)
@@ -506,6 +874,8 @@ def main() -> None:
         print(f"   • HitRate (hits/total_hidden): {result['hit_rate']:.3f} ({result['hit_rate']*100:.1f}%)")
         print(f"   • Avg Recall@{args.top_n}: {result.get('avg_recall', 0):.3f} ({result.get('avg_recall', 0)*100:.1f}%)")
         print(f"   • Avg Precision@{args.top_n}: {result.get('avg_precision', 0):.3f}")
+    print(f"   • NDCG@{args.top_n}: {result.get('avg_ndcg', 0):.3f}")
+    print(f"   • MRR@{args.top_n}: {result.get('avg_mrr', 0):.3f}")
     
     print(f"\n⚙️  Parametreler:")
     print(f"   • mode: {args.mode}")
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
 import argparse
+import json
 import pickle
+import sys
 import textwrap
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Iterable, Sequence
 
 import numpy as np
 import pandas as pd
 from scipy import sparse
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
+import artifact_store as store
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from src.title_index import TitleIndex  # noqa: E402
 
 BASE_DIR = Path(__file__).resolve().parent
 MODELS_DIR = BASE_DIR / "models"
@@ -20,17 +30,90 @@ VECTORIZER_PATH = MODELS_DIR / "tfidf_vectorizer.pkl"
 MATRIX_PATH = MODELS_DIR / "tfidf_matrix.npz"
 METADATA_PARQUET = MODELS_DIR / "metadata.parquet"
 METADATA_PICKLE = MODELS_DIR / "metadata.parquet.pkl"
+META_JSON_PATH = MODELS_DIR / "content_meta.json"
+CSR_DIR = MODELS_DIR / "tfidf_csr"
+METADATA_STORE_DIR = MODELS_DIR / "metadata_store"
+
+MATRIX_DTYPE = np.float32
 
 DEFAULT_TOP_N = 10
+DEFAULT_BATCH_MEMORY_MB = 256
+RESULT_COLUMNS = [
+    "title",
+    "tmdb_id",
+    "similarity",
+    "genres",
+    "overview_snippet",
+    "vote_average",
+    "vote_count",
+]
 
 
 @dataclass(frozen=True)
 class ArtifactBundle:
-    vectorizer: object
+    """
+    Content modelinin yüklenmiş hali.
+
+    Tüm diziler matris satırlarıyla hizalıdır (satır ``i`` = ``matrix_index`` ``i``).
+    Metin kolonları ofset indeksli blob'lardır; sadece okunan satırlar decode edilir.
+    """
+
     matrix: sparse.csr_matrix
-    metadata: pd.DataFrame
+    tmdb_ids: np.ndarray
+    vote_average: np.ndarray
+    vote_count: np.ndarray
+    titles: store.TextColumn
+    genres: store.TextColumn
+    overviews: store.TextColumn
     title_to_id: dict[str, int]
     id_to_index: dict[int, int]
+    release_years: np.ndarray | None = None  # eski artefaktlarda yok
+
+    @cached_property
+    def vectorizer(self):
+        # Öneri akışında kullanılmıyor; soğuk açılışı yavaşlatmasın diye ilk erişimde yüklenir.
+        return _load_pickle(VECTORIZER_PATH)
+
+    @cached_property
+    def metadata(self) -> pd.DataFrame:
+        """Analiz/test arayüzleri için tam tablo; ilk erişimde bir kez kurulur (overview hariç)."""
+        return pd.DataFrame(
+            {
+                "title": self.titles.tolist(),
+                "tmdb_id": np.asarray(self.tmdb_ids),
+                "genres": self.genres.tolist(),
+                "vote_average": np.asarray(self.vote_average, dtype=float),
+                "vote_count": np.asarray(self.vote_count),
+                "matrix_index": np.arange(len(self.tmdb_ids)),
+            }
+        )
+
+    @cached_property
+    def popularity_order(self) -> np.ndarray:
+        """vote_count, sonra vote_average'a göre azalan satır sırası (popüler fallback)."""
+        vote_average = np.nan_to_num(np.asarray(self.vote_average, dtype=float), nan=0.0)
+        return np.lexsort((-vote_average, -np.asarray(self.vote_count, dtype=float)))
+
+    @cached_property
+    def extra_rows(self) -> dict[int, list[int]]:
+        """Katalogda birden fazla satırı olan tmdb id'lerin ``id_to_index`` dışındaki satırları."""
+        extra: dict[int, list[int]] = {}
+        for row, tmdb_id in enumerate(np.asarray(self.tmdb_ids).tolist()):
+            if self.id_to_index.get(tmdb_id) != row:
+                extra.setdefault(tmdb_id, []).append(row)
+        return extra
+
+    @cached_property
+    def title_index(self) -> TitleIndex:
+        """Başlık çözümleyici (tam + yıl/bulanık eşleşme); ilk erişimde kurulur."""
+        years = None if self.release_years is None else np.asarray(self.release_years).tolist()
+        return TitleIndex(self.titles.tolist(), np.asarray(self.tmdb_ids).tolist(), years, normalize=normalize_title)
+
+    def rows_for_id(self, tmdb_id: int) -> list[int]:
+        row = self.id_to_index.get(tmdb_id)
+        if row is None:
+            return []
+        return [row, *self.extra_rows.get(tmdb_id, ())]
 
 
 _CACHE: ArtifactBundle | None = None
@@ -49,37 +132,109 @@ def load_metadata_frame() -> pd.DataFrame:
     raise FileNotFoundError("Metadata dosyası bulunamadı (parquet/pkl).")
 
 
+def load_content_meta() -> dict:
+    if not META_JSON_PATH.exists():
+        return {}
+    with META_JSON_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def normalize_matrix_rows(matrix: sparse.spmatrix) -> sparse.csr_matrix:
+    """Satırları L2-normalize float32 CSR matrise çevirir (sıfır satırlar sıfır kalır)."""
+    matrix = sparse.csr_matrix(matrix, dtype=MATRIX_DTYPE)
+    return normalize(matrix, norm="l2", axis=1, copy=False)
+
+
+def _matrix_is_normalized(meta: dict, matrix: sparse.csr_matrix) -> bool:
+    return bool(meta.get("rows_l2_normalized")) and matrix.dtype == MATRIX_DTYPE
+
+
+def _store_dirs(meta: dict) -> tuple[Path, Path]:
+    """
+    Meta'nın işaret ettiği (CSR, metadata) klasörleri.
+
+    Pipeline her build'de yeni sürümlü klasörler yazar ve meta'yı en son
+    değiştirir; eski meta'lar sabit ``tfidf_csr``/``metadata_store`` adlarını kullanır.
+    """
+    layout = meta.get("mmap_layout") or {}
+    return (
+        CSR_DIR.parent / layout.get("csr_dir", CSR_DIR.name),
+        METADATA_STORE_DIR.parent / layout.get("metadata_store_dir", METADATA_STORE_DIR.name),
+    )
+
+
+def _mmap_layout_ready(meta: dict) -> bool:
+    csr_dir, metadata_dir = _store_dirs(meta)
+    return (
+        bool(meta.get("rows_l2_normalized"))
+        and store.csr_exists(csr_dir)
+        and store.metadata_store_exists(metadata_dir)
+    )
+
+
+def _load_from_store(meta: dict) -> dict:
+    """Memmap düzeninden yükler; matris, id/oy dizileri ve metinler process'ler arasında paylaşılır."""
+    csr_dir, metadata_dir = _store_dirs(meta)
+    return {
+        "matrix": store.load_csr(csr_dir),
+        "tmdb_ids": store.load_numeric_column(metadata_dir, "tmdb_id"),
+        "vote_average": store.load_numeric_column(metadata_dir, "vote_average"),
+        "vote_count": store.load_numeric_column(metadata_dir, "vote_count"),
+        "titles": store.TextColumn.open(metadata_dir, "title"),
+        "genres": store.TextColumn.open(metadata_dir, "genres"),
+        "overviews": store.TextColumn.open(metadata_dir, "overview"),
+        "release_years": store.load_optional_numeric_column(metadata_dir, "release_year"),
+    }
+
+
+def _load_legacy() -> dict:
+    matrix = sparse.load_npz(MATRIX_PATH).tocsr()
+    meta = load_content_meta()
+    if not _matrix_is_normalized(meta, matrix):
+        # Eski artefakt: yalnızca bellekte normalize edilir. Diske yazmak
+        # ``data_pipeline.py --export-mmap``'in işidir; yükleme yolu dosyalara
+        # dokunmaz (aynı anda yükleyen worker'lar yarım dosya görmesin).
+        print("⚠️ TF-IDF matrisi normalize edilmemiş; kalıcı çevirmek için: python data_pipeline.py --export-mmap")
+        matrix = normalize_matrix_rows(matrix)
+    metadata = load_metadata_frame().sort_values("matrix_index", kind="stable")
+    return {
+        "matrix": matrix,
+        "tmdb_ids": metadata["tmdb_id"].to_numpy(dtype=np.int64),
+        "vote_average": pd.to_numeric(metadata["vote_average"], errors="coerce").to_numpy(dtype=np.float32),
+        "vote_count": pd.to_numeric(metadata["vote_count"], errors="coerce").fillna(0).to_numpy(dtype=np.int32),
+        "titles": store.TextColumn.from_values(metadata["title"]),
+        "genres": store.TextColumn.from_values(metadata["genres"]),
+        "overviews": store.TextColumn.from_values(metadata["overview"]),
+        "release_years": (
+            metadata["release_year"].to_numpy(dtype=np.int16) if "release_year" in metadata else None
+        ),
+    }
+
+
 def load_artifacts(force_reload: bool = False) -> ArtifactBundle:
     global _CACHE
     if _CACHE is not None and not force_reload:
         return _CACHE
 
-    if not VECTORIZER_PATH.exists() or not MATRIX_PATH.exists():
+    meta = load_content_meta()
+    if _mmap_layout_ready(meta):
+        parts = _load_from_store(meta)
+    elif MATRIX_PATH.exists():
+        parts = _load_legacy()
+    else:
         raise FileNotFoundError(
             "TF-IDF artefaktları bulunamadı. Önce data_pipeline.py çalıştırın."
         )
 
-    vectorizer = _load_pickle(VECTORIZER_PATH)
-    matrix = sparse.load_npz(MATRIX_PATH)
-    metadata = load_metadata_frame()
-
-    metadata = metadata.copy()
-    metadata["title"] = metadata["title"].astype(str)
-    metadata["normalized_title"] = metadata["title"].str.strip().str.casefold()
-    metadata["genres"] = metadata["genres"].fillna("")
-    metadata["overview"] = metadata["overview"].fillna("")
-
-    title_to_id = (
-        metadata.drop_duplicates(subset="normalized_title")
-        .set_index("normalized_title")["tmdb_id"]
-        .to_dict()
-    )
-    id_to_index = metadata.set_index("tmdb_id")["matrix_index"].to_dict()
+    tmdb_ids = parts["tmdb_ids"].tolist()
+    title_to_id: dict[str, int] = {}
+    for title, tmdb_id in zip(parts["titles"].tolist(), tmdb_ids):
+        # Aynı başlıkta ilk kayıt kazanır.
+        title_to_id.setdefault(normalize_title(title), tmdb_id)
+    id_to_index = {tmdb_id: row for row, tmdb_id in enumerate(tmdb_ids)}
 
     _CACHE = ArtifactBundle(
-        vectorizer=vectorizer,
-        matrix=matrix,
-        metadata=metadata,
+        **parts,
         title_to_id=title_to_id,
         id_to_index=id_to_index,
     )
@@ -91,11 +246,13 @@ def normalize_title(title: str) -> str:
 
 
 def titles_to_ids(titles: Sequence[str], bundle: ArtifactBundle) -> tuple[list[int], list[str]]:
+    """Tam eşleşme, yoksa ``"Heat (1995)"`` yıl ayrımı ve bulanık eşleşme (bkz. ``src.title_index``)."""
     found: list[int] = []
     missing: list[str] = []
     for title in titles:
-        norm = normalize_title(title)
-        movie_id = bundle.title_to_id.get(norm)
+        movie_id = bundle.title_to_id.get(normalize_title(title))
+        if movie_id is None:
+            movie_id, _ = bundle.title_index.lookup(title, partial=False)
         if movie_id is None:
             missing.append(title)
         else:
@@ -104,10 +261,91 @@ def titles_to_ids(titles: Sequence[str], bundle: ArtifactBundle) -> tuple[list[i
 
 
 def _format_overview(text: str, limit: int = 160) -> str:
-    text = text.strip()
-    if not text:
-        return ""
-    return textwrap.shorten(text, width=limit, placeholder="…")
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    # shorten tüm metni kelimelere böler; sınırı aşan ilk kelimeden sonrası sonucu değiştirmez
+    cut = text.find(" ", limit + 1)
+    return textwrap.shorten(text if cut < 0 else text[:cut], width=limit, placeholder="…")
+
+
+def top_rows(
+    scores: np.ndarray,
+    top_n: int,
+    *,
+    exclude_mask: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    En yüksek skorlu ``top_n`` satırı azalan sırada döndürür.
+
+    Tam sıralama yerine ``argpartition`` ile önce aday kümesi seçilir,
+    sadece bu küçük küme sıralanır.
+    """
+    scores = np.asarray(scores, dtype=float)
+    if exclude_mask is not None:
+        candidates = np.flatnonzero(~exclude_mask)
+        scores = scores[candidates]
+    else:
+        candidates = np.arange(len(scores))
+    k = min(top_n, len(candidates))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(candidates):
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(len(candidates))
+    order = part[np.argsort(-scores[part], kind="stable")]
+    return candidates[order]
+
+
+def exclude_mask_for(bundle: ArtifactBundle, exclude_ids: Iterable[int]) -> np.ndarray | None:
+    exclude = list(exclude_ids)
+    if not exclude:
+        return None
+    return np.isin(bundle.tmdb_ids, np.asarray(exclude, dtype=np.int64))
+
+
+def rows_to_dataframe(
+    bundle: ArtifactBundle,
+    rows: np.ndarray,
+    similarity: np.ndarray | None,
+) -> pd.DataFrame:
+    """Seçilen satırlar için sonuç tablosu; metinler sadece bu satırlar için okunur."""
+    rows = np.asarray(rows, dtype=np.int64)
+    genres = [g if g else "N/A" for g in bundle.genres.take(rows)]
+    vote_average = np.nan_to_num(np.asarray(bundle.vote_average, dtype=float)[rows], nan=0.0)
+    return pd.DataFrame(
+        {
+            "title": bundle.titles.take(rows),
+            "tmdb_id": np.asarray(bundle.tmdb_ids)[rows].astype(np.int64),
+            "similarity": similarity if similarity is not None else np.full(len(rows), np.nan),
+            "genres": genres,
+            "overview_snippet": [_format_overview(t) for t in bundle.overviews.take(rows)],
+            "vote_average": vote_average,
+            "vote_count": np.asarray(bundle.vote_count)[rows].astype(np.int64),
+        },
+        index=rows,
+        columns=RESULT_COLUMNS,
+    )
+
+
+def rows_to_records(
+    bundle: ArtifactBundle,
+    rows: np.ndarray,
+    similarity: np.ndarray | None,
+) -> list[dict]:
+    """``rows_to_dataframe(...).to_dict(orient="records")`` ile aynı sonuç, DataFrame kurmadan (API yolu)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = (
+        bundle.titles.take(rows),
+        np.asarray(bundle.tmdb_ids)[rows].astype(np.int64).tolist(),
+        similarity.tolist() if similarity is not None else [np.nan] * len(rows),
+        [g if g else "N/A" for g in bundle.genres.take(rows)],
+        [_format_overview(t) for t in bundle.overviews.take(rows)],
+        np.nan_to_num(np.asarray(bundle.vote_average, dtype=float)[rows], nan=0.0).tolist(),
+        np.asarray(bundle.vote_count)[rows].astype(np.int64).tolist(),
+    )
+    return [dict(zip(RESULT_COLUMNS, values)) for values in zip(*columns)]
 
 
 def scores_to_dataframe(
@@ -117,28 +355,30 @@ def scores_to_dataframe(
     exclude_ids: Iterable[int],
     top_n: int,
 ) -> pd.DataFrame:
-    metadata = bundle.metadata
-    exclude_set = set(exclude_ids)
-
-    metadata = metadata.assign(similarity=scores)
-    metadata = metadata[~metadata["tmdb_id"].isin(exclude_set)]
-    metadata = metadata.sort_values("similarity", ascending=False).head(top_n)
-    metadata = metadata.copy()
-    metadata["overview_snippet"] = metadata["overview"].apply(_format_overview)
-    metadata["genres"] = metadata["genres"].replace("", "N/A")
-    metadata["vote_average"] = metadata["vote_average"].fillna(0.0)
-    metadata["vote_count"] = metadata["vote_count"].fillna(0)
-    return metadata[
-        [
-            "title",
-            "tmdb_id",
-            "similarity",
-            "genres",
-            "overview_snippet",
-            "vote_average",
-            "vote_count",
-        ]
-    ]
+    scores = np.asarray(scores, dtype=float)
+    rows = top_rows(scores, top_n, exclude_mask=exclude_mask_for(bundle, exclude_ids))
+    return rows_to_dataframe(bundle, rows, scores[rows])
+
+
+def similarity_to_all(vector: np.ndarray, bundle: ArtifactBundle) -> np.ndarray:
+    """
+    Verilen yoğun vektörün tüm filmlerle benzerliği.
+
+    Matris satırları L2-normalize olduğundan tek bir ``matrix @ vector`` çarpımı
+    yeterlidir; vektör normalize ise sonuç doğrudan cosine similarity'dir.
+    """
+    vector = np.asarray(vector, dtype=MATRIX_DTYPE).ravel()
+    return np.asarray(bundle.matrix @ vector, dtype=float).ravel()
+
+
+def pairwise_similarity(indices: Sequence[int], bundle: ArtifactBundle) -> np.ndarray:
+    """Verilen matris satırları arasındaki (len × len) cosine benzerlik matrisi."""
+    subset = bundle.matrix[list(indices)]
+    return np.asarray((subset @ subset.T).toarray(), dtype=float)
+
+
+def mean_vector(indices: Sequence[int], bundle: ArtifactBundle) -> np.ndarray:
+    return np.asarray(bundle.matrix[list(indices)].mean(axis=0), dtype=MATRIX_DTYPE).ravel()
 
 
 def _compute_similarity_for_indices(
@@ -151,21 +391,17 @@ def _compute_similarity_for_indices(
     if not indices:
         return np.zeros(matrix.shape[0], dtype=float)
 
-    if method == "score_avg":
-        sims = []
-        for idx in indices:
-            vec = cosine_similarity(matrix[idx], matrix).ravel()
-            sims.append(vec)
-        scores = np.vstack(sims).mean(axis=0)
-        return scores
+    if method not in ("score_avg", "vector_avg"):
+        raise ValueError(f"Bilinmeyen method: {method}")
 
+    # score_avg: normalize satırlarla skorların ortalaması = ortalama vektörle tek dot.
+    profile = mean_vector(indices, bundle)
     if method == "vector_avg":
-        subset = matrix[indices]
-        profile = subset.mean(axis=0)
-        scores = cosine_similarity(profile, matrix).ravel()
-        return scores
-
-    raise ValueError(f"Bilinmeyen method: {method}")
+        norm = float(np.linalg.norm(profile))
+        if norm == 0.0:
+            return np.zeros(matrix.shape[0], dtype=float)
+        profile = profile / norm
+    return similarity_to_all(profile, bundle)
 
 
 def recommend_single(movie_id: int, top_n: int = DEFAULT_TOP_N, method: str = "score_avg") -> pd.DataFrame:
@@ -197,25 +433,152 @@ def recommend_multi(
 
 def get_popular_fallback(top_n: int = DEFAULT_TOP_N) -> pd.DataFrame:
     bundle = load_artifacts()
-    metadata = bundle.metadata.copy()
-    metadata["vote_average"] = metadata["vote_average"].fillna(0.0)
-    metadata["vote_count"] = metadata["vote_count"].fillna(0)
-    metadata = metadata.sort_values(
-        ["vote_count", "vote_average"], ascending=[False, False]
-    ).head(top_n)
-    metadata["similarity"] = np.nan
-    metadata["overview_snippet"] = metadata["overview"].apply(_format_overview)
-    return metadata[
-        [
-            "title",
-            "tmdb_id",
-            "similarity",
-            "genres",
-            "overview_snippet",
-            "vote_average",
-            "vote_count",
-        ]
-    ]
+    rows = bundle.popularity_order[:top_n]
+    return rows_to_dataframe(bundle, rows, None)
+
+
+@dataclass(frozen=True)
+class BatchRecommendations:
+    """
+    Çok kullanıcılı skorlama sonucu.
+
+    ``rows``/``tmdb_ids``/``scores`` (kullanıcı × top_n) boyutludur; öneri
+    bulunamayan hücreler ``-1`` / ``nan`` ile doldurulur. ``valid`` False olan
+    kullanıcıların hiçbir filmi katalogda eşleşmemiştir (fallback gerekir).
+    """
+
+    rows: np.ndarray
+    tmdb_ids: np.ndarray
+    scores: np.ndarray
+    valid: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_dataframe(self, user: int, bundle: ArtifactBundle) -> pd.DataFrame:
+        keep = self.rows[user] >= 0
+        return rows_to_dataframe(bundle, self.rows[user][keep], self.scores[user][keep])
+
+    def to_records(self, user: int, bundle: ArtifactBundle, top_n: int | None = None) -> list[dict]:
+        """Kullanıcının ilk ``top_n`` önerisi JSON'a hazır sözlükler olarak (bkz. ``rows_to_records``)."""
+        keep = self.rows[user] >= 0
+        return rows_to_records(bundle, self.rows[user][keep][:top_n], self.scores[user][keep][:top_n])
+
+
+def _rating_weight(ratings: Sequence[float] | None, position: int) -> float:
+    weight = 1.0
+    if ratings and position < len(ratings):
+        try:
+            weight = float(ratings[position])
+        except (TypeError, ValueError):
+            weight = 1.0
+    return max(weight, 1e-6)
+
+
+def build_profile_matrix(
+    liked_ids: Sequence[Sequence[int]],
+    bundle: ArtifactBundle,
+    *,
+    ratings: Sequence[Sequence[float] | None] | None = None,
+    normalize_profiles: bool = False,
+) -> sparse.csr_matrix:
+    """
+    Kullanıcı profillerini (kullanıcı × feature) sparse matris olarak kurar.
+
+    Her profil, beğenilen film satırlarının (rating ile) ağırlıklı ortalamasıdır;
+    ``normalize_profiles`` True ise ayrıca L2-normalize edilir (vector_avg / profile).
+    """
+    user_idx: list[int] = []
+    item_idx: list[int] = []
+    weights: list[float] = []
+    for user, ids in enumerate(liked_ids):
+        user_ratings = ratings[user] if ratings is not None else None
+        for position, movie_id in enumerate(ids):
+            row = bundle.id_to_index.get(movie_id)
+            if row is None:
+                continue
+            user_idx.append(user)
+            item_idx.append(row)
+            weights.append(_rating_weight(user_ratings, position))
+
+    n_items = bundle.matrix.shape[0]
+    weight_matrix = sparse.csr_matrix(
+        (np.asarray(weights, dtype=MATRIX_DTYPE), (user_idx, item_idx)),
+        shape=(len(liked_ids), n_items),
+    )
+    weight_matrix = normalize(weight_matrix, norm="l1", axis=1, copy=False)
+    profiles = sparse.csr_matrix(weight_matrix @ bundle.matrix, dtype=MATRIX_DTYPE)
+    if normalize_profiles:
+        profiles = normalize(profiles, norm="l2", axis=1, copy=False)
+    return profiles
+
+
+def batch_chunk_size(bundle: ArtifactBundle, memory_budget_mb: float) -> int:
+    """Bir çarpımda kaç profilin skorlanacağı: (katalog + feature) × float32 / kullanıcı."""
+    n_items, n_features = bundle.matrix.shape
+    per_user = (n_items + n_features) * np.dtype(MATRIX_DTYPE).itemsize
+    return max(1, int(memory_budget_mb * 1024 * 1024 // per_user))
+
+
+def recommend_batch(
+    liked_ids: Sequence[Sequence[int]],
+    *,
+    ratings: Sequence[Sequence[float] | None] | None = None,
+    top_n: int = DEFAULT_TOP_N,
+    method: str = "score_avg",
+    memory_budget_mb: float = DEFAULT_BATCH_MEMORY_MB,
+) -> BatchRecommendations:
+    """
+    Birçok kullanıcı için tek seferde öneri üretir.
+
+    Profiller sparse matrise yığılır, ``matrix @ profiles.T`` çarpımı bellek
+    bütçesine göre parçalar halinde yapılır ve her satırın top-N'i
+    ``argpartition`` ile seçilir. Tek kullanıcı için ``recommend_multi`` ile
+    (``ratings`` verilirse ``user_profile.recommend_with_profile`` ile) aynı
+    sonucu verir.
+    """
+    if method not in ("score_avg", "vector_avg"):
+        raise ValueError(f"Bilinmeyen method: {method}")
+
+    bundle = load_artifacts()
+    n_users = len(liked_ids)
+    n_items = bundle.matrix.shape[0]
+    profiles = build_profile_matrix(
+        liked_ids,
+        bundle,
+        ratings=ratings,
+        normalize_profiles=method == "vector_avg" or ratings is not None,
+    )
+    valid = np.diff(profiles.indptr) > 0
+
+    k = max(0, min(top_n, n_items))
+    rows_out = np.full((n_users, k), -1, dtype=np.int64)
+    scores_out = np.full((n_users, k), np.nan, dtype=float)
+    chunk = batch_chunk_size(bundle, memory_budget_mb)
+
+    for start in range(0, n_users, chunk):
+        stop = min(start + chunk, n_users)
+        block = profiles[start:stop].toarray()
+        scores = np.asarray(bundle.matrix @ block.T, dtype=MATRIX_DTYPE).T
+        for offset, user in enumerate(range(start, stop)):
+            for movie_id in liked_ids[user]:
+                scores[offset, bundle.rows_for_id(movie_id)] = -np.inf
+        if k == 0:
+            continue
+        if k < n_items:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(n_items), (stop - start, 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        usable = np.isfinite(top_scores) & valid[start:stop, None]
+        rows_out[start:stop] = np.where(usable, top, -1)
+        scores_out[start:stop] = np.where(usable, top_scores, np.nan)
+
+    tmdb_ids = np.where(rows_out >= 0, np.asarray(bundle.tmdb_ids)[np.maximum(rows_out, 0)], -1)
+    return BatchRecommendations(rows=rows_out, tmdb_ids=tmdb_ids, scores=scores_out, valid=valid)
 
 
 def cli_recommend(titles: Sequence[str], top_n: int, method: str) -> pd.DataFrame:
@@ -7,7 +7,6 @@ from typing import Sequence
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
 
 BASE_DIR = Path(__file__).resolve().parent
 if str(BASE_DIR) not in sys.path:
@@ -41,12 +40,11 @@ def build_user_profile(
     if not indices:
         raise ValueError("Seçilen filmler metadata içinde bulunamadı.")
 
-    subset = bundle.matrix[indices].toarray()
     weight_arr = np.array(weights, dtype=float)
     weight_arr = weight_arr / weight_arr.sum()
-    weighted = subset * weight_arr[:, np.newaxis]
-    profile = weighted.sum(axis=0)
-    profile = np.asarray(profile, dtype=np.float32)
+    # Ağırlıklı satır toplamı sparse kalır; yoğun (len × feature) kopya oluşmaz.
+    profile = bundle.matrix[indices].T @ weight_arr
+    profile = np.asarray(profile, dtype=np.float32).ravel()
 
     with np.errstate(all="ignore"):
         norm = np.linalg.norm(profile)
@@ -67,13 +65,36 @@ def recommend_with_profile(
         return rc.get_popular_fallback(top_n=top_n), missing
 
     profile = build_user_profile(movie_ids, ratings=ratings)
-    scores = cosine_similarity(profile.reshape(1, -1), bundle.matrix).ravel()
+    scores = rc.similarity_to_all(profile, bundle)
     df = rc.scores_to_dataframe(scores, bundle, exclude_ids=movie_ids, top_n=top_n)
     if df.empty:
         return rc.get_popular_fallback(top_n=top_n), missing
     return df, missing
 
 
+def recommend_batch_with_profile(
+    liked_ids: Sequence[Sequence[int]],
+    *,
+    ratings: Sequence[Sequence[float] | None] | None = None,
+    top_n: int = rc.DEFAULT_TOP_N,
+    memory_budget_mb: float = rc.DEFAULT_BATCH_MEMORY_MB,
+) -> rc.BatchRecommendations:
+    """
+    ``recommend_with_profile``'ın çok kullanıcılı karşılığı (TMDB id listeleriyle).
+
+    Rating'ler verilmezse her film eşit ağırlık alır; profil yine L2-normalize edilir.
+    """
+    if ratings is None:
+        ratings = [None] * len(liked_ids)
+    return rc.recommend_batch(
+        liked_ids,
+        ratings=ratings,
+        top_n=top_n,
+        method="vector_avg",
+        memory_budget_mb=memory_budget_mb,
+    )
+
+
 def parse_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="User profile tabanlı öneri aracı")
     parser.add_argument("--titles", type=str, required=True, help="Virgülle ayrılmış film listesi")
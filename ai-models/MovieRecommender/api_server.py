@@ -1,11 +1,27 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+import gc
+import json
+import os
 import pickle
-import pandas as pd
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+import numpy as np
 import sys
 
 PROJECT_DIR = Path(__file__).resolve().parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from src import hybrid
+from src.id_links import IdLinks, load_id_links
+from src.metrics import CONTENT_TYPE, REGISTRY
+from src.micro_batch import MicroBatcher
+from src.response_cache import MISS, ResponseCache
+from src.title_index import index_for_frame
 
 # Add Content-Based folder to path
 CONTENT_BASED_DIR = PROJECT_DIR / "Content-Based"
@@ -30,82 +46,329 @@ except ImportError as e:
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# ==============================================
+# 📈 Metrics
+# ==============================================
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "movierec_request_duration_seconds",
+    "Request latency by endpoint and phase (load, resolve, score, serialize, total).",
+    ("endpoint", "phase"),
+)
+REQUESTS = REGISTRY.counter(
+    "movierec_requests_total", "Handled requests by endpoint and HTTP status.", ("endpoint", "status")
+)
+TITLE_MISSES = REGISTRY.counter(
+    "movierec_title_misses_total", "Input titles that could not be resolved to a movie.", ("endpoint",)
+)
+ID_MISSES = REGISTRY.counter(
+    "movierec_id_misses_total", "Input TMDB/MovieLens ids unknown to the model.", ("endpoint",)
+)
+TITLE_FALLBACKS = REGISTRY.counter(
+    "movierec_title_fallbacks_total", "Input titles resolved only through partial matching.", ("endpoint",)
+)
+EMPTY_RESULTS = REGISTRY.counter(
+    "movierec_empty_results_total", "Requests that returned no recommendations.", ("endpoint",)
+)
+MODEL_LOAD_SECONDS = REGISTRY.gauge(
+    "movierec_model_load_seconds", "Wall time of the last model load.", ("model",)
+)
+ARTIFACT_INFO = REGISTRY.gauge(
+    "movierec_artifact_info", "Loaded artifact version (generation time); value is always 1.", ("model", "version")
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "movierec_response_cache_lookups_total", "Response cache lookups by endpoint and result (hit/miss).",
+    ("endpoint", "result"),
+)
+CACHE_EVICTIONS = REGISTRY.counter(
+    "movierec_response_cache_evictions_total", "Response cache entries dropped (size, ttl, invalidate).", ("reason",)
+)
+CACHE_ENTRIES = REGISTRY.gauge("movierec_response_cache_entries", "Entries currently in the response cache.")
+MODEL_SCORE_SECONDS = REGISTRY.histogram(
+    "movierec_model_score_seconds", "Per-model scoring time inside /recommend/all.", ("model",)
+)
+CONTENT_BATCH_SIZE = REGISTRY.histogram(
+    "movierec_content_batch_size", "Content-Based requests scored together in one micro-batch.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+CONTENT_BATCH_WAIT = REGISTRY.histogram(
+    "movierec_content_batch_wait_seconds", "Time a micro-batch leader waited for other requests to join.",
+)
+
+# Many users share the same popular favorites; identical (model, version, ids, top_n)
+# requests are answered from memory. MOVIEREC_CACHE_SIZE=0 or MOVIEREC_CACHE_TTL=0
+# disables the cache.
+RESPONSE_CACHE = ResponseCache(
+    max_entries=int(os.environ.get("MOVIEREC_CACHE_SIZE", "2048")),
+    ttl_seconds=float(os.environ.get("MOVIEREC_CACHE_TTL", "600")),
+    on_evict=lambda reason, count: CACHE_EVICTIONS.inc(count, reason=reason),
+)
+
+
+def artifact_version(meta_path, artifact_path):
+    """Artifact version: ``generated_at`` from the meta JSON, else the artifact's mtime."""
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            generated_at = json.load(f).get("generated_at")
+        if generated_at:
+            return str(generated_at)
+    except (OSError, ValueError):
+        pass
+    try:
+        mtime = Path(artifact_path).stat().st_mtime
+    except OSError:
+        return "missing"
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+
+
+# Handlers run on several threads (gunicorn gthread, the async scoring pool);
+# the lazily built model state below is only touched under these locks.
+_artifact_versions = {}
+_artifact_lock = threading.Lock()
+
+
+def artifact_versions():
+    """Consistent snapshot of the loaded artifact versions, by model."""
+    with _artifact_lock:
+        return dict(_artifact_versions)
+
+
+def record_model_load(model, seconds, version):
+    MODEL_LOAD_SECONDS.set(seconds, model=model)
+    with _artifact_lock:
+        previous = _artifact_versions.get(model)
+        _artifact_versions[model] = version
+        if previous is not None and previous != version:
+            ARTIFACT_INFO.remove(model=model, version=previous)
+            # Keys carry the version, so old entries could never hit; free them now.
+            RESPONSE_CACHE.invalidate(model)
+            RESPONSE_CACHE.invalidate("hybrid")
+            CACHE_ENTRIES.set(len(RESPONSE_CACHE))
+        ARTIFACT_INFO.set(1, model=model, version=version)
+
+
+def phase(endpoint, name):
+    """Context manager timing one phase of a request."""
+    return REQUEST_LATENCY.time(endpoint=endpoint, phase=name)
+
+
+def cached_recommendations(endpoint, model, liked_ids, top_n, compute, version=None, cacheable=None):
+    """
+    ``compute()`` result for this request, served from the response cache when possible.
+
+    The key is (model, artifact version, sorted ids, top_n): every model scores a
+    favorite set independently of its order. ``version`` overrides the model's
+    artifact version (the hybrid passes all of them). Results for which
+    ``cacheable(value)`` is false are returned but not stored. Cached lists are
+    shared between requests and must not be mutated.
+    """
+    if version is None:
+        version = artifact_versions().get(model)
+    try:
+        key = (model, version, tuple(sorted(set(liked_ids))), top_n)
+        hash(key)
+    except TypeError:  # unhashable top_n from a malformed request
+        return compute()
+    value = RESPONSE_CACHE.get(key)
+    if value is not MISS:
+        CACHE_LOOKUPS.inc(endpoint=endpoint, result="hit")
+        return value
+    CACHE_LOOKUPS.inc(endpoint=endpoint, result="miss")
+    value = compute()
+    if cacheable is None or cacheable(value):
+        RESPONSE_CACHE.put(key, value)
+        CACHE_ENTRIES.set(len(RESPONSE_CACHE))
+    return value
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    started = g.get("request_started")
+    if started is not None:
+        REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, phase="total")
+    REQUESTS.inc(endpoint=endpoint, status=str(response.status_code))
+    return response
+
 # ==============================================
 # 📁 Load Models
 # ==============================================
 
 MODELS_DIR = PROJECT_DIR / "models"
+RAW_DIR = PROJECT_DIR / "data" / "raw"
+LINKS_PATHS = (RAW_DIR / "links.csv", RAW_DIR / "links_small.csv")
 MAPPING_PATH = MODELS_DIR / "movie_mapping.pkl"
 RULES_PATH = MODELS_DIR / "association_rules.pkl"
 
-print(f"[INFO] Loading models from {MODELS_DIR}...")
-try:
-    if not MAPPING_PATH.exists():
-        print(f"[ERROR] Error: {MAPPING_PATH} not found!")
-    if not RULES_PATH.exists():
-        print(f"[ERROR] Error: {RULES_PATH} not found!")
-
-    with open(MAPPING_PATH, "rb") as f:
-        movie_mapping = pickle.load(f)
-    print(f"   [OK] movie_mapping.pkl loaded: {len(movie_mapping)} movies")
-    print(f"   [INFO] Sample movie titles in model: {movie_mapping['title'].head(5).tolist()}")
-
-    with open(RULES_PATH, "rb") as f:
-        rules = pickle.load(f)
-    print(f"   [OK] association_rules.pkl loaded: {len(rules)} rules")
-except Exception as e:
-    print(f"[ERROR] Error loading models: {e}")
-    movie_mapping = None
-    rules = None
+def load_arl_models():
+    """Read the association rules artifacts. Returns (movie_mapping, rules); (None, None) on failure."""
+    print(f"[INFO] Loading models from {MODELS_DIR}...")
+    started = time.perf_counter()
+    try:
+        if not MAPPING_PATH.exists():
+            print(f"[ERROR] Error: {MAPPING_PATH} not found!")
+        if not RULES_PATH.exists():
+            print(f"[ERROR] Error: {RULES_PATH} not found!")
+
+        with open(MAPPING_PATH, "rb") as f:
+            mapping = pickle.load(f)
+        print(f"   [OK] movie_mapping.pkl loaded: {len(mapping)} movies")
+        print(f"   [INFO] Sample movie titles in model: {mapping['title'].head(5).tolist()}")
+
+        with open(RULES_PATH, "rb") as f:
+            loaded_rules = pickle.load(f)
+        print(f"   [OK] association_rules.pkl loaded: {len(loaded_rules)} rules")
+        record_model_load(
+            "association_rules",
+            time.perf_counter() - started,
+            artifact_version(MODELS_DIR / "artifacts_meta.json", RULES_PATH),
+        )
+        return mapping, loaded_rules
+    except Exception as e:
+        print(f"[ERROR] Error loading models: {e}")
+        return None, None
+
+movie_mapping, rules = load_arl_models()
 
 # ==============================================
 # 🧠 Recommendation Logic
 # ==============================================
 
+def title_index_for(movie_mapping):
+    """Title index for ``movie_mapping``, built once per mapping object and reused."""
+    return index_for_frame(movie_mapping)
+
+if movie_mapping is not None:
+    title_index_for(movie_mapping)  # build once at startup, not on the first request
+
+# ==============================================
+# 🔗 Id Contract
+# ==============================================
+
+# Request fields for id-based input; titles in ``liked_movies`` remain optional.
+ID_FIELDS = ("liked_tmdb_ids", "liked_movie_ids")
+
+def load_links(movie_mapping, force_reload=False):
+    """
+    MovieLens movieId <-> TMDB id translation, loaded once at startup.
+
+    Prefers the full ``links.csv`` (covers every content-model movie), then
+    ``links_small.csv`` (both through the prebuilt ``models/id_links`` arrays),
+    then the ``tmdbId`` column of the ARL mapping.
+    """
+    for path in LINKS_PATHS:
+        if path.exists():
+            links = load_id_links(path, force_reload=force_reload)
+            break
+    else:
+        if movie_mapping is not None and "tmdbId" in movie_mapping.columns:
+            links = IdLinks.from_pairs(movie_mapping["movieId"], movie_mapping["tmdbId"])
+        else:
+            print("[WARN] No links mapping found; TMDB/MovieLens id translation is disabled.")
+            links = IdLinks.from_pairs([], [])
+    print(f"   [OK] Id links loaded: {len(links)} movies")
+    return links
+
+id_links = load_links(movie_mapping)
+
+def translated_ids(values, translate):
+    """Translate ids with ``translate`` (an IdLinks lookup); unknown ids become None."""
+    return [None if value < 0 else value for value in translate(values).tolist()] if values else []
+
+def parse_liked_ids(data):
+    """Validated (liked_tmdb_ids, liked_movie_ids) from the request body; ValueError if malformed."""
+    parsed = []
+    for field in ID_FIELDS:
+        values = data.get(field) or []
+        if not isinstance(values, list) or not all(type(value) is int for value in values):
+            raise ValueError(f"'{field}' must be a list of integers")
+        parsed.append(values)
+    return tuple(parsed)
+
+def movielens_ids_for(tmdb_ids, movie_ids, known):
+    """
+    Request ids as MovieLens movieIds (TMDB ids are translated through the links).
+
+    ``known`` is the model's id set. Returns (ids, missing) where ``missing``
+    maps each id field to the ids that could not be used.
+    """
+    ids, missing = [], {field: [] for field in ID_FIELDS}
+    for movie_id in movie_ids:
+        (ids if movie_id in known else missing["liked_movie_ids"]).append(movie_id)
+    for tmdb_id, movie_id in zip(tmdb_ids, translated_ids(tmdb_ids, id_links.tmdb_to_movie)):
+        if movie_id is not None and movie_id in known:
+            ids.append(movie_id)
+        else:
+            missing["liked_tmdb_ids"].append(tmdb_id)
+    return ids, missing
+
+def tmdb_ids_for(tmdb_ids, movie_ids, known):
+    """Request ids as TMDB ids (MovieLens ids are translated through the links); see ``movielens_ids_for``."""
+    ids, missing = [], {field: [] for field in ID_FIELDS}
+    for tmdb_id in tmdb_ids:
+        (ids if tmdb_id in known else missing["liked_tmdb_ids"]).append(tmdb_id)
+    for movie_id, tmdb_id in zip(movie_ids, translated_ids(movie_ids, id_links.movie_to_tmdb)):
+        if tmdb_id is not None and tmdb_id in known:
+            ids.append(tmdb_id)
+        else:
+            missing["liked_movie_ids"].append(movie_id)
+    return ids, missing
+
+def unique_ids(*id_lists):
+    """Concatenate id lists, dropping repeats but keeping first-seen order."""
+    return list(dict.fromkeys(movie_id for ids in id_lists for movie_id in ids))
+
+def record_id_misses(endpoint, missing_ids, response):
+    """Count unknown ids and report them in the response body (only when there are any)."""
+    count = sum(len(ids) for ids in missing_ids.values())
+    if count:
+        print(f"   [WARN] Unknown ids: {missing_ids}")
+        ID_MISSES.inc(count, endpoint=endpoint)
+        response["missing_ids"] = missing_ids
+    return response
+
+def match_title(movie_mapping, title):
+    """
+    Find movieId from title (case-insensitive, fuzzy match).
+
+    Exact matches win (a trailing "(1995)" picks between same-titled movies);
+    otherwise titles longer than 3 characters fall back to the shortest catalog
+    title containing them ("Batman" -> "Batman", not "Batman Returns"), then to
+    the best trigram-similarity match ("Amelie" -> "Amélie").
+    Returns (movie_id or None, used_fallback_match).
+    """
+    index = title_index_for(movie_mapping)
+    movie_id, method = index.lookup(title)
+    used_fallback = method not in (None, "exact")
+    if used_fallback:
+        print(f"   [MATCH] {method.capitalize()} match: '{title.strip()}' -> '{index.id_to_title[movie_id]}'")
+    return movie_id, used_fallback
+
 def title_to_movie_id(movie_mapping, title):
     """Find movieId from title (case-insensitive, fuzzy match)."""
-    title = title.strip()
-    title_lower = title.lower()
-    
-    # 1. Exact match (case-insensitive)
-    match = movie_mapping[movie_mapping["title"].str.lower() == title_lower]
-    if not match.empty:
-        return int(match.iloc[0]["movieId"])
-    
-    # 2. Try removing year if present in input (e.g. "Movie (2020)" -> "Movie")
-    # Or adding year wildcard? No, usually model has years.
-    
-    # 3. Try contains (if input is "Matrix", find "The Matrix")
-    # Be careful with short words.
-    if len(title) > 3:
-        partial = movie_mapping[movie_mapping["title"].str.lower().str.contains(title_lower, regex=False)]
-        if not partial.empty:
-            # Return the shortest match (likely the most exact one)
-            # e.g. "Batman" -> matches "Batman", "Batman Returns". We want "Batman".
-            best_match = partial.loc[partial["title"].str.len().idxmin()]
-            print(f"   [MATCH] Fuzzy match: '{title}' -> '{best_match['title']}'")
-            return int(best_match["movieId"])
-
-    return None
-
-def get_recommendations(movie_mapping, rules, liked_titles, top_n=10):
-    """Generate recommendations based on liked movies."""
-    if movie_mapping is None or rules is None:
-        print("[WARN] Models are not loaded.")
-        return []
+    return match_title(movie_mapping, title)[0]
 
+def resolve_liked_ids(movie_mapping, liked_titles):
+    """Resolve titles to movieIds. Returns (liked_ids, missing_titles, fallback_count)."""
     liked_ids = []
     missing_titles = []
+    fallbacks = 0
     for title in liked_titles:
-        movie_id = title_to_movie_id(movie_mapping, title)
+        movie_id, used_fallback = match_title(movie_mapping, title)
         if movie_id:
             liked_ids.append(movie_id)
+            fallbacks += used_fallback
         else:
             missing_titles.append(title)
-    
-    if missing_titles:
-        print(f"[WARN] Could not find IDs for: {missing_titles}")
+    return liked_ids, missing_titles, fallbacks
 
+def recommend_for_ids(movie_mapping, rules, liked_ids, top_n=10):
+    """Score association rules whose antecedents are covered by ``liked_ids``."""
     if not liked_ids:
         print("[WARN] No valid movie IDs found from input list.")
         return []
@@ -147,147 +410,748 @@ def get_recommendations(movie_mapping, rules, liked_titles, top_n=10):
     )[:top_n]
     
     # Add titles
-    id_to_title = dict(zip(movie_mapping["movieId"], movie_mapping["title"]))
-    for s in sorted_suggestions:
+    id_to_title = title_index_for(movie_mapping).id_to_title
+    tmdb_ids = translated_ids([s["movieId"] for s in sorted_suggestions], id_links.movie_to_tmdb)
+    for s, tmdb_id in zip(sorted_suggestions, tmdb_ids):
         s["title"] = id_to_title.get(s["movieId"], f"Movie #{s['movieId']}")
+        s["tmdbId"] = tmdb_id
     
     return sorted_suggestions
 
+def get_recommendations(movie_mapping, rules, liked_titles, top_n=10):
+    """Generate recommendations based on liked movies."""
+    if movie_mapping is None or rules is None:
+        print("[WARN] Models are not loaded.")
+        return []
+
+    liked_ids, missing_titles, _ = resolve_liked_ids(movie_mapping, liked_titles)
+    if missing_titles:
+        print(f"[WARN] Could not find IDs for: {missing_titles}")
+    return recommend_for_ids(movie_mapping, rules, liked_ids, top_n)
+
+def resolve_itemcf_titles(liked_titles, mapping_df, sim_df):
+    """Item-CF title resolution through the shared title index (exact, then fuzzy)."""
+    index = title_index_for(mapping_df)
+    liked_ids, missing = [], []
+    for title in liked_titles:
+        movie_id, _ = index.lookup(title, partial=False)
+        if movie_id is None:
+            missing.append(title)
+        elif movie_id in sim_df.index:
+            liked_ids.append(movie_id)
+        else:
+            # Known movie, but filtered out of the model for too few votes
+            missing.append(f"{title} (Yetersiz Veri)")
+    return liked_ids, missing, index.id_to_title
+
+def score_content_batch(requests):
+    """
+    Score several (liked_ids, top_n) requests with one ``recommend_batch`` product.
+
+    Gives the same records as ``recommend_multi(...).to_dict(orient="records")`` per request.
+    """
+    batch = recommender_content.recommend_batch([ids for ids, _ in requests], top_n=max(n for _, n in requests))
+    bundle = recommender_content.load_artifacts()
+    return [batch.to_records(i, bundle, top_n) for i, (_, top_n) in enumerate(requests)]
+
+# Concurrent /recommend/content requests (gunicorn threads, async_server pool)
+# share one sparse product instead of each scanning the TF-IDF matrix.
+# MOVIEREC_CONTENT_BATCH_SIZE=1 scores every request on its own.
+CONTENT_BATCHER = MicroBatcher(
+    score_content_batch,
+    max_batch_size=int(os.environ.get("MOVIEREC_CONTENT_BATCH_SIZE", "32")),
+    max_wait_ms=float(os.environ.get("MOVIEREC_CONTENT_BATCH_WAIT_MS", "2")),
+    on_batch=lambda size, waited: (CONTENT_BATCH_SIZE.observe(size), CONTENT_BATCH_WAIT.observe(waited)),
+)
+
+def content_recommendations(liked_ids, top_n):
+    """Content-Based recommendations as JSON-ready dicts carrying both ids."""
+    if CONTENT_BATCHER.max_batch_size > 1 and type(top_n) is int and top_n > 0:
+        recommendations = CONTENT_BATCHER.submit((list(liked_ids), top_n))
+    else:
+        # Malformed top_n values are scored alone so their errors stay with their own request.
+        recommendations = recommender_content.recommend_multi(liked_ids, top_n=top_n).to_dict(orient="records")
+    movie_ids = translated_ids([rec["tmdb_id"] for rec in recommendations], id_links.tmdb_to_movie)
+    for rec, movie_id in zip(recommendations, movie_ids):
+        rec["movieId"] = movie_id
+    return recommendations
+
+def itemcf_recommendations(liked_ids, sim_df, top_n, id_to_title):
+    """Item-CF recommendations as JSON-ready dicts carrying both ids."""
+    df_recs = recommender_itemcf.recommend_by_movie_ids(liked_ids, sim_df, top_n=top_n, id_to_title=id_to_title)
+    recommendations = df_recs.to_dict(orient="records")
+    tmdb_ids = translated_ids([rec["movieId"] for rec in recommendations], id_links.movie_to_tmdb)
+    for rec, tmdb_id in zip(recommendations, tmdb_ids):
+        rec["tmdbId"] = tmdb_id
+    return recommendations
+
+_itemcf_model = None
+_itemcf_lock = threading.Lock()
+
+def load_itemcf_model(force_reload=False):
+    """
+    Item-CF similarity matrix, unpickled once per process and reused across requests.
+
+    Requests never re-read the file: a rebuilt matrix is picked up only by
+    ``/admin/reload`` (``force_reload``) or a restart, so preloaded workers keep
+    sharing the master's copy. The lock lets one thread unpickle while the
+    others wait. Raises FileNotFoundError if the model was never built.
+    """
+    global _itemcf_model
+    sim_df = _itemcf_model
+    if sim_df is not None and not force_reload:
+        return sim_df
+    with _itemcf_lock:
+        if _itemcf_model is not None and not force_reload:
+            return _itemcf_model
+        started = time.perf_counter()
+        sim_df = recommender_itemcf.load_model()
+        record_model_load(
+            "item_based_cf",
+            time.perf_counter() - started,
+            artifact_version(recommender_itemcf.ITEM_META_PATH, recommender_itemcf.ITEM_SIM_PATH),
+        )
+        _itemcf_model = sim_df
+        return sim_df
+
+_content_lock = threading.Lock()
+
+def load_content_bundle(force_reload=False):
+    """Content-Based artifacts (cached by the module); records load time on first load."""
+    bundle = recommender_content._CACHE
+    if bundle is not None and not force_reload:
+        return bundle
+    with _content_lock:
+        first_load = force_reload or recommender_content._CACHE is None
+        started = time.perf_counter()
+        bundle = recommender_content.load_artifacts(force_reload=force_reload)
+        if first_load:
+            record_model_load(
+                "content_based",
+                time.perf_counter() - started,
+                artifact_version(recommender_content.META_JSON_PATH, recommender_content.MATRIX_PATH),
+            )
+        return bundle
+
 # ==============================================
-# 🌐 API Routes
+# 🧾 Request Handlers
 # ==============================================
+# Framework-free: each takes the parsed JSON body and returns (payload, status),
+# so the Flask routes below and the ASGI app in async_server.py share them.
 
-@app.route('/recommend', methods=['POST'])
-def recommend():
+def recommend_response(data):
+    endpoint = "/recommend"
     print("\n[REQ] [Model 1] Received recommendation request")
-    if not request.is_json:
-        return jsonify({"error": "Request must be JSON"}), 400
-    
-    data = request.get_json()
     liked_movies = data.get("liked_movies", [])
     top_n = data.get("top_n", 10)
     
     print(f"   Input movies: {liked_movies}")
     
     if not isinstance(liked_movies, list):
-        return jsonify({"error": "'liked_movies' must be a list"}), 400
+        return {"error": "'liked_movies' must be a list"}, 400
+    try:
+        tmdb_ids, movie_ids = parse_liked_ids(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
     try:
-        recommendations = get_recommendations(movie_mapping, rules, liked_movies, top_n)
+        missing_ids = {}
+        if movie_mapping is None or rules is None:
+            print("[WARN] Models are not loaded.")
+            recommendations = []
+        else:
+            with phase(endpoint, "resolve"):
+                known = title_index_for(movie_mapping).id_to_title
+                request_ids, missing_ids = movielens_ids_for(tmdb_ids, movie_ids, known)
+                liked_ids, missing, fallbacks = resolve_liked_ids(movie_mapping, liked_movies)
+            if missing:
+                print(f"[WARN] Could not find IDs for: {missing}")
+            TITLE_MISSES.inc(len(missing), endpoint=endpoint)
+            TITLE_FALLBACKS.inc(fallbacks, endpoint=endpoint)
+            liked_ids = unique_ids(request_ids, liked_ids)
+            with phase(endpoint, "score"):
+                recommendations = cached_recommendations(
+                    endpoint, "association_rules", liked_ids, top_n,
+                    lambda: recommend_for_ids(movie_mapping, rules, liked_ids, top_n),
+                )
         print(f"   [OK] Generated {len(recommendations)} recommendations")
+        if not recommendations:
+            EMPTY_RESULTS.inc(endpoint=endpoint)
         
-        return jsonify({
+        return record_id_misses(endpoint, missing_ids, {
             "success": True,
             "model": "association_rules",
             "recommendations": recommendations
-        })
+        }), 200
     except Exception as e:
         print(f"[ERROR] Error processing request: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return {"success": False, "error": str(e)}, 500
 
-@app.route('/recommend/content', methods=['POST'])
-def recommend_content():
+def content_response(data):
+    endpoint = "/recommend/content"
     print("\n[REQ] [Model 2] Received Content-Based recommendation request")
     if not recommender_content:
-        return jsonify({"success": False, "error": "Content-Based model not loaded"}), 503
+        return {"success": False, "error": "Content-Based model not loaded"}, 503
 
-    if not request.is_json:
-        return jsonify({"error": "Request must be JSON"}), 400
-    
-    data = request.get_json()
     liked_movies = data.get("liked_movies", [])
     top_n = data.get("top_n", 10)
     
     print(f"   Input movies: {liked_movies}")
+    try:
+        tmdb_ids, movie_ids = parse_liked_ids(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
     try:
         # 1. Load artifacts
-        bundle = recommender_content.load_artifacts()
+        with phase(endpoint, "load"):
+            bundle = load_content_bundle()
         
-        # 2. Convert titles to IDs
-        liked_ids, missing = recommender_content.titles_to_ids(liked_movies, bundle)
+        # 2. Ids pass straight through; titles are resolved only if sent
+        with phase(endpoint, "resolve"):
+            request_ids, missing_ids = tmdb_ids_for(tmdb_ids, movie_ids, bundle.id_to_index)
+            title_ids, missing = recommender_content.titles_to_ids(liked_movies, bundle)
+            liked_ids = unique_ids(request_ids, title_ids)
+        TITLE_MISSES.inc(len(missing), endpoint=endpoint)
         
         if missing:
             print(f"   [WARN] Missing titles in Content-Based model: {missing}")
         
         if not liked_ids:
-            return jsonify({
+            EMPTY_RESULTS.inc(endpoint=endpoint)
+            return record_id_misses(endpoint, missing_ids, {
                 "success": True,
                 "model": "content_based",
                 "recommendations": [],
                 "warning": "No valid movies found in input"
-            })
+            }), 200
 
         # 3. Get recommendations
-        df_recs = recommender_content.recommend_multi(liked_ids, top_n=top_n)
-        
-        # 4. Convert to list of dicts
-        recommendations = df_recs.to_dict(orient="records")
+        with phase(endpoint, "score"):
+            recommendations = cached_recommendations(
+                endpoint, "content_based", liked_ids, top_n,
+                lambda: content_recommendations(liked_ids, top_n),
+            )
+        if not recommendations:
+            EMPTY_RESULTS.inc(endpoint=endpoint)
         print(f"   [OK] Generated {len(recommendations)} recommendations")
 
-        return jsonify({
+        return record_id_misses(endpoint, missing_ids, {
             "success": True,
             "model": "content_based",
             "recommendations": recommendations
-        })
+        }), 200
 
     except Exception as e:
         print(f"[ERROR] Error processing Content-Based request: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        return {"success": False, "error": str(e)}, 500
 
-@app.route('/recommend/itemcf', methods=['POST'])
-def recommend_itemcf():
+def itemcf_response(data):
+    endpoint = "/recommend/itemcf"
     print("\n[REQ] [Model 3] Received Item-Based CF recommendation request")
     if not recommender_itemcf:
-        return jsonify({"success": False, "error": "Item-Based CF model not loaded"}), 503
+        return {"success": False, "error": "Item-Based CF model not loaded"}, 503
 
-    if not request.is_json:
-        return jsonify({"error": "Request must be JSON"}), 400
-    
-    data = request.get_json()
     liked_movies = data.get("liked_movies", [])
     top_n = data.get("top_n", 10)
     
     print(f"   Input movies: {liked_movies}")
+    try:
+        tmdb_ids, movie_ids = parse_liked_ids(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
     try:
-        # Call the recommender function
-        # It returns (DataFrame, missing_titles_list)
-        df_recs, missing = recommender_itemcf.recommend_item_based(liked_movies, top_n=top_n)
+        missing_ids = {}
+        # The mapping (and its title index) is shared with the association rules endpoint.
+        with phase(endpoint, "load"):
+            try:
+                sim_df = load_itemcf_model()
+                mapping_df = movie_mapping
+                if mapping_df is None:
+                    with open(recommender_itemcf.MAPPING_PATH, "rb") as f:
+                        mapping_df = pickle.load(f)
+            except FileNotFoundError as e:
+                sim_df, mapping_df, load_error = None, None, str(e)
+
+        if sim_df is None:
+            recommendations, missing = [], [load_error]
+        else:
+            with phase(endpoint, "resolve"):
+                request_ids, missing_ids = movielens_ids_for(tmdb_ids, movie_ids, sim_df.index)
+                title_ids, missing, id_to_title = resolve_itemcf_titles(liked_movies, mapping_df, sim_df)
+                liked_ids = unique_ids(request_ids, title_ids)
+            TITLE_MISSES.inc(len(missing), endpoint=endpoint)
+            with phase(endpoint, "score"):
+                recommendations = cached_recommendations(
+                    endpoint, "item_based_cf", liked_ids, top_n,
+                    lambda: itemcf_recommendations(liked_ids, sim_df, top_n, id_to_title),
+                ) if liked_ids else []
         
         if missing:
             print(f"   [WARN] Missing titles in Item-Based model: {missing}")
         
-        if df_recs.empty:
-             return jsonify({
+        if not recommendations:
+            EMPTY_RESULTS.inc(endpoint=endpoint)
+            return record_id_misses(endpoint, missing_ids, {
                 "success": True,
                 "model": "item_based_cf",
                 "recommendations": [],
                 "warning": "No recommendations found (insufficient data or no matching movies)"
-            })
+            }), 200
 
-        # Convert DataFrame to list of dicts
-        recommendations = df_recs.to_dict(orient="records")
         print(f"   [OK] Generated {len(recommendations)} recommendations")
 
-        return jsonify({
+        return record_id_misses(endpoint, missing_ids, {
             "success": True,
             "model": "item_based_cf",
             "recommendations": recommendations
-        })
+        }), 200
 
     except Exception as e:
         print(f"[ERROR] Error processing Item-Based CF request: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        return {"success": False, "error": str(e)}, 500
+
+# Shared by all /recommend/all requests; threads start on first use (after fork).
+_model_pool = None
+
+def model_pool():
+    global _model_pool
+    if _model_pool is None:
+        _model_pool = ThreadPoolExecutor(
+            max_workers=int(os.environ.get("MOVIEREC_ALL_THREADS", "6")), thread_name_prefix="model"
+        )
+    return _model_pool
+
+def resolve_favorites(tmdb_ids, movie_ids, liked_titles):
+    """
+    Resolve a request once into both id spaces for every model.
+
+    Titles go through the ARL mapping index (MovieLens ids); titles it does not
+    know are tried against the content catalog (TMDB ids). Each id list is then
+    completed through the id links. Returns (movie_ids, tmdb_ids,
+    missing_titles, missing_ids); ``missing_ids`` holds request ids that neither
+    the catalogs nor the links know.
+    """
+    bundle = None
+    if recommender_content:
+        try:
+            bundle = load_content_bundle()
+        except FileNotFoundError:
+            pass
+    known_movies = title_index_for(movie_mapping).id_to_title if movie_mapping is not None else {}
+    known_tmdb = bundle.id_to_index if bundle is not None else {}
+    missing_ids = {
+        "liked_tmdb_ids": [i for i in tmdb_ids if i not in known_tmdb and id_links.movie_of(i) is None],
+        "liked_movie_ids": [i for i in movie_ids if i not in known_movies and id_links.tmdb_of(i) is None],
+    }
+
+    title_movie_ids, title_tmdb_ids, missing = [], [], []
+    fallbacks = 0
+    for title in liked_titles:
+        movie_id, used_fallback = match_title(movie_mapping, title) if movie_mapping is not None else (None, False)
+        if movie_id is not None:
+            title_movie_ids.append(movie_id)
+            fallbacks += used_fallback
+        else:
+            missing.append(title)
+    if missing and bundle is not None:
+        title_tmdb_ids, missing = recommender_content.titles_to_ids(missing, bundle)
+    TITLE_FALLBACKS.inc(fallbacks, endpoint="/recommend/all")
+
+    all_movie_ids = unique_ids(movie_ids, title_movie_ids)
+    all_tmdb_ids = unique_ids(tmdb_ids, title_tmdb_ids)
+    movie_ids_out = unique_ids(
+        all_movie_ids, [i for i in translated_ids(all_tmdb_ids, id_links.tmdb_to_movie) if i is not None]
+    )
+    tmdb_ids_out = unique_ids(
+        all_tmdb_ids, [i for i in translated_ids(all_movie_ids, id_links.movie_to_tmdb) if i is not None]
+    )
+    return movie_ids_out, tmdb_ids_out, missing, missing_ids
+
+def association_rules_for_all(movie_ids, tmdb_ids, top_n):
+    if movie_mapping is None or rules is None:
+        raise LookupError("Association rules model not loaded")
+    known = title_index_for(movie_mapping).id_to_title
+    liked_ids = [movie_id for movie_id in movie_ids if movie_id in known]
+    return cached_recommendations(
+        "/recommend/all", "association_rules", liked_ids, top_n,
+        lambda: recommend_for_ids(movie_mapping, rules, liked_ids, top_n),
+    )
+
+def content_for_all(movie_ids, tmdb_ids, top_n):
+    if not recommender_content:
+        raise LookupError("Content-Based model not loaded")
+    bundle = load_content_bundle()
+    liked_ids = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id in bundle.id_to_index]
+    if not liked_ids:
+        return []
+    return cached_recommendations(
+        "/recommend/all", "content_based", liked_ids, top_n,
+        lambda: content_recommendations(liked_ids, top_n),
+    )
+
+def itemcf_for_all(movie_ids, tmdb_ids, top_n):
+    if not recommender_itemcf:
+        raise LookupError("Item-Based CF model not loaded")
+    if movie_mapping is None:
+        raise LookupError("Item-Based CF needs the movie mapping, which is not loaded")
+    sim_df = load_itemcf_model()
+    liked_ids = [movie_id for movie_id in movie_ids if movie_id in sim_df.index]
+    if not liked_ids:
+        return []
+    id_to_title = title_index_for(movie_mapping).id_to_title
+    return cached_recommendations(
+        "/recommend/all", "item_based_cf", liked_ids, top_n,
+        lambda: itemcf_recommendations(liked_ids, sim_df, top_n, id_to_title),
+    )
+
+ALL_MODELS = {
+    "association_rules": association_rules_for_all,
+    "content_based": content_for_all,
+    "item_based_cf": itemcf_for_all,
+}
+
+def _timed_model(model, scorer, movie_ids, tmdb_ids, top_n):
+    started = time.perf_counter()
+    try:
+        result = {"success": True, "recommendations": scorer(movie_ids, tmdb_ids, top_n)}
+    except Exception as e:
+        print(f"[ERROR] {model} failed in /recommend/all: {e}")
+        result = {"success": False, "error": str(e), "recommendations": []}
+    elapsed = time.perf_counter() - started
+    MODEL_SCORE_SECONDS.observe(elapsed, model=model)
+    result["elapsed_ms"] = round(elapsed * 1000, 2)
+    return result
+
+def all_response(data):
+    """
+    All three models for one favorite set: titles are resolved once and the
+    models are scored concurrently. A failing model reports its own error
+    without failing the others.
+    """
+    endpoint = "/recommend/all"
+    print("\n[REQ] [All Models] Received combined recommendation request")
+    liked_movies = data.get("liked_movies", [])
+    top_n = data.get("top_n", 10)
+
+    print(f"   Input movies: {liked_movies}")
+    if not isinstance(liked_movies, list):
+        return {"error": "'liked_movies' must be a list"}, 400
+    try:
+        tmdb_ids, movie_ids = parse_liked_ids(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    try:
+        with phase(endpoint, "resolve"):
+            all_movie_ids, all_tmdb_ids, missing, missing_ids = resolve_favorites(tmdb_ids, movie_ids, liked_movies)
+        if missing:
+            print(f"   [WARN] Could not find IDs for: {missing}")
+        TITLE_MISSES.inc(len(missing), endpoint=endpoint)
+
+        with phase(endpoint, "score"):
+            futures = {
+                model: model_pool().submit(_timed_model, model, scorer, all_movie_ids, all_tmdb_ids, top_n)
+                for model, scorer in ALL_MODELS.items()
+            }
+            models = {model: future.result() for model, future in futures.items()}
+        for model, result in models.items():
+            print(f"   [OK] {model}: {len(result['recommendations'])} recommendations in {result['elapsed_ms']} ms")
+            if not result["recommendations"]:
+                EMPTY_RESULTS.inc(endpoint=endpoint)
+
+        response = {"success": True, "models": models}
+        if missing:
+            response["missing"] = missing
+        return record_id_misses(endpoint, missing_ids, response), 200
+    except Exception as e:
+        print(f"[ERROR] Error processing combined request: {e}")
+        return {"success": False, "error": str(e)}, 500
+
+# Offline-tuned with `evaluate_models.py --tune-hybrid`, which prints these values.
+HYBRID_CONFIG = hybrid.HybridConfig(
+    weights=hybrid.parse_weights(os.environ.get("MOVIEREC_HYBRID_WEIGHTS", "arl=1,itemcf=1,content=1")),
+    method=os.environ.get("MOVIEREC_HYBRID_METHOD", "rrf"),
+    rrf_k=float(os.environ.get("MOVIEREC_HYBRID_RRF_K", str(hybrid.DEFAULT_RRF_K))),
+    candidates=int(os.environ.get("MOVIEREC_HYBRID_CANDIDATES", str(hybrid.DEFAULT_CANDIDATES))),
+)
+
+def arl_candidates(movie_ids, tmdb_ids, depth):
+    if movie_mapping is None or rules is None:
+        raise LookupError("Association rules model not loaded")
+    known = title_index_for(movie_mapping).id_to_title
+    recs = recommend_for_ids(movie_mapping, rules, [i for i in movie_ids if i in known], depth)
+    return [rec["movieId"] for rec in recs], [rec["score"] for rec in recs]
+
+def itemcf_candidates(movie_ids, tmdb_ids, depth):
+    if not recommender_itemcf:
+        raise LookupError("Item-Based CF model not loaded")
+    recs = recommender_itemcf.recommend_by_movie_ids(movie_ids, load_itemcf_model(), top_n=depth)
+    return recs["movieId"].to_numpy(dtype=np.int64), recs["similarity"].to_numpy(dtype=float)
+
+def content_candidates(movie_ids, tmdb_ids, depth):
+    """Content scores mapped to MovieLens ids; catalog movies without a link are dropped."""
+    if not recommender_content:
+        raise LookupError("Content-Based model not loaded")
+    bundle = load_content_bundle()
+    liked_ids = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id in bundle.id_to_index]
+    if not liked_ids:
+        return [], []
+    batch = recommender_content.recommend_batch([liked_ids], top_n=depth)
+    keep = batch.rows[0] >= 0
+    candidate_ids = id_links.tmdb_to_movie(batch.tmdb_ids[0][keep])
+    linked = candidate_ids >= 0
+    return candidate_ids[linked], batch.scores[0][keep][linked]
+
+HYBRID_SOURCES = {
+    "arl": arl_candidates,
+    "itemcf": itemcf_candidates,
+    "content": content_candidates,
+}
 
+def hybrid_recommendations(movie_ids, tmdb_ids, top_n, config=HYBRID_CONFIG):
+    """
+    Fused recommendations over the MovieLens id space.
+
+    Each active model contributes ``config.candidates`` candidates, generated
+    concurrently. A model that is not loaded or fails is left out of the fusion
+    and reported in ``unavailable``. Returns (records, unavailable).
+    """
+    depth = max(config.candidates, top_n)
+    futures = {
+        name: model_pool().submit(HYBRID_SOURCES[name], movie_ids, tmdb_ids, depth)
+        for name in config.active_models
+    }
+    candidates, unavailable = {}, {}
+    for name, future in futures.items():
+        try:
+            candidates[name] = future.result()
+        except Exception as e:
+            print(f"[ERROR] {name} failed in /recommend/hybrid: {e}")
+            unavailable[name] = str(e)
+    ids, scores = hybrid.fuse(candidates, config, top_n=top_n, exclude=movie_ids)
+
+    ranks = {name: {int(i): rank for rank, i in enumerate(ids_, 1)} for name, (ids_, _) in candidates.items()}
+    id_to_title = title_index_for(movie_mapping).id_to_title if movie_mapping is not None else {}
+    bundle = None
+    if recommender_content:
+        try:
+            bundle = load_content_bundle()
+        except FileNotFoundError:
+            pass
+    records = []
+    ids = ids.tolist()
+    for movie_id, tmdb_id, score in zip(ids, translated_ids(ids, id_links.movie_to_tmdb), scores.tolist()):
+        title = id_to_title.get(movie_id)
+        if title is None and bundle is not None and tmdb_id in bundle.id_to_index:
+            title = bundle.titles[bundle.id_to_index[tmdb_id]]
+        records.append({
+            "movieId": movie_id,
+            "tmdbId": tmdb_id,
+            "title": title or f"Movie #{movie_id}",
+            "score": score,
+            "sources": {name: ranks[name][movie_id] for name in ranks if movie_id in ranks[name]},
+        })
+    return records, unavailable
+
+def hybrid_response(data):
+    """
+    One list fused from the ARL, Item-CF and Content candidates (see ``src/hybrid.py``).
+
+    ``sources`` gives each recommendation's rank in every model that proposed it.
+    """
+    endpoint = "/recommend/hybrid"
+    print("\n[REQ] [Hybrid] Received hybrid recommendation request")
+    liked_movies = data.get("liked_movies", [])
+    top_n = data.get("top_n", 10)
+
+    print(f"   Input movies: {liked_movies}")
+    if not isinstance(liked_movies, list):
+        return {"error": "'liked_movies' must be a list"}, 400
+    if type(top_n) is not int or top_n <= 0:
+        return {"error": "'top_n' must be a positive integer"}, 400
+    try:
+        tmdb_ids, movie_ids = parse_liked_ids(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    try:
+        with phase(endpoint, "resolve"):
+            all_movie_ids, all_tmdb_ids, missing, missing_ids = resolve_favorites(tmdb_ids, movie_ids, liked_movies)
+        if missing:
+            print(f"   [WARN] Could not find IDs for: {missing}")
+        TITLE_MISSES.inc(len(missing), endpoint=endpoint)
+
+        # Both id spaces feed the models, so both go into the key; the version
+        # covers every artifact the fusion reads.
+        key_ids = [("movie", i) for i in all_movie_ids] + [("tmdb", i) for i in all_tmdb_ids]
+        versions = artifact_versions()
+        version = tuple(versions.get(model) for model in ALL_MODELS)
+        with phase(endpoint, "score"):
+            recommendations, unavailable = cached_recommendations(
+                endpoint, "hybrid", key_ids, top_n,
+                lambda: hybrid_recommendations(all_movie_ids, all_tmdb_ids, top_n),
+                version=version,
+                # A degraded fusion must not outlive the outage of the missing model.
+                cacheable=lambda result: not result[1],
+            )
+        print(f"   [OK] Found {len(recommendations)} hybrid recommendations.")
+        if not recommendations:
+            EMPTY_RESULTS.inc(endpoint=endpoint)
+
+        response = {
+            "success": True,
+            "recommendations": recommendations,
+            "method": HYBRID_CONFIG.method,
+            "weights": HYBRID_CONFIG.weights,
+        }
+        if unavailable:
+            response["unavailable"] = unavailable
+        if missing:
+            response["missing"] = missing
+        return record_id_misses(endpoint, missing_ids, response), 200
+    except Exception as e:
+        print(f"[ERROR] Error processing hybrid request: {e}")
+        return {"success": False, "error": str(e)}, 500
+
+def health_response():
+    return {"status": "ok", "models_loaded": movie_mapping is not None}
+
+def reload_response():
+    """
+    Re-read model artifacts and id links from disk without restarting the server.
+
+    The response cache is cleared, since the id links may change even when the
+    model versions do not.
+
+    Under gunicorn this only reloads the worker that served the request. With
+    ``preload_app`` a HUP re-forks workers from the master's old models, so
+    restart gunicorn to reload every worker.
+    """
+    global movie_mapping, rules, id_links
+    mapping, loaded_rules = load_arl_models()
+    if mapping is None or loaded_rules is None:
+        return {
+            "success": False,
+            "error": "Association rules artifacts could not be loaded; previous models are kept."
+        }, 500
+    title_index_for(mapping)
+    movie_mapping, rules = mapping, loaded_rules
+    id_links = load_links(movie_mapping, force_reload=True)
+    reloaded = ["association_rules"]
+
+    if recommender_content:
+        try:
+            load_content_bundle(force_reload=True)
+            reloaded.append("content_based")
+        except FileNotFoundError as e:
+            print(f"[WARN] Content-Based artifacts not reloaded: {e}")
+    if recommender_itemcf:
+        try:
+            load_itemcf_model(force_reload=True)
+            reloaded.append("item_based_cf")
+        except FileNotFoundError as e:
+            print(f"[WARN] Item-Based CF artifacts not reloaded: {e}")
+    RESPONSE_CACHE.invalidate()
+    CACHE_ENTRIES.set(len(RESPONSE_CACHE))
+
+    return {
+        "success": True,
+        "reloaded": reloaded,
+        "versions": artifact_versions(),
+        "cache_entries": len(RESPONSE_CACHE)
+    }, 200
+
+# ==============================================
+# 🌐 API Routes
+# ==============================================
+
+def json_endpoint(endpoint, handler):
+    """Run ``handler(data)`` on the JSON body and serialize its (payload, status)."""
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+    payload, status = handler(request.get_json())
+    with phase(endpoint, "serialize"):
+        return jsonify(payload), status
+
+@app.route('/recommend', methods=['POST'])
+def recommend():
+    return json_endpoint("/recommend", recommend_response)
+
+@app.route('/recommend/content', methods=['POST'])
+def recommend_content():
+    return json_endpoint("/recommend/content", content_response)
+
+@app.route('/recommend/itemcf', methods=['POST'])
+def recommend_itemcf():
+    return json_endpoint("/recommend/itemcf", itemcf_response)
+
+@app.route('/recommend/all', methods=['POST'])
+def recommend_all():
+    return json_endpoint("/recommend/all", all_response)
+
+@app.route('/recommend/hybrid', methods=['POST'])
+def recommend_hybrid():
+    return json_endpoint("/recommend/hybrid", hybrid_response)
 
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok", "models_loaded": movie_mapping is not None})
+    return jsonify(health_response())
+
+@app.route('/admin/reload', methods=['POST'])
+def reload_models():
+    payload, status = reload_response()
+    return jsonify(payload), status
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition of request and model metrics."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+# ==============================================
+# 🚀 Production Entry Point
+# ==============================================
+
+def preload_models():
+    """
+    Load every artifact and build every lookup structure up front.
+
+    Without this, the content bundle, its title index and the Item-CF matrix
+    are loaded by the first request that needs them, in every worker.
+    """
+    if recommender_content:
+        try:
+            bundle = load_content_bundle()
+            bundle.title_index  # cached_property; built lazily otherwise
+        except FileNotFoundError as e:
+            print(f"[WARN] Content-Based artifacts not preloaded: {e}")
+    if recommender_itemcf:
+        try:
+            load_itemcf_model()
+        except FileNotFoundError as e:
+            print(f"[WARN] Item-Based CF artifacts not preloaded: {e}")
+    if movie_mapping is not None:
+        title_index_for(movie_mapping)
+
+def create_app():
+    """
+    WSGI app factory for gunicorn: ``gunicorn -c gunicorn.conf.py "api_server:create_app()"``.
+
+    With ``preload_app`` the factory runs once in the master, so the models are
+    loaded before the workers fork and their pages are shared copy-on-write.
+    ``gc.freeze()`` moves everything loaded so far out of the collector's reach;
+    otherwise the first collection in each worker writes to (and so copies)
+    the shared objects.
+    """
+    preload_models()
+    gc.collect()
+    gc.freeze()
+    return app
 
 if __name__ == '__main__':
     print("[START] Starting Python AI Server on port 9001...")
@@ -0,0 +1,214 @@
+"""
+Asyncio (ASGI) variant of the AI API server.
+
+Same endpoints and JSON contract as ``api_server.py`` (the request handlers are
+shared), but requests are accepted on an event loop and the CPU-bound part of
+each request runs in a bounded thread pool. NumPy/SciPy release the GIL while
+scoring, so one process keeps accepting connections and uses several cores
+under bursty fan-out from the backend:
+
+    uvicorn async_server:app --host 0.0.0.0 --port 9001
+
+Once ``MOVIEREC_MAX_PENDING`` scoring requests are queued or running, new ones
+are rejected right away with 503 and ``Retry-After`` instead of piling up.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import api_server as api
+from src.metrics import CONTENT_TYPE, REGISTRY
+
+SCORING_THREADS = int(os.environ.get("MOVIEREC_SCORING_THREADS", str(os.cpu_count() or 4)))
+MAX_PENDING = int(os.environ.get("MOVIEREC_MAX_PENDING", str(4 * SCORING_THREADS)))
+RETRY_AFTER_SECONDS = 1
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "movierec_scoring_queue_depth", "Scoring requests waiting for a pool thread."
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "movierec_scoring_in_flight", "Scoring requests currently running on a pool thread."
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "movierec_scoring_queue_wait_seconds", "Time a scoring request waited for a pool thread."
+)
+REJECTED = REGISTRY.counter(
+    "movierec_rejected_requests_total", "Requests rejected with 503 because the scoring queue was full.",
+    ("endpoint",),
+)
+
+
+class Overloaded(Exception):
+    """Raised when the scoring pool already holds ``max_pending`` requests."""
+
+
+class ScoringPool:
+    """
+    Thread pool with admission control.
+
+    ``run`` is called from the event loop only, so ``pending`` needs no lock;
+    the gauges are updated from the pool threads and are thread-safe.
+    """
+
+    def __init__(self, max_workers=SCORING_THREADS, max_pending=MAX_PENDING):
+        self.max_pending = max_pending
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scoring")
+
+    def _timed(self, fn, args, submitted):
+        QUEUE_DEPTH.inc(-1)
+        QUEUE_WAIT.observe(time.perf_counter() - submitted)
+        IN_FLIGHT.inc(1)
+        try:
+            return fn(*args)
+        finally:
+            IN_FLIGHT.inc(-1)
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise Overloaded()
+        self.pending += 1
+        QUEUE_DEPTH.inc(1)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._timed, fn, args, time.perf_counter())
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+POOL = ScoringPool()
+
+JSON_ROUTES = {
+    "/recommend": api.recommend_response,
+    "/recommend/content": api.content_response,
+    "/recommend/itemcf": api.itemcf_response,
+    "/recommend/all": api.all_response,
+    "/recommend/hybrid": api.hybrid_response,
+}
+ROUTE_METHODS = {
+    **{path: "POST" for path in JSON_ROUTES},
+    "/admin/reload": "POST",
+    "/health": "GET",
+    "/metrics": "GET",
+}
+CORS_HEADERS = [(b"access-control-allow-origin", b"*")]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_response(payload, status=200, headers=()):
+    body = json.dumps(payload, default=_json_default).encode("utf-8")
+    return status, [(b"content-type", b"application/json"), *headers], body
+
+
+def _is_json(scope):
+    """Same rule as Flask's ``request.is_json``: application/json or application/*+json."""
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            mimetype = value.decode("latin-1").split(";", 1)[0].strip().lower()
+            return mimetype == "application/json" or (
+                mimetype.startswith("application/") and mimetype.endswith("+json")
+            )
+    return False
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _dispatch(scope, receive, endpoint):
+    method = scope["method"]
+    if endpoint == "unmatched":
+        return json_response({"error": "Not found"}, 404)
+    if method == "OPTIONS":
+        allow = f"{ROUTE_METHODS[endpoint]}, OPTIONS".encode()
+        return 204, [(b"access-control-allow-methods", allow), (b"access-control-allow-headers", b"*")], b""
+    if method != ROUTE_METHODS[endpoint]:
+        return json_response({"error": "Method not allowed"}, 405)
+
+    if endpoint == "/health":
+        return json_response(api.health_response())
+    if endpoint == "/metrics":
+        return 200, [(b"content-type", CONTENT_TYPE.encode())], REGISTRY.render().encode("utf-8")
+    if endpoint == "/admin/reload":
+        # Not subject to admission control: a reload must get through under load.
+        payload, status = await asyncio.get_running_loop().run_in_executor(None, api.reload_response)
+        return json_response(payload, status)
+
+    body = await _read_body(receive)
+    if not _is_json(scope):
+        return json_response({"error": "Request must be JSON"}, 400)
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return json_response({"error": "Invalid JSON body"}, 400)
+    try:
+        payload, status = await POOL.run(JSON_ROUTES[endpoint], data)
+    except Overloaded:
+        REJECTED.inc(endpoint=endpoint)
+        return json_response(
+            {"success": False, "error": "Server busy, retry later"},
+            503,
+            [(b"retry-after", str(RETRY_AFTER_SECONDS).encode())],
+        )
+    with api.phase(endpoint, "serialize"):
+        return json_response(payload, status)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Load everything before the first request instead of inside it.
+            await asyncio.get_running_loop().run_in_executor(None, api.preload_models)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            POOL.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    started = time.perf_counter()
+    endpoint = scope["path"] if scope["path"] in ROUTE_METHODS else "unmatched"
+    try:
+        status, headers, body = await _dispatch(scope, receive, endpoint)
+    except Exception as e:
+        print(f"[ERROR] Unhandled error on {endpoint}: {e}")
+        status, headers, body = json_response({"success": False, "error": str(e)}, 500)
+
+    await send({"type": "http.response.start", "status": status, "headers": [*headers, *CORS_HEADERS]})
+    await send({"type": "http.response.body", "body": body})
+    api.REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, phase="total")
+    api.REQUESTS.inc(endpoint=endpoint, status=str(status))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print(f"[START] Starting async Python AI Server on port 9001 ({SCORING_THREADS} scoring threads)...")
+    uvicorn.run(app, host='0.0.0.0', port=9001)
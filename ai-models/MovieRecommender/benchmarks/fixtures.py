@@ -0,0 +1,147 @@
+"""
+Benchmark'lar için sentetik veri ve artefakt hazırlığı.
+
+Kaggle verisi gerekmez: ``write_synthetic_raw`` şema uyumlu küçük CSV'ler üretir,
+``build_fixture`` bunlardan Content-Based, ARL ve Item-CF artefaktlarını geçici
+bir klasöre kurar ve modüllerin dosya yollarını oraya yönlendirir.
+"""
+
+from __future__ import annotations
+
+import sys
+from argparse import Namespace
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+CONTENT_BASED_DIR = PROJECT_DIR / "Content-Based"
+
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+if str(CONTENT_BASED_DIR) not in sys.path:
+    sys.path.append(str(CONTENT_BASED_DIR))
+
+import data_pipeline as dp  # noqa: E402
+import generate_synthetic_data as gen  # noqa: E402
+import recommender_content as rc  # noqa: E402
+from src import recommender_arl as arl  # noqa: E402
+from src import recommender_itemcf as itemcf  # noqa: E402
+
+TMDB_OFFSET = 10_000  # sentetik veride tmdbId = movieId + 10_000
+RATINGS_PER_USER = 45
+ARL_BUILD_PARAMS = {"min_support": 0.02, "min_movie_likes": 5}
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """Hazırlanmış bir benchmark ortamı."""
+
+    root: Path
+    raw_dir: Path
+    models_dir: Path
+    content_dir: Path
+    n_movies: int
+    n_users: int
+
+    @property
+    def mapping_path(self) -> Path:
+        return self.models_dir / "movie_mapping.pkl"
+
+    @property
+    def rules_path(self) -> Path:
+        return self.models_dir / "association_rules.pkl"
+
+
+def write_synthetic_raw(raw_dir: Path, *, n_movies: int, n_users: int, seed: int = 0) -> None:
+    """Küçük sentetik veri seti; small dosyalar tüm katalog ve kullanıcıları içerir."""
+    gen.generate(raw_dir, gen.SyntheticConfig(
+        n_movies=n_movies,
+        n_users=n_users,
+        n_ratings=n_users * RATINGS_PER_USER,
+        small_movie_fraction=1.0,
+        small_users=n_users,
+        seed=seed,
+        tmdb_offset=TMDB_OFFSET,
+    ))
+
+
+def ensure_synthetic_raw(raw_dir: Path, *, n_movies: int, n_users: int, seed: int = 0) -> Path:
+    """Ham sentetik veriyi bir kez üretir; ``synthetic_meta.json`` varsa yeniden kullanır."""
+    if not (raw_dir / "synthetic_meta.json").exists():
+        write_synthetic_raw(raw_dir, n_movies=n_movies, n_users=n_users, seed=seed)
+    return raw_dir
+
+
+def _redirect_paths(module, old_root: Path, new_root: Path) -> None:
+    """Modül seviyesindeki ``old_root`` altındaki Path sabitlerini ``new_root``'a taşır."""
+    for name, value in list(vars(module).items()):
+        if isinstance(value, Path) and value.is_relative_to(old_root):
+            setattr(module, name, new_root / value.relative_to(old_root))
+
+
+def use_fixture(fixture: Fixture) -> None:
+    """Content ve Item-CF modüllerinin yollarını fixture klasörüne yönlendirir."""
+    _redirect_paths(rc, rc.MODELS_DIR, fixture.content_dir)
+    _redirect_paths(dp, dp.MODELS_DIR, fixture.content_dir)
+    _redirect_paths(dp, dp.DATA_DIR, fixture.raw_dir)
+    dp.ARTIFACT_PATHS = (dp.VECTORIZER_PATH, dp.MATRIX_PATH, dp.DEFAULT_METADATA_PATH, dp.META_JSON_PATH)
+    _redirect_paths(itemcf, itemcf.MODELS_DIR, fixture.models_dir)
+    _redirect_paths(itemcf, itemcf.RAW_DATA_DIR, fixture.raw_dir)
+
+
+def content_build_args(raw_dir: Path) -> Namespace:
+    """``data_pipeline.run_pipeline`` için CLI varsayılanlarıyla argümanlar."""
+    return Namespace(
+        source=raw_dir / "movies_metadata.csv",
+        max_features=15000,
+        ngram_min=1,
+        ngram_max=2,
+        min_content_chars=20,
+        to_lower=False,
+        no_keywords=False,
+        no_credits=False,
+        genre_weight=3,
+        rebuild=True,
+    )
+
+
+def build_fixture(root: Path, *, n_movies: int, n_users: int, seed: int = 0, quiet: bool = True) -> Fixture:
+    """
+    Sentetik veriyi ve tüm artefaktları ``root`` altına kurar; varsa yeniden kullanır.
+    """
+    fixture = Fixture(
+        root=root,
+        raw_dir=root / "raw",
+        models_dir=root / "models",
+        content_dir=root / "content_models",
+        n_movies=n_movies,
+        n_users=n_users,
+    )
+    done_flag = root / ".complete"
+    if done_flag.exists():
+        use_fixture(fixture)
+        rc.load_artifacts(force_reload=True)
+        return fixture
+
+    out = StringIO() if quiet else sys.stdout
+    with redirect_stdout(out):
+        ensure_synthetic_raw(fixture.raw_dir, n_movies=n_movies, n_users=n_users, seed=seed)
+        fixture.models_dir.mkdir(parents=True, exist_ok=True)
+        fixture.content_dir.mkdir(parents=True, exist_ok=True)
+        use_fixture(fixture)
+
+        dp.run_pipeline(content_build_args(fixture.raw_dir))
+        arl.prepare_and_save_artifacts(
+            raw_dir=fixture.raw_dir,
+            mapping_path=fixture.mapping_path,
+            rules_path=fixture.rules_path,
+            metadata_path=fixture.models_dir / "artifacts_meta.json",
+            **ARL_BUILD_PARAMS,
+        )
+        itemcf.build_model()
+
+    rc.load_artifacts(force_reload=True)
+    done_flag.touch()
+    return fixture
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Öneri sıcak yolları için mikro-benchmark'lar.
+
+Her katalog boyutu için sentetik fixture kurulur (bkz. ``fixtures.py``), ardından
+ARL, API, Item-CF, Content ve Profile öneri fonksiyonları farklı favori film
+sayılarıyla ölçülür. Sonuçlar JSON olarak yazılır; ``--compare`` ile eski bir
+sonuç dosyasına göre yavaşlamalar raporlanır.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --catalog-sizes 2000 10000 --favorites 1 5 20
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import fixtures  # noqa: E402
+from fixtures import arl, itemcf, rc  # noqa: E402
+
+import user_profile as up  # noqa: E402
+
+DEFAULT_CATALOG_SIZES = (1000, 5000)
+DEFAULT_FAVORITES = (1, 5, 20)
+DEFAULT_WORKDIR = BENCH_DIR / ".fixtures"
+DEFAULT_RESULTS_DIR = BENCH_DIR / "results"
+MIN_REPEAT_SECONDS = 0.05
+TOP_N = 10
+
+
+def measure(fn: Callable[[], object], *, repeat: int) -> dict:
+    """
+    ``timeit`` tarzı ölçüm: her tekrar en az ``MIN_REPEAT_SECONDS`` sürecek kadar
+    çağrı içerir; istatistikler çağrı başına milisaniyedir.
+    """
+    with open(os.devnull, "w") as sink, redirect_stdout(sink):
+        fn()  # ısınma (lazy yüklemeler, önbellekler)
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_REPEAT_SECONDS or number >= 1_000_000:
+                break
+            number *= 10 if elapsed < MIN_REPEAT_SECONDS / 10 else 2
+
+        per_call = [elapsed / number]
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            per_call.append((time.perf_counter() - start) / number)
+
+    per_call_ms = [t * 1000.0 for t in per_call]
+    return {
+        "min_ms": min(per_call_ms),
+        "median_ms": statistics.median(per_call_ms),
+        "mean_ms": statistics.fmean(per_call_ms),
+        "stdev_ms": statistics.stdev(per_call_ms) if len(per_call_ms) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _pick_favorites(fixture: fixtures.Fixture, n_favorites: int, seed: int) -> tuple[list[str], list[int]]:
+    """Popüler filmlerden ``n_favorites`` tane seçer: (ARL başlıkları, TMDB id'leri)."""
+    bundle = rc.load_artifacts()
+    mapping = arl.load_movie_mapping(fixture.mapping_path)
+    pool = mapping["movieId"].to_numpy()[: max(n_favorites * 5, 50)]
+    chosen = np.random.default_rng(seed).choice(pool, size=min(n_favorites, len(pool)), replace=False)
+    chosen_set = set(chosen.tolist())
+    titles = mapping.loc[mapping["movieId"].isin(chosen_set), "title"].tolist()
+    offset = fixtures.TMDB_OFFSET
+    tmdb_ids = [int(mid) + offset for mid in chosen if int(mid) + offset in bundle.id_to_index]
+    return titles, tmdb_ids
+
+
+def _load_api_module():
+    """api_server import sırasında gerçek models/ klasörünü okur; çıktıyı bastırır."""
+    try:
+        with redirect_stdout(io.StringIO()):
+            import api_server
+    except ImportError as exc:
+        print(f"⚠️ api_server atlandı: {exc}")
+        return None
+    return api_server
+
+
+def collect_cases(fixture: fixtures.Fixture, favorites: tuple[int, ...], seed: int):
+    """(isim, parametreler, çağrılabilir) üçlüleri üretir."""
+    catalog = {"catalog": fixture.n_movies}
+    yield "content.load_artifacts", dict(catalog), lambda: rc.load_artifacts(force_reload=True)
+
+    mapping_df = arl.load_movie_mapping(fixture.mapping_path)
+    rules_df = arl.load_association_rules(fixture.rules_path)
+    api_server = _load_api_module()
+
+    for n_fav in favorites:
+        titles, tmdb_ids = _pick_favorites(fixture, n_fav, seed)
+        params = {**catalog, "favorites": n_fav}
+
+        yield "arl.recommend_with_association_rules", params, lambda t=titles: arl.recommend_with_association_rules(
+            t, top_n=TOP_N, mapping_path=fixture.mapping_path, rules_path=fixture.rules_path
+        )
+        if api_server is not None:
+            yield "api_server.get_recommendations", params, lambda t=titles: api_server.get_recommendations(
+                mapping_df, rules_df, t, TOP_N
+            )
+        yield "itemcf.recommend_item_based", params, lambda t=titles: itemcf.recommend_item_based(t, top_n=TOP_N)
+
+        for method in ("score_avg", "vector_avg"):
+            method_params = {**params, "method": method}
+            if n_fav == 1:
+                yield "content.recommend_single", method_params, lambda m=method, ids=tmdb_ids: rc.recommend_single(
+                    ids[0], top_n=TOP_N, method=m
+                )
+            else:
+                yield "content.recommend_multi", method_params, lambda m=method, ids=tmdb_ids: rc.recommend_multi(
+                    ids, top_n=TOP_N, method=m
+                )
+
+        content_titles = rc.load_artifacts().titles.take([rc.load_artifacts().id_to_index[i] for i in tmdb_ids])
+        yield "profile.recommend_with_profile", params, lambda t=content_titles: up.recommend_with_profile(
+            t, top_n=TOP_N
+        )
+
+
+def case_key(name: str, params: dict) -> str:
+    return name + "[" + ",".join(f"{k}={params[k]}" for k in sorted(params)) + "]"
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(
+    *,
+    catalog_sizes: tuple[int, ...],
+    favorites: tuple[int, ...],
+    repeat: int,
+    workdir: Path,
+    seed: int,
+    only: str | None = None,
+) -> dict:
+    results = []
+    for n_movies in catalog_sizes:
+        n_users = max(200, n_movies // 5)
+        print(f"🧪 Fixture hazırlanıyor: {n_movies:,} film, {n_users:,} kullanıcı...")
+        fixture = fixtures.build_fixture(
+            workdir / f"catalog_{n_movies}", n_movies=n_movies, n_users=n_users, seed=seed
+        )
+        for name, params, fn in collect_cases(fixture, favorites, seed):
+            if only and only not in name:
+                continue
+            stats = measure(fn, repeat=repeat)
+            results.append({"name": name, "params": params, "key": case_key(name, params), **stats})
+            print(f"   {case_key(name, params):<70} {stats['median_ms']:>10.3f} ms")
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "catalog_sizes": list(catalog_sizes),
+            "favorites": list(favorites),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, *, tolerance: float) -> list[dict]:
+    """Medyan süresi baseline'a göre ``1 + tolerance`` katından fazla artanları döndürür."""
+    base = {row["key"]: row for row in baseline.get("results", [])}
+    rows = []
+    for row in current["results"]:
+        old = base.get(row["key"])
+        if old is None or old["median_ms"] <= 0:
+            continue
+        ratio = row["median_ms"] / old["median_ms"]
+        rows.append({
+            "key": row["key"],
+            "baseline_ms": old["median_ms"],
+            "current_ms": row["median_ms"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + tolerance,
+        })
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Öneri fonksiyonları için mikro-benchmark'lar",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=list(DEFAULT_CATALOG_SIZES))
+    parser.add_argument("--favorites", type=int, nargs="+", default=list(DEFAULT_FAVORITES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", type=str, default=None, help="Sadece ismi bu metni içeren benchmark'lar")
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="Fixture önbellek klasörü")
+    parser.add_argument("--output", type=Path, default=None, help="Sonuç JSON yolu (varsayılan: results/<zaman>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Karşılaştırılacak baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run(
+        catalog_sizes=tuple(args.catalog_sizes),
+        favorites=tuple(args.favorites),
+        repeat=args.repeat,
+        workdir=args.workdir,
+        seed=args.seed,
+        only=args.only,
+    )
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Sonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare(report, baseline, tolerance=args.tolerance)
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\n📊 Baseline karşılaştırması ({args.compare.name}):")
+        for row in rows:
+            flag = "❌" if row["regression"] else "✅"
+            print(f" {flag} {row['key']:<70} {row['baseline_ms']:>9.3f} → {row['current_ms']:>9.3f} ms (x{row['ratio']:.2f})")
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Model build (eğitim) pipeline'ları için regresyon benchmark'ları.
+
+Content-Based (``data_pipeline.run_pipeline``), ARL
+(``prepare_and_save_artifacts``) ve Item-CF (``build_model``) build'leri sentetik
+veri üzerinde ayrı süreçlerde çalıştırılır. Her build için aşama kayıtları
+(build'in meta JSON'undaki ``build_stages``), süreç tepe belleği (peak RSS) ve
+üretilen artefakt boyutları JSON olarak yazılır;
+``--compare`` ile kayıtlı bir baseline'a göre gerilemeler raporlanır.
+
+Kullanım:
+    python benchmarks/run_build_benchmarks.py
+    python benchmarks/run_build_benchmarks.py --catalog-sizes 5000 20000 --builds content arl
+    python benchmarks/run_build_benchmarks.py --compare benchmarks/results/build_baseline.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+import fixtures  # noqa: E402
+from run_benchmarks import _git_revision  # noqa: E402
+
+from src.stage_timer import peak_rss_mb  # noqa: E402
+
+BUILDS = ("content", "arl", "itemcf")
+DEFAULT_CATALOG_SIZES = (2000, 10000)
+DEFAULT_WORKDIR = BENCH_DIR / ".fixtures"
+DEFAULT_RESULTS_DIR = BENCH_DIR / "results"
+
+# Build'in aşama kayıtlarını (``build_stages``) yazdığı meta JSON
+META_FILES = {
+    "content": ("content_models", "content_meta.json"),
+    "arl": ("models", "artifacts_meta.json"),
+    "itemcf": ("models", "item_similarity_meta.json"),
+}
+
+
+def _artifact_sizes(directory: Path) -> dict[str, int]:
+    return {
+        str(path.relative_to(directory)): path.stat().st_size
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _run_build(build: str, raw_dir: str, out_dir: str) -> dict:
+    """Tek bir build'i (ayrı süreçte) çalıştırır ve ölçümleri döndürür."""
+    raw_dir, out_dir = Path(raw_dir), Path(out_dir)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    fixture = fixtures.Fixture(
+        root=out_dir,
+        raw_dir=raw_dir,
+        models_dir=out_dir / "models",
+        content_dir=out_dir / "content_models",
+        n_movies=0,
+        n_users=0,
+    )
+    fixture.models_dir.mkdir(parents=True)
+    fixture.content_dir.mkdir(parents=True)
+    fixtures.use_fixture(fixture)
+
+    rss_before = peak_rss_mb()
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as sink, redirect_stdout(sink):
+        if build == "content":
+            fixtures.dp.run_pipeline(fixtures.content_build_args(raw_dir))
+        elif build == "arl":
+            fixtures.arl.prepare_and_save_artifacts(
+                raw_dir=raw_dir,
+                mapping_path=fixture.mapping_path,
+                rules_path=fixture.rules_path,
+                metadata_path=fixture.models_dir / "artifacts_meta.json",
+                **fixtures.ARL_BUILD_PARAMS,
+            )
+        else:
+            fixtures.itemcf.build_model()
+    seconds = time.perf_counter() - start
+
+    meta_dir, meta_name = META_FILES[build]
+    meta = json.loads((out_dir / meta_dir / meta_name).read_text(encoding="utf-8"))
+    stages = meta["build_stages"]["stages"]
+
+    sizes = _artifact_sizes(out_dir)
+    return {
+        "seconds": seconds,
+        "stages": stages,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+        "artifact_bytes": sum(sizes.values()),
+        "artifacts": sizes,
+    }
+
+
+def measure_build(build: str, raw_dir: Path, out_dir: Path, *, repeat: int) -> dict:
+    """
+    Build'i ``repeat`` kez, her seferinde temiz bir süreçte çalıştırır.
+
+    Tepe bellek süreç başına ölçüldüğü için önceki koşulardan etkilenmez;
+    aşama süreleri en hızlı koşudan alınır.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            runs.append(executor.submit(_run_build, build, str(raw_dir), str(out_dir)).result())
+
+    best = min(runs, key=lambda run: run["seconds"])
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "min_seconds": best["seconds"],
+        "median_seconds": statistics.median(run["seconds"] for run in runs),
+        "stages": best["stages"],
+        "rss_before_mb": best["rss_before_mb"],
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "artifact_bytes": best["artifact_bytes"],
+        "artifacts": best["artifacts"],
+        "repeat": repeat,
+    }
+
+
+def run(
+    *,
+    catalog_sizes: tuple[int, ...],
+    builds: tuple[str, ...],
+    repeat: int,
+    workdir: Path,
+    seed: int,
+) -> dict:
+    results = []
+    for n_movies in catalog_sizes:
+        n_users = max(200, n_movies // 5)
+        root = workdir / f"catalog_{n_movies}"
+        print(f"🧪 Sentetik veri hazırlanıyor: {n_movies:,} film, {n_users:,} kullanıcı...")
+        with open(os.devnull, "w") as sink, redirect_stdout(sink):
+            raw_dir = fixtures.ensure_synthetic_raw(root / "raw", n_movies=n_movies, n_users=n_users, seed=seed)
+
+        for build in builds:
+            stats = measure_build(build, raw_dir, root / f"build_{build}", repeat=repeat)
+            params = {"catalog": n_movies}
+            key = f"build.{build}[catalog={n_movies}]"
+            results.append({"name": f"build.{build}", "params": params, "key": key, **stats})
+            peak = stats["peak_rss_mb"]
+            print(
+                f"   {key:<32} {stats['median_seconds']:>8.2f} sn"
+                f"  {peak if peak is not None else float('nan'):>8.1f} MB"
+                f"  {stats['artifact_bytes'] / 1e6:>8.2f} MB artefakt"
+            )
+            for stage in stats["stages"]:
+                print(f"      • {stage['name']:<12} {stage['seconds']:>8.3f} sn")
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "catalog_sizes": list(catalog_sizes),
+            "builds": list(builds),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, *, time_tolerance: float, memory_tolerance: float, size_tolerance: float) -> list[dict]:
+    """
+    Süre (medyan), tepe bellek ve artefakt boyutunu baseline ile karşılaştırır.
+
+    Her metrik ``1 + tolerans`` katından fazla artarsa gerileme sayılır.
+    """
+    base = {row["key"]: row for row in baseline.get("results", [])}
+    checks = (
+        ("median_seconds", time_tolerance),
+        ("peak_rss_mb", memory_tolerance),
+        ("artifact_bytes", size_tolerance),
+    )
+    rows = []
+    for row in current["results"]:
+        old = base.get(row["key"])
+        if old is None:
+            continue
+        for metric, tolerance in checks:
+            before, after = old.get(metric), row.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            rows.append({
+                "key": row["key"],
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "ratio": ratio,
+                "regression": ratio > 1.0 + tolerance,
+            })
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Model build pipeline'ları için regresyon benchmark'ları",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=list(DEFAULT_CATALOG_SIZES))
+    parser.add_argument("--builds", nargs="+", choices=BUILDS, default=list(BUILDS))
+    parser.add_argument("--repeat", type=int, default=1, help="Build başına koşu sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="Sentetik veri ve build klasörü")
+    parser.add_argument("--output", type=Path, default=None, help="Sonuç JSON yolu (varsayılan: results/build-<zaman>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Karşılaştırılacak baseline JSON")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    parser.add_argument("--memory-tolerance", type=float, default=0.15, help="İzin verilen tepe bellek artışı")
+    parser.add_argument("--size-tolerance", type=float, default=0.10, help="İzin verilen artefakt boyutu artışı")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run(
+        catalog_sizes=tuple(args.catalog_sizes),
+        builds=tuple(args.builds),
+        repeat=args.repeat,
+        workdir=args.workdir,
+        seed=args.seed,
+    )
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"build-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Sonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare(
+            report,
+            baseline,
+            time_tolerance=args.time_tolerance,
+            memory_tolerance=args.memory_tolerance,
+            size_tolerance=args.size_tolerance,
+        )
+        regressions = [row for row in rows if row["regression"]]
+        print(f"\n📊 Baseline karşılaştırması ({args.compare.name}):")
+        for row in rows:
+            flag = "❌" if row["regression"] else "✅"
+            print(
+                f" {flag} {row['key']:<32} {row['metric']:<15} "
+                f"{row['baseline']:>12.2f} → {row['current']:>12.2f} (x{row['ratio']:.2f})"
+            )
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
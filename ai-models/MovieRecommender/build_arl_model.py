@@ -17,6 +17,8 @@ from pathlib import Path
 # Import from existing recommender_arl module
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from src import recommender_arl as arl
+from src.ratings_io import parse_cutoff, read_ratings
+from src.stage_timer import StageTimer
 
 
 def parse_args() -> argparse.Namespace:
@@ -75,6 +77,13 @@ def parse_args() -> argparse.Namespace:
         help="Maximum itemset uzunluğu (2 önerilir)"
     )
     
+    parser.add_argument(
+        "--before",
+        type=str,
+        default=None,
+        help="Sadece bu zamandan önceki rating'lerle eğit (Unix timestamp veya 2005-01-01)"
+    )
+    
     parser.add_argument(
         "--output-dir",
         type=Path,
@@ -114,6 +123,9 @@ def main():
     print(f"  • min_lift: {min_lift}")
     print(f"  • min_movie_likes: {min_movie_likes}")
     print(f"  • max_len: {args.max_len}")
+    ratings_before = parse_cutoff(args.before) if args.before else None
+    if ratings_before is not None:
+        print(f"  • ratings_before: {ratings_before}")
     print(f"{'='*70}\n")
     
     # RAW_DATA_DIR'i modifiye etme (geçici override)
@@ -152,36 +164,40 @@ def main():
             print(f"❌ HATA: {ratings_path} dosyası bulunamadı!")
             sys.exit(1)
         
-        # Custom load fonksiyonu
-        ratings = pd.read_csv(
-            ratings_path,
-            dtype={"userId": "int64", "movieId": "int64", "rating": "float64", "timestamp": "int64"},
-            usecols=["userId", "movieId", "rating", "timestamp"],
-        )
+        timer = StageTimer()
+        # Custom load fonksiyonu (--before varsa parça parça okuyup filtreler)
+        with timer.stage("load") as stage:
+            ratings = read_ratings(ratings_path, before=ratings_before)
+            # Links ve metadata normal şekilde yükle
+            links, metadata = arl.load_raw_data(original_raw_dir)[1:]
+            stage.rows = len(ratings)
         print(f"✅ {len(ratings):,} rating yüklendi\n")
         
-        # Links ve metadata normal şekilde yükle
-        links, metadata = arl.load_raw_data(original_raw_dir)[1:]
-        
         # Mapping oluştur
         print("🗺️  Film mapping oluşturuluyor...")
-        mapping_df = arl.build_movie_mapping(links, metadata)
-        arl.save_movie_mapping(mapping_df, mapping_path)
+        with timer.stage("mapping") as stage:
+            mapping_df = arl.build_movie_mapping(links, metadata)
+            arl.save_movie_mapping(mapping_df, mapping_path)
+            stage.rows = len(mapping_df)
         print(f"✅ {len(mapping_df):,} film eşleştirildi\n")
         
         # Like filtreleme
         print(f"⭐ Beğenilen filmler filtreleniyor (rating >= {args.min_rating})...")
-        liked = arl.filter_liked_ratings(ratings, min_rating=args.min_rating)
-        print(f"✅ {len(liked):,} beğeni bulundu\n")
-        
-        # Nadir filmleri eleme
-        print(f"🎯 Az izlenen filmler eleniyor (min_likes >= {min_movie_likes})...")
-        liked = arl.filter_infrequent_movies(liked, min_likes=min_movie_likes)
+        with timer.stage("filter") as stage:
+            liked = arl.filter_liked_ratings(ratings, min_rating=args.min_rating)
+            print(f"✅ {len(liked):,} beğeni bulundu\n")
+            
+            # Nadir filmleri eleme
+            print(f"🎯 Az izlenen filmler eleniyor (min_likes >= {min_movie_likes})...")
+            liked = arl.filter_infrequent_movies(liked, min_likes=min_movie_likes)
+            stage.rows = len(liked)
         print(f"✅ {liked['movieId'].nunique():,} film kaldı\n")
         
         # Matrix ve kurallar
         print("📊 User-Movie matrix ve association rules oluşturuluyor...")
-        basket_df = arl.build_user_movie_matrix(liked)
+        with timer.stage("basket") as stage:
+            basket_df = arl.build_user_movie_matrix(liked)
+            stage.rows = basket_df.shape[0]
         print(f"ℹ️  Matrix boyutu: {basket_df.shape[0]:,} kullanıcı × {basket_df.shape[1]:,} film")
         
         if args.dataset == "full":
@@ -193,13 +209,16 @@ def main():
             min_confidence=min_confidence,
             min_lift=min_lift,
             max_len=args.max_len,
+            timer=timer,
         )
         
         if rules_df.empty:
             print("⚠️ Hiç kural üretilemedi! Parametreleri düşürün.")
             sys.exit(1)
         
-        arl.save_association_rules(rules_df, rules_path)
+        with timer.stage("save") as stage:
+            arl.save_association_rules(rules_df, rules_path)
+            stage.rows = len(rules_df)
         print(f"✅ {len(rules_df):,} kural oluşturuldu ve kaydedildi\n")
         
         # Metadata kaydet
@@ -212,8 +231,11 @@ def main():
             "min_lift": float(min_lift),
             "min_movie_likes": int(min_movie_likes),
             "max_len": int(args.max_len),
+            "ratings_before": ratings_before,
+            "build_stages": timer.as_dict(),
         }
         arl.save_artifact_metadata(metadata_dict, meta_path)
+        print(timer.report())
         
         print(f"\n{'='*70}")
         print("🎉 MODEL BAŞARIYLA OLUŞTURULDU!")
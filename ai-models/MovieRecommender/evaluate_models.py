@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""
+Ortak offline değerlendirme aracı (ARL, Item-CF, Content-Based, Profile, Hybrid).
+
+Tüm modeller aynı leave-K-out protokolüyle ölçülür: kullanıcıların beğendiği
+(rating >= eşik) filmlerden K tanesi gizlenir, kalanlar modele verilir ve
+gizlenenlerin Top-N içinde yakalanıp yakalanmadığına bakılır. Kullanıcı seçimi
+ve gizlenen filmler ``(seed, userId)``'ye bağlıdır; her model birebir aynı
+test kümesini görür.
+
+Doğruluk metriklerinin yanında her modelin yükleme süresi, throughput
+(kullanıcı/sn) ve öneri gecikmesi yüzdelikleri (p50/p90/p99) raporlanır.
+
+Kimlik uzayı: ARL ve Item-CF MovieLens ``movieId`` ile çalışır. Content
+modelleri TMDB id kullandığı için girdiler ``links_small.csv`` üzerinden
+çevrilir; önerilerden MovieLens karşılığı olmayanlar elenir.
+
+Bölme modları:
+- ``leave-k-out``: Her kullanıcının beğenilerinden K tanesi rastgele gizlenir.
+  ARL ve Item-CF kayıtlı artefaktlarla (tüm rating'lerle eğitilmiş) çalışır;
+  gizlenen beğeniler eğitimde de görüldüğü için skorları iyimserdir.
+- ``temporal``: Kesim zamanından önceki rating'ler eğitim, sonraki beğeniler
+  test kümesidir. ARL ve Item-CF eğitim dilimiyle bellekte yeniden eğitilir;
+  modeller üretimde olduğu gibi geleceği tahmin eder.
+
+``hybrid`` üç modelin aday listelerini ``src/hybrid.py`` ile birleştirir.
+``--tune-hybrid`` aday listelerini kullanıcı başına bir kez üretip ağırlık
+grid'ini ve iki füzyon yöntemini dener; en iyi ayar API'nin ortam
+değişkenleri biçiminde de yazdırılır.
+
+Kullanım:
+    python evaluate_models.py
+    python evaluate_models.py --models arl itemcf content --n-users 500 --n-hidden 2
+    python evaluate_models.py --output results/eval.json
+    python evaluate_models.py --split temporal --cutoff 2005-01-01
+    python evaluate_models.py --models hybrid --hybrid-weights arl=1 itemcf=1 content=0.5
+    python evaluate_models.py --models hybrid --tune-hybrid --weight-grid 0 0.5 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = Path(__file__).resolve().parent
+CONTENT_BASED_DIR = PROJECT_DIR / "Content-Based"
+RAW_DATA_DIR = PROJECT_DIR / "data" / "raw"
+DEFAULT_RATINGS = RAW_DATA_DIR / "ratings_small.csv"
+DEFAULT_LINKS = RAW_DATA_DIR / "links_small.csv"
+
+sys.path.insert(0, str(PROJECT_DIR))
+if str(CONTENT_BASED_DIR) not in sys.path:
+    sys.path.append(str(CONTENT_BASED_DIR))
+
+from src import hybrid  # noqa: E402
+from src.id_links import load_id_links  # noqa: E402
+from src.ratings_io import parse_cutoff, read_ratings  # noqa: E402
+
+MODEL_NAMES = ("arl", "itemcf", "content", "profile", "hybrid")
+SPLIT_MODES = ("leave-k-out", "temporal")
+DEFAULT_CUTOFF_QUANTILE = 0.8
+LATENCY_PERCENTILES = (50, 90, 99)
+DEFAULT_WEIGHT_GRID = (0.0, 0.5, 1.0)
+
+# Bir modelin öneri fonksiyonu: (beğenilen movieId'ler, rating'ler) -> sıralı movieId listesi
+RecommendFn = Callable[[list[int], list[float]], list[int]]
+# Skorlu aday üretici: (beğenilen movieId'ler, rating'ler, aday sayısı) -> (sıralı movieId'ler, skorlar)
+ScoredFn = Callable[[list[int], list[float], int], tuple[np.ndarray, np.ndarray]]
+
+
+@dataclass(frozen=True)
+class HeldOutCase:
+    """Tek kullanıcının değerlendirme girdisi (tüm modeller için ortak)."""
+
+    user_id: int
+    remaining_ids: list[int]
+    remaining_ratings: list[float]
+    hidden_ids: list[int]
+
+
+@dataclass(frozen=True)
+class ModelOptions:
+    """Model adaptörlerine verilen ortak ayarlar."""
+
+    top_n: int
+    links_path: Path
+    method: str = "score_avg"
+    # temporal modda eğitim dilimi; None ise kayıtlı artefaktlar kullanılır
+    train_ratings: pd.DataFrame | None = None
+    hybrid: hybrid.HybridConfig = hybrid.HybridConfig()
+
+
+def load_liked_ratings(path: Path, rating_threshold: float) -> pd.DataFrame:
+    ratings = read_ratings(path, usecols=("userId", "movieId", "rating"))
+    return ratings[ratings["rating"] >= rating_threshold]
+
+
+def resolve_cutoff(path: Path, cutoff: str | None, quantile: float) -> int:
+    """``cutoff`` verilmemişse rating zamanlarının ``quantile`` yüzdeliğini kullanır."""
+    if cutoff is not None:
+        return parse_cutoff(cutoff)
+    timestamps = read_ratings(path, usecols=("timestamp",))["timestamp"]
+    return int(timestamps.quantile(quantile))
+
+
+def build_cases(
+    liked: pd.DataFrame,
+    *,
+    n_users: int,
+    n_hidden: int,
+    min_liked: int,
+    seed: int,
+) -> list[HeldOutCase]:
+    """Seed ile karıştırılmış kullanıcılardan ``n_users`` tanesi için gizleme yapar."""
+    liked = liked.sort_values(["userId", "movieId"], kind="stable")
+    user_codes, user_ids = pd.factorize(liked["userId"], sort=True)
+    offsets = np.zeros(len(user_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(user_codes, minlength=len(user_ids)), out=offsets[1:])
+    movie_ids = liked["movieId"].to_numpy()
+    ratings = liked["rating"].to_numpy()
+
+    positions = list(range(len(user_ids)))
+    random.Random(seed).shuffle(positions)
+    effective_min_liked = max(min_liked, n_hidden + 1)
+
+    cases: list[HeldOutCase] = []
+    for pos in positions:
+        start, stop = offsets[pos], offsets[pos + 1]
+        if stop - start < effective_min_liked:
+            continue
+        user_id = int(user_ids[pos])
+        ids = movie_ids[start:stop].tolist()
+        user_ratings = ratings[start:stop].tolist()
+
+        rng = random.Random(f"{seed}:{user_id}")
+        hidden_idx = set(rng.sample(range(len(ids)), n_hidden))
+        cases.append(HeldOutCase(
+            user_id=user_id,
+            remaining_ids=[mid for i, mid in enumerate(ids) if i not in hidden_idx],
+            remaining_ratings=[r for i, r in enumerate(user_ratings) if i not in hidden_idx],
+            hidden_ids=[ids[i] for i in sorted(hidden_idx)],
+        ))
+        if len(cases) >= n_users:
+            break
+    return cases
+
+
+def build_temporal_cases(
+    train: pd.DataFrame,
+    test: pd.DataFrame,
+    *,
+    n_users: int,
+    rating_threshold: float,
+    min_liked: int,
+    seed: int,
+) -> list[HeldOutCase]:
+    """
+    Kesimden önceki beğeniler girdi, sonraki (yeni) beğeniler gizlenen filmlerdir.
+
+    Kesimden önce en az ``min_liked`` beğenisi ve sonra en az bir yeni beğenisi
+    olan kullanıcılar seed ile karıştırılıp ilk ``n_users`` tanesi alınır.
+    """
+    train_liked = train[train["rating"] >= rating_threshold].sort_values(["userId", "movieId"], kind="stable")
+    test_liked = test[test["rating"] >= rating_threshold].sort_values(["userId", "movieId"], kind="stable")
+    train_groups = {uid: group for uid, group in train_liked.groupby("userId", sort=True)}
+    test_groups = {uid: group["movieId"].tolist() for uid, group in test_liked.groupby("userId", sort=True)}
+
+    user_ids = sorted(uid for uid in test_groups if uid in train_groups)
+    random.Random(seed).shuffle(user_ids)
+
+    cases: list[HeldOutCase] = []
+    for uid in user_ids:
+        history = train_groups[uid]
+        if len(history) < min_liked:
+            continue
+        seen = set(history["movieId"].tolist())
+        hidden = list(dict.fromkeys(mid for mid in test_groups[uid] if mid not in seen))
+        if not hidden:
+            continue
+        cases.append(HeldOutCase(
+            user_id=int(uid),
+            remaining_ids=history["movieId"].astype(int).tolist(),
+            remaining_ratings=history["rating"].astype(float).tolist(),
+            hidden_ids=[int(mid) for mid in hidden],
+        ))
+        if len(cases) >= n_users:
+            break
+    return cases
+
+
+# --- Model adaptörleri ---
+
+def _ranked(scorer: ScoredFn, top_n: int) -> RecommendFn:
+    def recommend(liked_ids: list[int], ratings: list[float]) -> list[int]:
+        return scorer(liked_ids, ratings, top_n)[0].tolist()
+
+    return recommend
+
+
+def _arl_scorer(opts: ModelOptions) -> ScoredFn:
+    from src import recommender_arl as arl
+
+    if opts.train_ratings is None:
+        rules_df = arl.load_association_rules()
+    else:
+        # Kayıtlı modelin parametreleriyle eğitim diliminden yeniden üret
+        meta = arl.load_artifact_metadata() or {}
+        liked = arl.filter_liked_ratings(
+            opts.train_ratings, min_rating=meta.get("min_rating_for_like", arl.DEFAULT_MIN_RATING)
+        )
+        liked = arl.filter_infrequent_movies(
+            liked, min_likes=meta.get("min_movie_likes", arl.DEFAULT_MIN_MOVIE_LIKES)
+        )
+        rules_df = arl.generate_association_rules(
+            arl.build_user_movie_matrix(liked),
+            min_support=meta.get("min_support", arl.DEFAULT_MIN_SUPPORT),
+            min_confidence=meta.get("min_confidence", arl.DEFAULT_MIN_CONFIDENCE),
+            min_lift=meta.get("min_lift", arl.DEFAULT_MIN_LIFT),
+            max_len=meta.get("max_len", 2),
+        )
+
+    def score(liked_ids: list[int], ratings: list[float], n: int) -> tuple[np.ndarray, np.ndarray]:
+        recs = arl.recommend_by_movie_ids(liked_ids, rules_df, top_n=n)
+        return recs["movieId"].to_numpy(dtype=np.int64), recs["score"].to_numpy(dtype=float)
+
+    return score
+
+
+def _itemcf_scorer(opts: ModelOptions) -> ScoredFn:
+    from src import recommender_itemcf as itemcf
+
+    if opts.train_ratings is None:
+        sim_df = itemcf.load_model()
+    else:
+        sim_df = itemcf.create_item_similarity_matrix(opts.train_ratings)
+
+    def score(liked_ids: list[int], ratings: list[float], n: int) -> tuple[np.ndarray, np.ndarray]:
+        recs = itemcf.recommend_by_movie_ids(liked_ids, sim_df, top_n=n)
+        return recs["movieId"].to_numpy(dtype=np.int64), recs["similarity"].to_numpy(dtype=float)
+
+    return score
+
+
+def _content_scorer(opts: ModelOptions, *, use_profile: bool) -> ScoredFn:
+    import recommender_content as rc
+    import user_profile as up
+
+    # İçerik modeli rating kullanmaz; temporal modda yeniden eğitim gerekmez
+    method = opts.method
+    empty = (np.empty(0, dtype=np.int64), np.empty(0))
+    bundle = rc.load_artifacts()
+    links = load_id_links(opts.links_path)
+    # movieId -> matris satırı tablosu bir kez kurulur; istek başına sadece searchsorted
+    row_table = links.row_table(bundle.tmdb_ids)
+    # Yalnızca MovieLens karşılığı olan filmler önerilebilir (aksi halde hit olamaz)
+    not_in_links = ~links.has_tmdb(bundle.tmdb_ids)
+
+    def score(liked_ids: list[int], ratings: list[float], n: int) -> tuple[np.ndarray, np.ndarray]:
+        rows = links.movie_to_row(liked_ids, row_table)
+        found = rows >= 0
+        if not found.any():
+            return empty
+        rows = rows[found].tolist()
+        tmdb_ids = np.asarray(bundle.tmdb_ids)[rows].tolist()
+        if use_profile:
+            try:
+                profile = up.build_user_profile(
+                    tmdb_ids, ratings=[r for r, ok in zip(ratings, found) if ok]
+                )
+            except ValueError:
+                return empty
+            scores = rc.similarity_to_all(profile, bundle)
+        else:
+            scores = rc._compute_similarity_for_indices(rows, bundle, method=method)
+        exclude = rc.exclude_mask_for(bundle, tmdb_ids) | not_in_links
+        top = rc.top_rows(scores, n, exclude_mask=exclude)
+        return links.tmdb_to_movie(bundle.tmdb_ids[top]), scores[top]
+
+    return score
+
+
+def _load_arl(opts: ModelOptions) -> RecommendFn:
+    return _ranked(_arl_scorer(opts), opts.top_n)
+
+
+def _load_itemcf(opts: ModelOptions) -> RecommendFn:
+    return _ranked(_itemcf_scorer(opts), opts.top_n)
+
+
+def _load_content(opts: ModelOptions) -> RecommendFn:
+    return _ranked(_content_scorer(opts, use_profile=False), opts.top_n)
+
+
+def _load_profile(opts: ModelOptions) -> RecommendFn:
+    return _ranked(_content_scorer(opts, use_profile=True), opts.top_n)
+
+
+# Hibrit füzyonun kullandığı aday üreticileri (hybrid.MODEL_KEYS)
+SCORERS: dict[str, Callable[[ModelOptions], ScoredFn]] = {
+    "arl": _arl_scorer,
+    "itemcf": _itemcf_scorer,
+    "content": lambda opts: _content_scorer(opts, use_profile=False),
+}
+
+
+def _hybrid_scorers(opts: ModelOptions) -> dict[str, ScoredFn]:
+    """Ağırlığı sıfırdan büyük modellerin aday üreticileri."""
+    return {name: SCORERS[name](opts) for name in opts.hybrid.active_models}
+
+
+def _hybrid_candidates(scorers: dict[str, ScoredFn], case_ids: list[int], ratings: list[float], depth: int) -> dict:
+    return {name: scorer(case_ids, ratings, depth) for name, scorer in scorers.items()}
+
+
+def _load_hybrid(opts: ModelOptions) -> RecommendFn:
+    scorers = _hybrid_scorers(opts)
+    config = opts.hybrid
+
+    def recommend(liked_ids: list[int], ratings: list[float]) -> list[int]:
+        candidates = _hybrid_candidates(scorers, liked_ids, ratings, max(config.candidates, opts.top_n))
+        ids, _ = hybrid.fuse(candidates, config, top_n=opts.top_n, exclude=liked_ids)
+        return ids.tolist()
+
+    return recommend
+
+
+MODEL_LOADERS: dict[str, Callable[[ModelOptions], RecommendFn]] = {
+    "arl": _load_arl,
+    "itemcf": _load_itemcf,
+    "content": _load_content,
+    "profile": _load_profile,
+    "hybrid": _load_hybrid,
+}
+
+
+# --- Metrikler ---
+
+def ranking_metrics(rec_ids: Sequence[int], hidden_ids: Sequence[int], top_n: int) -> dict:
+    """Tek kullanıcı için hit/recall/precision/NDCG/MRR (Top-N)."""
+    rec_ids = list(rec_ids)[:top_n]
+    rank_of = {mid: rank for rank, mid in enumerate(rec_ids, start=1)}
+    ranks = sorted(rank_of[mid] for mid in hidden_ids if mid in rank_of)
+    hits = len(ranks)
+    n_ideal = min(len(hidden_ids), top_n)
+    idcg = sum(1.0 / math.log2(r + 1) for r in range(1, n_ideal + 1))
+    dcg = sum(1.0 / math.log2(r + 1) for r in ranks)
+    return {
+        "hits": hits,
+        "recall": hits / len(hidden_ids),
+        "precision": hits / min(top_n, len(rec_ids)) if rec_ids else 0.0,
+        "ndcg": dcg / idcg if idcg > 0 else 0.0,
+        "mrr": 1.0 / ranks[0] if ranks else 0.0,
+    }
+
+
+def evaluate_model(
+    name: str,
+    cases: Sequence[HeldOutCase],
+    opts: ModelOptions,
+) -> dict:
+    """
+    Tek modeli tüm kullanıcılar üzerinde çalıştırır; doğruluk + maliyet metrikleri döner.
+
+    ``load_seconds`` temporal modda yeniden eğitim süresini de içerir.
+    """
+    top_n = opts.top_n
+    load_start = time.perf_counter()
+    recommend = MODEL_LOADERS[name](opts)
+    load_seconds = time.perf_counter() - load_start
+
+    latencies = np.zeros(len(cases))
+    totals = {"hits": 0, "recall": 0.0, "precision": 0.0, "ndcg": 0.0, "mrr": 0.0}
+    total_hidden = 0
+    users_with_hit = 0
+    covered = 0
+
+    run_start = time.perf_counter()
+    for i, case in enumerate(cases):
+        t0 = time.perf_counter()
+        rec_ids = recommend(case.remaining_ids, case.remaining_ratings)
+        latencies[i] = time.perf_counter() - t0
+
+        total_hidden += len(case.hidden_ids)
+        if rec_ids:
+            covered += 1
+        metrics = ranking_metrics(rec_ids, case.hidden_ids, top_n)
+        for key in totals:
+            totals[key] += metrics[key]
+        if metrics["hits"]:
+            users_with_hit += 1
+    run_seconds = time.perf_counter() - run_start
+
+    n = len(cases)
+    latency_ms = latencies * 1000.0
+    return {
+        "model": name,
+        "tested": n,
+        "hit_rate": totals["hits"] / total_hidden if total_hidden else 0.0,
+        "hit_rate_user": users_with_hit / n if n else 0.0,
+        "avg_recall": totals["recall"] / n if n else 0.0,
+        "avg_precision": totals["precision"] / n if n else 0.0,
+        "avg_ndcg": totals["ndcg"] / n if n else 0.0,
+        "avg_mrr": totals["mrr"] / n if n else 0.0,
+        "coverage": covered / n if n else 0.0,
+        "load_seconds": load_seconds,
+        "users_per_second": n / run_seconds if run_seconds > 0 else 0.0,
+        "latency_ms": {
+            f"p{p}": float(np.percentile(latency_ms, p)) if n else 0.0
+            for p in LATENCY_PERCENTILES
+        } | {"mean": float(latency_ms.mean()) if n else 0.0},
+    }
+
+
+def tune_hybrid(
+    cases: Sequence[HeldOutCase],
+    opts: ModelOptions,
+    weight_grid: Sequence[float] = DEFAULT_WEIGHT_GRID,
+) -> list[dict]:
+    """
+    Hibrit ağırlıklarını offline arar (grid × her iki füzyon yöntemi).
+
+    Aday listeleri kullanıcı başına bir kez üretilir; her kombinasyon yalnızca
+    füzyonu tekrarlar. Orantılı ağırlıklar (1,1,1 ve 0.5,0.5,0.5) aynı sıralamayı
+    verdiği için bir kez denenir. Sonuçlar NDCG'ye göre azalan sıradadır.
+    """
+    top_n, base = opts.top_n, opts.hybrid
+    scorers = {name: SCORERS[name](opts) for name in hybrid.MODEL_KEYS}
+    depth = max(base.candidates, top_n)
+    per_case = [
+        _hybrid_candidates(scorers, case.remaining_ids, case.remaining_ratings, depth) for case in cases
+    ]
+    total_hidden = sum(len(case.hidden_ids) for case in cases)
+
+    seen: set[tuple[float, ...]] = set()
+    results = []
+    for combo in itertools.product(weight_grid, repeat=len(hybrid.MODEL_KEYS)):
+        peak = max(combo)
+        if peak <= 0 or (ratio := tuple(round(w / peak, 6) for w in combo)) in seen:
+            continue
+        seen.add(ratio)
+        weights = dict(zip(hybrid.MODEL_KEYS, ratio))
+        for method in hybrid.FUSION_METHODS:
+            config = hybrid.HybridConfig(weights=weights, method=method, rrf_k=base.rrf_k, candidates=base.candidates)
+            totals = {"hits": 0, "ndcg": 0.0, "mrr": 0.0}
+            for case, candidates in zip(cases, per_case):
+                ids, _ = hybrid.fuse(candidates, config, top_n=top_n, exclude=case.remaining_ids)
+                metrics = ranking_metrics(ids.tolist(), case.hidden_ids, top_n)
+                for key in totals:
+                    totals[key] += metrics[key]
+            n = len(cases)
+            results.append({
+                "weights": weights,
+                "method": method,
+                "hit_rate": totals["hits"] / total_hidden if total_hidden else 0.0,
+                "avg_ndcg": totals["ndcg"] / n if n else 0.0,
+                "avg_mrr": totals["mrr"] / n if n else 0.0,
+            })
+    results.sort(key=lambda row: (row["avg_ndcg"], row["hit_rate"]), reverse=True)
+    return results
+
+
+def run(
+    models: Sequence[str],
+    *,
+    ratings_path: Path = DEFAULT_RATINGS,
+    links_path: Path = DEFAULT_LINKS,
+    n_users: int = 200,
+    top_n: int = 10,
+    n_hidden: int = 1,
+    rating_threshold: float = 4.0,
+    min_liked: int = 5,
+    seed: int = 42,
+    method: str = "score_avg",
+    split: str = "leave-k-out",
+    cutoff: str | None = None,
+    cutoff_quantile: float = DEFAULT_CUTOFF_QUANTILE,
+    hybrid_config: hybrid.HybridConfig | None = None,
+    tune: bool = False,
+    weight_grid: Sequence[float] = DEFAULT_WEIGHT_GRID,
+) -> dict:
+    """Seçilen modelleri aynı test kümesinde değerlendirir; ``tune`` ile hibrit ağırlıklarını da arar."""
+    hybrid_config = hybrid_config or hybrid.HybridConfig()
+    cutoff_ts: int | None = None
+    train_ratings: pd.DataFrame | None = None
+    if split == "temporal":
+        cutoff_ts = resolve_cutoff(ratings_path, cutoff, cutoff_quantile)
+        print(f"⏱️  Zaman kesimi: {cutoff_ts}")
+        train_ratings = read_ratings(ratings_path, before=cutoff_ts)
+        test_ratings = read_ratings(ratings_path, since=cutoff_ts)
+        cases = build_temporal_cases(
+            train_ratings,
+            test_ratings,
+            n_users=n_users,
+            rating_threshold=rating_threshold,
+            min_liked=min_liked,
+            seed=seed,
+        )
+        del test_ratings
+    elif split == "leave-k-out":
+        liked = load_liked_ratings(ratings_path, rating_threshold)
+        cases = build_cases(liked, n_users=n_users, n_hidden=n_hidden, min_liked=min_liked, seed=seed)
+    else:
+        raise ValueError(f"Bilinmeyen split: {split}")
+
+    opts = ModelOptions(
+        top_n=top_n, links_path=links_path, method=method, train_ratings=train_ratings, hybrid=hybrid_config
+    )
+    results = []
+    for name in models:
+        print(f"🔄 {name} değerlendiriliyor ({len(cases)} kullanıcı)...")
+        try:
+            results.append(evaluate_model(name, cases, opts))
+        except FileNotFoundError as exc:
+            print(f"   ⚠️ {name} atlandı: {exc}")
+            results.append({"model": name, "error": str(exc)})
+
+    tuning = None
+    if tune:
+        print(f"🎛️  Hibrit ağırlıkları aranıyor (grid={list(weight_grid)})...")
+        try:
+            tuning = tune_hybrid(cases, opts, weight_grid)
+        except FileNotFoundError as exc:
+            print(f"   ⚠️ Ağırlık araması atlandı: {exc}")
+
+    report = {
+        "params": {
+            "ratings": str(ratings_path),
+            "links": str(links_path),
+            "n_users": n_users,
+            "top_n": top_n,
+            "n_hidden": n_hidden,
+            "rating_threshold": rating_threshold,
+            "min_liked": min_liked,
+            "seed": seed,
+            "method": method,
+            "split": split,
+            "cutoff": cutoff_ts,
+            "hybrid": {
+                "weights": hybrid_config.weights,
+                "method": hybrid_config.method,
+                "rrf_k": hybrid_config.rrf_k,
+                "candidates": hybrid_config.candidates,
+            },
+        },
+        "results": results,
+    }
+    if tuning is not None:
+        report["hybrid_tuning"] = tuning
+    return report
+
+
+def print_report(report: dict) -> None:
+    top_n = report["params"]["top_n"]
+    header = (
+        f"{'model':<9} {'users':>6} {'HR@' + str(top_n):>8} {'NDCG':>7} {'MRR':>7} {'cov':>6} "
+        f"{'load s':>7} {'users/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}"
+    )
+    print("\n" + "=" * len(header))
+    print("📊 MODEL KARŞILAŞTIRMASI")
+    params = report["params"]
+    if params.get("split") == "temporal":
+        print(f"🧪 split=temporal (cutoff={params['cutoff']})")
+    else:
+        print(f"🧪 split=leave-k-out (n_hidden={params['n_hidden']})")
+    print("=" * len(header))
+    print(header)
+    print("-" * len(header))
+    for row in report["results"]:
+        if "error" in row:
+            print(f"{row['model']:<9} ❌ {row['error']}")
+            continue
+        lat = row["latency_ms"]
+        print(
+            f"{row['model']:<9} {row['tested']:>6} {row['hit_rate']:>8.3f} {row['avg_ndcg']:>7.3f} "
+            f"{row['avg_mrr']:>7.3f} {row['coverage']:>6.2f} {row['load_seconds']:>7.2f} "
+            f"{row['users_per_second']:>9.1f} {lat['p50']:>8.2f} {lat['p90']:>8.2f} {lat['p99']:>8.2f}"
+        )
+    print("=" * len(header))
+
+    tuning = report.get("hybrid_tuning")
+    if tuning:
+        print(f"\n🎛️  HİBRİT AĞIRLIK ARAMASI (ilk 10 / {len(tuning)})")
+        print(f"{'arl':>5} {'itemcf':>7} {'content':>8} {'method':>9} {'HR@' + str(top_n):>8} {'NDCG':>7} {'MRR':>7}")
+        for row in tuning[:10]:
+            w = row["weights"]
+            print(
+                f"{w['arl']:>5.2f} {w['itemcf']:>7.2f} {w['content']:>8.2f} {row['method']:>9} "
+                f"{row['hit_rate']:>8.3f} {row['avg_ndcg']:>7.3f} {row['avg_mrr']:>7.3f}"
+            )
+        best = tuning[0]
+        weights = ",".join(f"{name}={value:g}" for name, value in best["weights"].items())
+        print(f"💡 En iyi: --hybrid-method {best['method']} --hybrid-weights {weights.replace(',', ' ')}")
+        print(f"   API: MOVIEREC_HYBRID_METHOD={best['method']} MOVIEREC_HYBRID_WEIGHTS={weights}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="ARL / Item-CF / Content modellerini ortak leave-K-out protokolüyle değerlendirir",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--models", nargs="+", choices=MODEL_NAMES, default=list(MODEL_NAMES))
+    parser.add_argument("--ratings", type=Path, default=DEFAULT_RATINGS, help="ratings CSV yolu")
+    parser.add_argument("--links", type=Path, default=DEFAULT_LINKS, help="links CSV yolu (movieId <-> tmdbId)")
+    parser.add_argument("--n-users", type=int, default=200, help="Kaç kullanıcı test edilecek")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--n-hidden", type=int, default=1, help="Kullanıcı başına gizlenecek film sayısı")
+    parser.add_argument("--rating-threshold", type=float, default=4.0)
+    parser.add_argument("--min-liked", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--method",
+        choices=("score_avg", "vector_avg"),
+        default="score_avg",
+        help="content modeli için çoklu film yöntemi",
+    )
+    parser.add_argument("--split", choices=SPLIT_MODES, default="leave-k-out")
+    parser.add_argument(
+        "--cutoff",
+        type=str,
+        default=None,
+        help="temporal mod kesim zamanı (Unix timestamp veya 2005-01-01)",
+    )
+    parser.add_argument(
+        "--cutoff-quantile",
+        type=float,
+        default=DEFAULT_CUTOFF_QUANTILE,
+        help="--cutoff verilmezse rating zamanlarının bu yüzdeliği kesim olur",
+    )
+    parser.add_argument(
+        "--hybrid-weights",
+        nargs="+",
+        default=[f"{name}={weight:g}" for name, weight in hybrid.DEFAULT_WEIGHTS.items()],
+        help="hybrid modeli ağırlıkları (ör. arl=1 itemcf=1 content=0.5; verilmeyen 0)",
+    )
+    parser.add_argument("--hybrid-method", choices=hybrid.FUSION_METHODS, default="rrf")
+    parser.add_argument("--hybrid-candidates", type=int, default=hybrid.DEFAULT_CANDIDATES, help="model başına aday")
+    parser.add_argument("--rrf-k", type=float, default=hybrid.DEFAULT_RRF_K)
+    parser.add_argument("--tune-hybrid", action="store_true", help="hibrit ağırlıklarını grid ile ara")
+    parser.add_argument(
+        "--weight-grid", type=float, nargs="+", default=list(DEFAULT_WEIGHT_GRID), help="--tune-hybrid ağırlık değerleri"
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Sonuçları JSON olarak kaydet")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run(
+        args.models,
+        ratings_path=args.ratings,
+        links_path=args.links,
+        n_users=args.n_users,
+        top_n=args.top_n,
+        n_hidden=args.n_hidden,
+        rating_threshold=args.rating_threshold,
+        min_liked=args.min_liked,
+        seed=args.seed,
+        method=args.method,
+        split=args.split,
+        cutoff=args.cutoff,
+        cutoff_quantile=args.cutoff_quantile,
+        hybrid_config=hybrid.HybridConfig(
+            weights=hybrid.parse_weights(args.hybrid_weights),
+            method=args.hybrid_method,
+            rrf_k=args.rrf_k,
+            candidates=args.hybrid_candidates,
+        ),
+        tune=args.tune_hybrid,
+        weight_grid=args.weight_grid,
+    )
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Sentetik veri üretici (MovieLens / TMDB şemaları).
+
+Builder'ların ``data/raw`` altında beklediği dosyaları gerçek veriyle aynı
+kolonlar ve alan formatlarıyla (stringleştirilmiş Python listeleri) üretir:
+
+    movies_metadata.csv, keywords.csv, credits.csv,
+    links.csv, links_small.csv, ratings.csv, ratings_small.csv
+
+Ölçek parametrelerle ayarlanır (ör. 1M film, 100M rating). Film popülerliği
+power-law (Zipf) dağılır; rating'ler kullanıcı blokları halinde üretilip
+diske eklenir, bu yüzden bellek kullanımı toplam rating sayısından bağımsızdır.
+Aynı seed ile çıktı birebir aynıdır.
+
+Kullanım:
+    python generate_synthetic_data.py --out data/synthetic/raw --movies 50000 --ratings 5000000
+    python generate_synthetic_data.py --out /big/raw --movies 1000000 --users 2000000 --ratings 100000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = Path(__file__).resolve().parent
+DEFAULT_OUT_DIR = PROJECT_DIR / "data" / "synthetic" / "raw"
+
+# TMDB tür kimlikleri (gerçek veri setindekiyle aynı)
+GENRES = {
+    "Action": 28, "Adventure": 12, "Animation": 16, "Comedy": 35, "Crime": 80,
+    "Documentary": 99, "Drama": 18, "Family": 10751, "Fantasy": 14, "History": 36,
+    "Horror": 27, "Music": 10402, "Mystery": 9648, "Romance": 10749,
+    "Science Fiction": 878, "Thriller": 53, "War": 10752, "Western": 37,
+}
+# Gerçek veriye yakın tür sıklıkları (Drama ve Comedy baskın)
+GENRE_WEIGHTS = np.array([8, 4, 2, 12, 4, 3, 20, 3, 2, 1, 5, 1, 2, 6, 3, 7, 1, 1], dtype=float)
+RATING_VALUES = np.arange(1, 11) / 2.0  # 0.5 ... 5.0
+SYLLABLES = (
+    "ka lo mi ra ne to su vi da re an el or is um ba ce fo gu hi "
+    "ja ke lu mo ni pa qu ri sa te ul va we xi yo ze"
+).split()
+TITLE_ADJECTIVES = (
+    "Silent Dark Last Lost Broken Golden Hidden Wild Red Blue Final Secret Burning "
+    "Frozen Eternal Crimson Hollow Iron Velvet Midnight Savage Quiet Distant Fallen"
+).split()
+TITLE_NOUNS = (
+    "Ocean City Kingdom Road River Night Empire Garden Storm Heart Mirror Shadow Island "
+    "Frontier Machine Winter Summer Planet Forest Station Harbor Desert Promise Witness "
+    "Signal Voyage Legacy Echo Horizon Circus"
+).split()
+CHUNK_MOVIES = 100_000
+MAX_DRAW_ROUNDS = 8
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    n_movies: int = 10_000
+    n_users: int = 50_000
+    n_ratings: int = 1_000_000
+    small_movie_fraction: float = 0.2
+    small_users: int = 700
+    zipf_exponent: float = 1.0
+    seed: int = 42
+    chunk_users: int = 50_000
+    tmdb_offset: int = 0
+
+
+def _make_vocabulary(rng: np.random.Generator, size: int, syllables: tuple[int, int]) -> np.ndarray:
+    """Hecelerden benzersiz sahte kelimeler üretir."""
+    words: set[str] = set()
+    while len(words) < size:
+        count = rng.integers(syllables[0], syllables[1] + 1, size=size)
+        for n in count:
+            words.add("".join(rng.choice(SYLLABLES, size=n)))
+            if len(words) >= size:
+                break
+    return np.array(sorted(words))
+
+
+def _literal_list(items: list[dict]) -> str:
+    """Gerçek CSV'lerdeki gibi ``ast.literal_eval`` ile okunabilen liste metni."""
+    return repr(items)
+
+
+def _popularity(n: int, exponent: float, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Zipf popülerlik olasılıkları ve film sırası.
+
+    Dönen ``order[k]``, k'ıncı en popüler filmin indeksidir; popülerlik id
+    sırasıyla ilişkili olmasın diye karıştırılır.
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    order = rng.permutation(n)
+    probs = np.empty(n)
+    probs[order] = weights / weights.sum()
+    return probs, order
+
+
+def _titles(n: int, rng: np.random.Generator) -> list[str]:
+    """Benzersiz başlıklar; kombinasyonlar bitince devam filmi numarası eklenir."""
+    combos = len(TITLE_ADJECTIVES) * len(TITLE_NOUNS)
+    slots = rng.permutation(n)
+    titles = []
+    for slot in slots:
+        adj = TITLE_ADJECTIVES[slot % len(TITLE_ADJECTIVES)]
+        noun = TITLE_NOUNS[(slot // len(TITLE_ADJECTIVES)) % len(TITLE_NOUNS)]
+        sequel = slot // combos
+        prefix = "The " if (slot // 7) % 3 == 0 else ""
+        titles.append(f"{prefix}{adj} {noun}" + (f" {sequel + 1}" if sequel else ""))
+    return titles
+
+
+def _weighted_draw(cdf: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Kümülatif dağılımdan iadeli örnekleme (``rng.choice(p=...)`` çağrısından hızlı)."""
+    return np.minimum(np.searchsorted(cdf, rng.random(size), side="right"), len(cdf) - 1)
+
+
+def _zipf_cdf(n: int, exponent: float) -> np.ndarray:
+    cdf = np.cumsum(1.0 / np.arange(1, n + 1) ** exponent)
+    return cdf / cdf[-1]
+
+
+def _split(values: np.ndarray, counts: np.ndarray) -> list[np.ndarray]:
+    """Düz diziyi film başına parçalara böler."""
+    return np.split(values, np.cumsum(counts)[:-1])
+
+
+def write_movies(out_dir: Path, cfg: SyntheticConfig, rng: np.random.Generator, popularity: np.ndarray) -> None:
+    """
+    movies_metadata.csv, keywords.csv ve credits.csv dosyalarını blok blok yazar.
+
+    Rastgele çekimler blok başına tek seferde yapılır; film başına döngü sadece
+    metin alanlarını birleştirir.
+    """
+    n = cfg.n_movies
+    genre_names = list(GENRES)
+    genre_log_probs = np.log(GENRE_WEIGHTS / GENRE_WEIGHTS.sum())
+    vocab = _make_vocabulary(rng, 8_000, (2, 4))
+    vocab_cdf = _zipf_cdf(len(vocab), 1.0)
+    # Her türün kendine özgü kelime havuzu: içerik benzerliği türle ilişkili olsun
+    genre_vocab = np.stack([rng.choice(vocab, size=150, replace=False) for _ in genre_names])
+    keyword_vocab = _make_vocabulary(rng, 5_000, (2, 3))
+    n_people = max(1_000, n // 2)
+    people_cdf = _zipf_cdf(n_people, 0.8)
+    languages = np.array(["en"] * 7 + ["fr", "de", "ja", "es", "it", "ko", "tr"])
+    titles = _titles(n, rng)
+    max_pop = popularity.max()
+
+    files = {name: out_dir / f"{name}.csv" for name in ("movies_metadata", "keywords", "credits")}
+    for start in range(0, n, CHUNK_MOVIES):
+        stop = min(start + CHUNK_MOVIES, n)
+        size = stop - start
+        tmdb_ids = np.arange(start, stop) + 1 + cfg.tmdb_offset
+        pop = popularity[start:stop] / max_pop
+        vote_count = np.maximum(0, (pop * 15_000 * rng.lognormal(0, 0.3, size))).astype(int)
+        vote_average = np.where(vote_count > 0, np.clip(rng.normal(6.2, 1.0, size), 1, 10).round(1), 0.0)
+        budgets = rng.integers(0, 200, size) * 1_000_000 * (pop > 0.01)
+        dates = np.stack([rng.integers(1920, 2018, size), rng.integers(1, 13, size), rng.integers(1, 29, size)], axis=1)
+        runtimes = rng.integers(70, 180, size)
+        langs = languages[rng.integers(0, len(languages), size)]
+
+        # İadesiz ağırlıklı tür seçimi (Gumbel top-k); ilk tür "ana" türdür
+        genre_order = np.argsort(-(genre_log_probs + rng.gumbel(size=(size, len(genre_names)))), axis=1)
+        genre_counts = rng.integers(1, 4, size)
+
+        # Overview: ana türün kelimeleri + genel (Zipf) kelimeler, karışık sırada
+        n_genre_words = rng.integers(5, 15, size)
+        n_common_words = rng.integers(10, 40, size)
+        word_counts = n_genre_words + n_common_words
+        owner = np.repeat(np.arange(size), word_counts)
+        is_genre_word = np.arange(len(owner)) - np.repeat(np.cumsum(word_counts) - word_counts, word_counts) < np.repeat(n_genre_words, word_counts)
+        words = vocab[_weighted_draw(vocab_cdf, len(owner), rng)]
+        primary = genre_order[owner, 0]
+        words[is_genre_word] = genre_vocab[primary[is_genre_word], rng.integers(0, 150, int(is_genre_word.sum()))]
+        words = words[np.lexsort((rng.random(len(owner)), owner))]
+
+        keyword_counts = rng.integers(0, 11, size)
+        keyword_ids = rng.integers(0, len(keyword_vocab), int(keyword_counts.sum()))
+        cast_counts = rng.integers(3, 16, size)
+        cast_ids = _weighted_draw(people_cdf, int(cast_counts.sum()), rng)
+        directors = _weighted_draw(people_cdf, size, rng)
+
+        meta_rows, keyword_rows, credit_rows = [], [], []
+        per_movie = zip(_split(words, word_counts), _split(keyword_ids, keyword_counts), _split(cast_ids, cast_counts))
+        for i, (overview, kw, cast_idx) in enumerate(per_movie):
+            tmdb_id = int(tmdb_ids[i])
+            genres = [genre_names[g] for g in genre_order[i, : genre_counts[i]]]
+            year, month, day = dates[i]
+            meta_rows.append({
+                "adult": "False",
+                "budget": int(budgets[i]),
+                "genres": _literal_list([{"id": GENRES[g], "name": g} for g in genres]),
+                "id": tmdb_id,
+                "imdb_id": f"tt{tmdb_id:07d}",
+                "original_language": str(langs[i]),
+                "original_title": titles[start + i],
+                "overview": " ".join(overview).capitalize() + ".",
+                "popularity": round(float(pop[i] * 100), 6),
+                "release_date": f"{year}-{month:02d}-{day:02d}",
+                "revenue": 0,
+                "runtime": float(runtimes[i]),
+                "status": "Released",
+                "tagline": "",
+                "title": titles[start + i],
+                "video": "False",
+                "vote_average": float(vote_average[i]),
+                "vote_count": int(vote_count[i]),
+            })
+            keyword_rows.append({
+                "id": tmdb_id,
+                "keywords": _literal_list([{"id": int(j), "name": str(keyword_vocab[j])} for j in dict.fromkeys(kw.tolist())]),
+            })
+            cast = list(dict.fromkeys(cast_idx.tolist()))
+            director = int(directors[i])
+            credit_rows.append({
+                "cast": _literal_list([
+                    {"cast_id": order, "character": f"Character {order}", "id": p, "name": f"Person {p}", "order": order}
+                    for order, p in enumerate(cast)
+                ]),
+                "crew": _literal_list([
+                    {"department": "Directing", "id": director, "job": "Director", "name": f"Person {director}"},
+                    {"department": "Writing", "id": cast[0], "job": "Screenplay", "name": f"Person {cast[0]}"},
+                ]),
+                "id": tmdb_id,
+            })
+
+        for name, rows in (("movies_metadata", meta_rows), ("keywords", keyword_rows), ("credits", credit_rows)):
+            pd.DataFrame(rows).to_csv(files[name], mode="w" if start == 0 else "a", header=start == 0, index=False)
+        print(f"   🎬 {stop:,}/{n:,} film")
+
+
+def write_links(out_dir: Path, cfg: SyntheticConfig, popularity_order: np.ndarray) -> np.ndarray:
+    """links.csv ve links_small.csv; small katalog en popüler filmlerden oluşur."""
+    n = cfg.n_movies
+    movie_ids = np.arange(1, n + 1)
+    links = pd.DataFrame({
+        "movieId": movie_ids,
+        "imdbId": movie_ids,
+        "tmdbId": movie_ids + cfg.tmdb_offset,
+    })
+    links.to_csv(out_dir / "links.csv", index=False)
+
+    n_small = max(1, int(n * cfg.small_movie_fraction))
+    small_mask = np.zeros(n, dtype=bool)
+    small_mask[popularity_order[:n_small]] = True
+    links[small_mask].to_csv(out_dir / "links_small.csv", index=False)
+    return small_mask
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sıralama tabanlı ``np.unique`` (büyük int64 dizilerde hash yönteminden hızlı)."""
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+def write_ratings(
+    out_dir: Path,
+    cfg: SyntheticConfig,
+    rng: np.random.Generator,
+    popularity: np.ndarray,
+    small_mask: np.ndarray,
+) -> tuple[int, int]:
+    """
+    ratings.csv ve ratings_small.csv dosyalarını kullanıcı blokları halinde yazar.
+
+    Kullanıcı başına rating sayısı log-normal dağılır (az sayıda çok aktif
+    kullanıcı). Aynı kullanıcı-film çifti tekrar etmez; çok aktif kullanıcılar
+    popüler filmleri tükettiğinde toplam ``n_ratings``'in biraz altında kalabilir. ratings_small, ilk
+    ``small_users`` kullanıcının small katalogdaki rating'leridir.
+    """
+    n_movies, n_users = cfg.n_movies, cfg.n_users
+    activity = rng.lognormal(0, 1.2, n_users)
+    counts = np.maximum(1, np.round(activity / activity.sum() * cfg.n_ratings)).astype(np.int64)
+    counts = np.minimum(counts, n_movies)
+    cdf = np.cumsum(popularity)
+    cdf[-1] = 1.0
+    movie_bias = rng.normal(0, 0.5, n_movies)
+    small_movie_ids = np.flatnonzero(small_mask) + 1
+
+    total = small_total = 0
+    for start in range(0, n_users, cfg.chunk_users):
+        stop = min(start + cfg.chunk_users, n_users)
+        block_users = np.arange(start, stop, dtype=np.int64) + 1
+        keys = np.empty(0, dtype=np.int64)
+        missing = counts[start:stop]
+        # Tekrar eden (kullanıcı, film) çiftleri atılır, eksik kalanlar yeniden çekilir
+        for _ in range(MAX_DRAW_ROUNDS):
+            users = np.repeat(block_users, missing)
+            if len(users) == 0:
+                break
+            movies = np.searchsorted(cdf, rng.random(len(users)), side="right").astype(np.int64)
+            keys = _sorted_unique(np.concatenate([keys, users * (n_movies + 1) + movies]))
+            have = np.bincount(keys // (n_movies + 1) - block_users[0], minlength=len(block_users))
+            missing = counts[start:stop] - have
+        users, movies = keys // (n_movies + 1), keys % (n_movies + 1)
+
+        user_bias = rng.normal(0, 0.4, stop - start)[users - 1 - start]
+        raw = 3.5 + user_bias + movie_bias[movies] + rng.normal(0, 0.9, len(users))
+        ratings = RATING_VALUES[np.clip(np.round(raw * 2) - 1, 0, 9).astype(int)]
+        first_seen = rng.integers(820_000_000, 1_500_000_000, stop - start)[users - 1 - start]
+        span = rng.exponential(60 * 86_400 * 6, stop - start)[users - 1 - start]
+        timestamps = (first_seen + rng.random(len(users)) * span).astype(np.int64)
+
+        block = pd.DataFrame({
+            "userId": users,
+            "movieId": movies + 1,
+            "rating": ratings,
+            "timestamp": timestamps,
+        })
+        first = start == 0
+        block.to_csv(out_dir / "ratings.csv", mode="w" if first else "a", header=first, index=False)
+        total += len(block)
+
+        small = block[(block["userId"] <= cfg.small_users) & np.isin(block["movieId"].to_numpy(), small_movie_ids)]
+        small.to_csv(out_dir / "ratings_small.csv", mode="w" if first else "a", header=first, index=False)
+        small_total += len(small)
+        print(f"   ⭐ {stop:,}/{n_users:,} kullanıcı, {total:,} rating")
+    return total, small_total
+
+
+def generate(out_dir: Path, cfg: SyntheticConfig) -> dict:
+    """Tüm sentetik dosyaları ``out_dir`` altına yazar; özet istatistikleri döndürür."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(cfg.seed)
+    started = time.perf_counter()
+
+    print(f"📦 Sentetik veri üretiliyor → {out_dir}")
+    popularity, order = _popularity(cfg.n_movies, cfg.zipf_exponent, rng)
+    write_movies(out_dir, cfg, rng, popularity)
+    small_mask = write_links(out_dir, cfg, order)
+    n_ratings, n_small = write_ratings(out_dir, cfg, rng, popularity, small_mask)
+
+    summary = {
+        "config": asdict(cfg),
+        "ratings_written": n_ratings,
+        "ratings_small_written": n_small,
+        "links_small_movies": int(small_mask.sum()),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    (out_dir / "synthetic_meta.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"✅ Tamamlandı: {n_ratings:,} rating ({n_small:,} small), {summary['seconds']} sn")
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="MovieLens/TMDB şemasında sentetik veri üretici",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    defaults = SyntheticConfig()
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR, help="Çıktı klasörü")
+    parser.add_argument("--movies", type=int, default=defaults.n_movies)
+    parser.add_argument("--users", type=int, default=defaults.n_users)
+    parser.add_argument("--ratings", type=int, default=defaults.n_ratings, help="Hedef toplam rating sayısı")
+    parser.add_argument(
+        "--small-movie-fraction",
+        type=float,
+        default=defaults.small_movie_fraction,
+        help="links_small'a giren (en popüler) film oranı",
+    )
+    parser.add_argument("--small-users", type=int, default=defaults.small_users, help="ratings_small kullanıcı sayısı")
+    parser.add_argument("--zipf", type=float, default=defaults.zipf_exponent, help="Popülerlik power-law üssü")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--chunk-users", type=int, default=defaults.chunk_users, help="Blok başına kullanıcı")
+    parser.add_argument("--tmdb-offset", type=int, default=defaults.tmdb_offset, help="tmdbId = movieId + offset")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    generate(
+        args.out,
+        SyntheticConfig(
+            n_movies=args.movies,
+            n_users=args.users,
+            n_ratings=args.ratings,
+            small_movie_fraction=args.small_movie_fraction,
+            small_users=args.small_users,
+            zipf_exponent=args.zipf,
+            seed=args.seed,
+            chunk_users=args.chunk_users,
+            tmdb_offset=args.tmdb_offset,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+AI API sunucusu için gunicorn ayarları (Linux/macOS üretim ortamı).
+
+    gunicorn -c gunicorn.conf.py "api_server:create_app()"
+
+Modeller master süreçte bir kez yüklenir (``preload_app``), worker'lar fork ile
+bu belleği copy-on-write paylaşır. Tüm değerler ortam değişkenleriyle ezilebilir.
+
+``/metrics``, yanıt önbelleği ve ``/admin/reload`` worker başınadır. HUP ve
+``max_requests`` yenilemesi modelleri yeniden yüklemez (worker'lar master'dan
+fork edilir); yeni artefaktlar için gunicorn yeniden başlatılmalıdır.
+"""
+
+import os
+
+bind = os.environ.get("MOVIEREC_BIND", "0.0.0.0:9001")
+
+# Modelleri fork'tan önce yükle (api_server.create_app)
+preload_app = True
+
+# Worker başına thread: skorlama numpy/scipy içinde GIL'i bırakır
+workers = int(os.environ.get("MOVIEREC_WORKERS", "2"))
+threads = int(os.environ.get("MOVIEREC_THREADS", "4"))
+worker_class = "gthread"
+
+# Worker'ları belirli istek sayısından sonra yenile (bellek şişmesine karşı);
+# jitter hepsinin aynı anda yeniden başlamasını önler
+max_requests = int(os.environ.get("MOVIEREC_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.environ.get("MOVIEREC_MAX_REQUESTS_JITTER", "500"))
+
+# İlk istekte yükleme yok, bu yüzden kısa tutulabilir
+timeout = int(os.environ.get("MOVIEREC_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("MOVIEREC_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
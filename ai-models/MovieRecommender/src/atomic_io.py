@@ -0,0 +1,64 @@
+"""
+Artefaktları okuyuculara yarım göstermeden yazma yardımcıları.
+
+Sunucular artefakt dosyalarını ``np.load(mmap_mode="r")`` ile açık tutar;
+aynı dosyanın üzerine yazmak (truncate + yeniden yazma) bu process'lerde
+SIGBUS'a veya yırtık okumaya yol açar. Burada her şey önce geçici bir kardeş
+yola yazılır ve ``os.replace`` ile tek adımda yayınlanır; eski dosyanın
+inode'u onu açık tutan process'ler için yaşamaya devam eder::
+
+    replace_file(META_JSON_PATH, lambda f: f.write(payload))
+    publish_dir(MODELS_DIR / "tfidf_csr-20250101T120000", lambda tmp: store.save_csr(tmp, matrix))
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{suffix}")
+
+
+def replace_file(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    """``write(f)`` ile geçici dosyaya yazar ve ``os.replace`` ile yerine koyar."""
+    tmp = _sibling(path, "tmp")
+    try:
+        with tmp.open("wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def publish_dir(directory: Path, write: Callable[[Path], object]) -> None:
+    """
+    ``write(tmp_dir)`` ile klasörü geçici kardeş klasörde kurar, sonra yeniden adlandırır.
+
+    ``directory`` zaten varsa önce kenara alınır ve yenisi yerleşince silinir.
+    Arada klasörü bulamayan okuyucu artefaktı eksik sayar (yeniden üretir veya
+    eskisini kullanır); hiçbir zaman yarım yazılmış dosya görmez. Aynı anda
+    başka bir process yayınlarsa onunki kalır.
+    """
+    tmp = _sibling(directory, "tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    try:
+        write(tmp)
+        old = None
+        if directory.exists():
+            old = _sibling(directory, "old")
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(directory, old)
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            if not directory.is_dir():
+                raise
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,122 @@
+"""
+ARL, Item-CF ve Content aday listelerini tek sıralamada birleştiren hibrit skor füzyonu.
+
+Her model kendi indeksinden derin bir aday listesi (``candidates`` kadar) üretir;
+listeler ortak id uzayında (MovieLens ``movieId``, Content sonuçları id_links ile
+çevrilir) tek bir vektörel geçişte birleştirilir::
+
+    config = HybridConfig(weights={"arl": 1.0, "itemcf": 1.0, "content": 0.5}, method="rrf")
+    ids, scores = fuse({"arl": (arl_ids, arl_scores), "content": (c_ids, c_scores)}, config,
+                       top_n=10, exclude=liked_ids)
+
+Yöntemler:
+- ``rrf`` (Reciprocal Rank Fusion): ``Σ w_m / (k + rank_m)``; sadece sıralamaya
+  bakar, modellerin skor ölçekleri farklı olduğunda güvenlidir.
+- ``weighted``: ``Σ w_m · skor_m / max(skor_m)``; her listenin skoru kendi en
+  yüksek değerine bölünerek [0, 1]'e çekilir (negatifler 0 sayılır).
+
+Listede olmayan film o modelden katkı almaz. Ağırlıklar ``evaluate_models.py
+--tune-hybrid`` ile offline ayarlanabilir.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+FUSION_METHODS = ("rrf", "weighted")
+MODEL_KEYS = ("arl", "itemcf", "content")
+DEFAULT_WEIGHTS = {"arl": 1.0, "itemcf": 1.0, "content": 1.0}
+DEFAULT_RRF_K = 60.0
+DEFAULT_CANDIDATES = 100
+
+
+@dataclass(frozen=True)
+class HybridConfig:
+    """Füzyon ayarları; ağırlığı 0 olan model hiç çağrılmaz."""
+
+    weights: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    method: str = "rrf"
+    rrf_k: float = DEFAULT_RRF_K
+    candidates: int = DEFAULT_CANDIDATES
+
+    def __post_init__(self) -> None:
+        if self.method not in FUSION_METHODS:
+            raise ValueError(f"Bilinmeyen füzyon yöntemi: {self.method}")
+        unknown = set(self.weights) - set(MODEL_KEYS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen model ağırlığı: {sorted(unknown)} (geçerli: {MODEL_KEYS})")
+        if any(weight < 0 for weight in self.weights.values()):
+            raise ValueError("Ağırlıklar negatif olamaz")
+
+    @property
+    def active_models(self) -> list[str]:
+        return [name for name in MODEL_KEYS if self.weights.get(name, 0.0) > 0]
+
+
+def parse_weights(items: Iterable[str] | str) -> dict[str, float]:
+    """``"arl=1,content=0.5"`` veya ``["arl=1", "content=0.5"]`` -> sözlük; verilmeyenler 0."""
+    if isinstance(items, str):
+        items = [part for part in items.split(",") if part.strip()]
+    weights = {name: 0.0 for name in MODEL_KEYS}
+    for item in items:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Ağırlık 'model=değer' biçiminde olmalı: {item!r}")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def normalize_scores(scores: np.ndarray) -> np.ndarray:
+    """Skorları listenin en yüksek değerine böler; negatifler 0 olur."""
+    scores = np.clip(np.asarray(scores, dtype=float), 0.0, None)
+    peak = scores.max() if len(scores) else 0.0
+    return scores / peak if peak > 0 else np.zeros_like(scores)
+
+
+def fuse(
+    candidates: Mapping[str, tuple[Sequence[int], Sequence[float]]],
+    config: HybridConfig,
+    *,
+    top_n: int,
+    exclude: Iterable[int] = (),
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Aday listelerini birleştirir.
+
+    ``candidates``: model -> (skora göre azalan id'ler, skorlar). Eşit füzyon
+    skorunda id'si küçük olan önce gelir. Returns: (id'ler, füzyon skorları).
+    """
+    ids_parts, contrib_parts = [], []
+    for name, (ids, scores) in candidates.items():
+        weight = config.weights.get(name, 0.0)
+        ids = np.asarray(ids, dtype=np.int64)
+        if weight <= 0 or len(ids) == 0:
+            continue
+        if config.method == "rrf":
+            contrib = weight / (config.rrf_k + np.arange(1, len(ids) + 1, dtype=float))
+        else:
+            contrib = weight * normalize_scores(scores)
+        ids_parts.append(ids)
+        contrib_parts.append(contrib)
+    if not ids_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    unified, inverse = np.unique(np.concatenate(ids_parts), return_inverse=True)
+    fused = np.bincount(inverse, weights=np.concatenate(contrib_parts), minlength=len(unified))
+    keep = ~np.isin(unified, np.fromiter(exclude, dtype=np.int64))
+    unified, fused = unified[keep], fused[keep]
+
+    k = min(top_n, len(unified))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    if k < len(unified):
+        part = np.argpartition(-fused, k - 1)[:k]
+        threshold = fused[part].min()
+        part = np.flatnonzero(fused >= threshold)  # eşit skorlular id sırasıyla seçilsin
+    else:
+        part = np.arange(len(unified))
+    order = part[np.lexsort((unified[part], -fused[part]))][:k]
+    return unified[order], fused[order]
@@ -0,0 +1,253 @@
+"""
+MovieLens movieId <-> TMDB id <-> content matris satırı çevirileri.
+
+``links.csv`` bir kez okunup sıralı int dizilerine çevrilir ve
+``models/id_links/<kaynak adı>-<yol özeti>/`` altına sıkıştırılmamış ``.npy`` olarak yazılır;
+sonraki yüklemeler CSV okumadan ``mmap`` ile açılır. Aramalar ``searchsorted``
+ile vektörel yapılır (eksik id'ler ``-1``)::
+
+    links = load_id_links(RAW_DIR / "links.csv")
+    tmdb = links.movie_to_tmdb(ratings["movieId"].to_numpy())
+    rows = content_rows(bundle.tmdb_ids, tmdb)
+
+Tekrar eden kayıtlarda ilk satır kazanır (``drop_duplicates`` ile aynı).
+Kaynak CSV değişirse (boyut/mtime) artefakt otomatik yeniden üretilir.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.atomic_io import publish_dir  # noqa: E402
+
+ID_LINKS_DIR = ROOT_DIR / "models" / "id_links"
+DEFAULT_LINKS_PATH = ROOT_DIR / "data" / "raw" / "links.csv"
+
+ARRAY_NAMES = ("movie_ids", "movie_tmdb", "tmdb_ids", "tmdb_movie")
+META_NAME = "meta.json"
+MISSING = -1
+
+_CACHE: dict[str, "IdLinks"] = {}
+_LOCK = threading.Lock()
+
+
+def _id_dtype(values: np.ndarray) -> type:
+    return np.int32 if len(values) == 0 or values.max() <= np.iinfo(np.int32).max else np.int64
+
+
+def _lookup(keys: np.ndarray, payload: np.ndarray, queries) -> np.ndarray:
+    """Sıralı ``keys`` içinde ``queries``'i arar; bulunanlar için ``payload``, yoksa -1."""
+    queries = np.asarray(queries, dtype=np.int64)
+    result = np.full(queries.shape, MISSING, dtype=np.int64)
+    if len(keys) == 0:
+        return result
+    pos = np.searchsorted(keys, queries)
+    pos = np.minimum(pos, len(keys) - 1)
+    found = keys[pos] == queries
+    result[found] = payload[pos[found]]
+    return result
+
+
+@dataclass(frozen=True)
+class IdLinks:
+    """
+    İki yönlü id çevirisi.
+
+    ``movie_ids`` sıralı MovieLens id'leri, ``movie_tmdb`` onlara hizalı TMDB id'leri;
+    ``tmdb_ids`` sıralı TMDB id'leri, ``tmdb_movie`` onlara hizalı movieId'ler.
+    """
+
+    movie_ids: np.ndarray
+    movie_tmdb: np.ndarray
+    tmdb_ids: np.ndarray
+    tmdb_movie: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.movie_ids)
+
+    def movie_to_tmdb(self, movie_ids) -> np.ndarray:
+        return _lookup(self.movie_ids, self.movie_tmdb, movie_ids)
+
+    def tmdb_to_movie(self, tmdb_ids) -> np.ndarray:
+        return _lookup(self.tmdb_ids, self.tmdb_movie, tmdb_ids)
+
+    def tmdb_of(self, movie_id: int) -> int | None:
+        tmdb_id = int(self.movie_to_tmdb([movie_id])[0])
+        return None if tmdb_id == MISSING else tmdb_id
+
+    def movie_of(self, tmdb_id: int) -> int | None:
+        movie_id = int(self.tmdb_to_movie([tmdb_id])[0])
+        return None if movie_id == MISSING else movie_id
+
+    def row_table(self, row_tmdb_ids) -> np.ndarray:
+        """``movie_ids``'e hizalı content matris satırları (-1 = katalogda yok); bkz. ``content_rows``."""
+        return content_rows(row_tmdb_ids, self.movie_tmdb)
+
+    def movie_to_row(self, movie_ids, row_table: np.ndarray) -> np.ndarray:
+        """movieId -> content matris satırı (``row_table`` ile; yoksa -1)."""
+        return _lookup(self.movie_ids, row_table, movie_ids)
+
+    def has_tmdb(self, tmdb_ids) -> np.ndarray:
+        """Her TMDB id için links'te karşılığı olup olmadığı (bool maske)."""
+        return self.tmdb_to_movie(tmdb_ids) != MISSING
+
+    @classmethod
+    def from_pairs(cls, movie_ids, tmdb_ids) -> "IdLinks":
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        tmdb_ids = np.asarray(tmdb_ids, dtype=np.int64)
+        # np.unique ilk görülme indekslerini verir -> ilk kayıt kazanır
+        movie_keys, movie_first = np.unique(movie_ids, return_index=True)
+        tmdb_keys, tmdb_first = np.unique(tmdb_ids, return_index=True)
+        id_dtype = _id_dtype(np.concatenate([movie_ids, tmdb_ids]))
+        return cls(
+            movie_ids=movie_keys.astype(id_dtype),
+            movie_tmdb=tmdb_ids[movie_first].astype(id_dtype),
+            tmdb_ids=tmdb_keys.astype(id_dtype),
+            tmdb_movie=movie_ids[tmdb_first].astype(id_dtype),
+        )
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "IdLinks":
+        if not path.exists():
+            raise FileNotFoundError(f"links verisi bulunamadı: {path}")
+        links = pd.read_csv(path, usecols=["movieId", "tmdbId"])
+        links["tmdbId"] = pd.to_numeric(links["tmdbId"], errors="coerce")
+        links = links.dropna(subset=["movieId", "tmdbId"])
+        return cls.from_pairs(links["movieId"].to_numpy(), links["tmdbId"].to_numpy())
+
+    def save(self, directory: Path, source: dict | None = None) -> None:
+        """
+        Dizileri geçici klasöre yazıp ``directory`` olarak yayınlar.
+
+        Diğer worker'lar eski dosyaları mmap ile açık tutuyor olabilir; üzerlerine
+        yazılmaz, klasör bütün olarak değiştirilir (bkz. ``atomic_io.publish_dir``).
+        """
+        meta = {"movies": len(self.movie_ids), "tmdb_ids": len(self.tmdb_ids), "source": source or {}}
+
+        def write(tmp: Path) -> None:
+            for name in ARRAY_NAMES:
+                np.save(tmp / f"{name}.npy", getattr(self, name))
+            (tmp / META_NAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        publish_dir(directory, write)
+
+    @classmethod
+    def load(cls, directory: Path, *, mmap: bool = True) -> "IdLinks":
+        mode = "r" if mmap else None
+        return cls(**{name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ARRAY_NAMES})
+
+
+def content_rows(row_tmdb_ids, tmdb_ids) -> np.ndarray:
+    """
+    TMDB id'lerin content matris satırları (katalogda yoksa -1).
+
+    ``row_tmdb_ids`` matris satırlarına hizalı id dizisidir (``bundle.tmdb_ids``);
+    tekrar eden id'de ``ArtifactBundle.id_to_index`` gibi son satır döner.
+    """
+    row_tmdb_ids = np.asarray(row_tmdb_ids, dtype=np.int64)
+    order = np.argsort(row_tmdb_ids, kind="stable")
+    keys = row_tmdb_ids[order]
+    queries = np.asarray(tmdb_ids, dtype=np.int64)
+    result = np.full(queries.shape, MISSING, dtype=np.int64)
+    if len(keys) == 0:
+        return result
+    pos = np.searchsorted(keys, queries, side="right") - 1
+    valid = pos >= 0
+    valid[valid] = keys[pos[valid]] == queries[valid]
+    result[valid] = order[pos[valid]]
+    return result
+
+
+def _source_stamp(path: Path) -> dict:
+    stat = path.stat()
+    return {"path": str(path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def artifact_dir_for(links_path: Path, base_dir: Path = ID_LINKS_DIR) -> Path:
+    """Her kaynak CSV'nin kendi artefaktı olur (``links`` ve ``links_small``, farklı klasörler ayrı)."""
+    links_path = Path(links_path).resolve()
+    digest = hashlib.sha1(str(links_path).encode("utf-8")).hexdigest()[:8]
+    return base_dir / f"{links_path.stem}-{digest}"
+
+
+def _artifact_is_fresh(directory: Path, stamp: dict) -> bool:
+    meta_path = directory / META_NAME
+    if not meta_path.exists() or not all((directory / f"{name}.npy").exists() for name in ARRAY_NAMES):
+        return False
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return False
+    return meta.get("source") == stamp
+
+
+def build_id_links(links_path: Path = DEFAULT_LINKS_PATH, base_dir: Path = ID_LINKS_DIR) -> IdLinks:
+    """CSV'den çeviri dizilerini üretir ve kaydeder."""
+    links_path = Path(links_path)
+    links = IdLinks.from_csv(links_path)
+    links.save(artifact_dir_for(links_path, base_dir), source=_source_stamp(links_path))
+    return links
+
+
+def load_id_links(
+    links_path: Path = DEFAULT_LINKS_PATH,
+    base_dir: Path = ID_LINKS_DIR,
+    *,
+    force_reload: bool = False,
+) -> IdLinks:
+    """
+    Çeviri dizilerini döndürür (process içinde kaynak başına bir kez yüklenir).
+
+    Güncel artefakt varsa CSV hiç okunmaz; yoksa CSV'den üretilip kaydedilir.
+    Kaydetme başarısız olursa (salt okunur dizin) bellekteki sonuç kullanılır.
+    CSV yoksa ama artefakt varsa artefakt kullanılır.
+    """
+    links_path = Path(links_path)
+    directory = artifact_dir_for(links_path, base_dir)
+    key = str(links_path.resolve())
+    with _LOCK:
+        if not force_reload and key in _CACHE:
+            return _CACHE[key]
+
+        if not links_path.exists():
+            if not (directory / META_NAME).exists():
+                raise FileNotFoundError(f"links verisi bulunamadı: {links_path}")
+            links = IdLinks.load(directory)
+        elif _artifact_is_fresh(directory, _source_stamp(links_path)):
+            links = IdLinks.load(directory)
+        else:
+            links = IdLinks.from_csv(links_path)
+            try:
+                links.save(directory, source=_source_stamp(links_path))
+            except OSError as exc:
+                print(f"⚠️ id_links artefaktı kaydedilemedi, bellekte kullanılacak: {exc}")
+
+        _CACHE[key] = links
+        return links
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="links.csv'den id çeviri artefaktı üretir")
+    parser.add_argument("links", type=Path, nargs="*", default=[DEFAULT_LINKS_PATH, DEFAULT_LINKS_PATH.with_name("links_small.csv")])
+    args = parser.parse_args()
+    for path in args.links:
+        if not path.exists():
+            print(f"⏭️  Atlandı (yok): {path}")
+            continue
+        links = build_id_links(path)
+        print(f"✅ {path.name}: {len(links):,} movieId -> {artifact_dir_for(path)}")
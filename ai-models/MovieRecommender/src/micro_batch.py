@@ -0,0 +1,98 @@
+"""
+Eşzamanlı istekleri küçük gruplar halinde tek çağrıda işleyen mikro-batch zamanlayıcı.
+
+Her çağıran ``submit`` ile kendi girdisini verir ve sonucunu bekler. Açık bir
+grup yoksa gelen istek grubun lideri olur: en fazla ``max_wait_ms`` boyunca
+(veya grup ``max_batch_size``'a ulaşana kadar) diğer istekleri toplar, sonra
+``batch_fn(girdiler)``'i kendi thread'inde çağırıp sonuçları dağıtır::
+
+    batcher = MicroBatcher(lambda items: [score(x) for x in items], max_batch_size=32, max_wait_ms=2)
+    result = batcher.submit(item)  # thread'ler arasında güvenli, bloklar
+
+Arka plan thread'i yoktur (gunicorn ``preload_app`` ile fork sonrası da çalışır).
+O anda işlenen başka grup yoksa lider beklemeden çalışır; böylece boşta tek
+isteğe gecikme eklenmez, yük altında ise istekler bir önceki grup hesaplanırken
+birikir. ``batch_fn`` hata verirse hata gruptaki tüm çağıranlara iletilir.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.items: list = []
+        self.results: list | None = None
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+        self.full = threading.Event()
+
+
+class MicroBatcher(Generic[T, R]):
+    """``batch_fn(list[T]) -> list[R]`` çağrısını eşzamanlı ``submit``'ler arasında paylaştırır."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[T]], Sequence[R]],
+        *,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        on_batch: Callable[[int, float], None] | None = None,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._on_batch = on_batch  # (grup boyutu, liderin toplama için beklediği saniye)
+        self._lock = threading.Lock()
+        self._open: _Batch | None = None
+        self._running = 0
+
+    def submit(self, item: T) -> R:
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            position = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_batch_size:
+                self._open = None  # sonraki istek yeni grup açar
+                batch.full.set()
+            busy = self._running > 0
+
+        if leader:
+            self._run(batch, wait=busy)
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[position]
+
+    def _run(self, batch: _Batch, *, wait: bool) -> None:
+        started = time.perf_counter()
+        if wait and self.max_wait > 0:
+            batch.full.wait(self.max_wait)
+        with self._lock:
+            if self._open is batch:
+                self._open = None
+            self._running += 1
+        waited = time.perf_counter() - started
+        try:
+            results = list(self.batch_fn(batch.items))
+            if len(results) != len(batch.items):
+                raise RuntimeError(f"batch_fn {len(batch.items)} girdi için {len(results)} sonuç döndürdü")
+            batch.results = results
+        except BaseException as exc:  # noqa: BLE001 - gruptaki herkese iletilir
+            batch.error = exc
+        finally:
+            with self._lock:
+                self._running -= 1
+            batch.done.set()
+        if self._on_batch is not None:
+            self._on_batch(len(batch.items), waited)
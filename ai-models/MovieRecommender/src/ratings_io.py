@@ -0,0 +1,76 @@
+"""
+Ratings CSV okuma yardımcıları (ARL, Item-CF ve değerlendirme araçları için ortak).
+
+``read_ratings`` dosyayı parça parça okur ve zaman filtresini her parçaya
+uygular; kesim tarihinden önceki dilimle eğitim yapmak için geçici CSV
+yazmaya veya tüm dosyayı belleğe almaya gerek kalmaz.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+RATINGS_COLUMNS = ("userId", "movieId", "rating", "timestamp")
+RATINGS_DTYPES = {"userId": "int64", "movieId": "int64", "rating": "float64", "timestamp": "int64"}
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def parse_cutoff(value: str | int | float) -> int:
+    """
+    Kesim zamanını Unix timestamp'e çevirir.
+
+    Sayı (``1104537600``) veya ISO tarih (``2005-01-01``, UTC kabul edilir) alır.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def read_ratings(
+    path: Path,
+    *,
+    before: int | None = None,
+    since: int | None = None,
+    usecols: Sequence[str] = RATINGS_COLUMNS,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    Ratings dosyasını okur; ``before``/``since`` verilirse zaman filtresi uygular.
+
+    ``before``: sadece ``timestamp < before`` olan satırlar (eğitim dilimi).
+    ``since``: sadece ``timestamp >= since`` olan satırlar (test dilimi).
+    Filtre yoksa dosya tek seferde okunur.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Ratings dosyası bulunamadı: {path}")
+
+    columns = list(usecols)
+    if (before is not None or since is not None) and "timestamp" not in columns:
+        columns.append("timestamp")
+    dtypes = {col: RATINGS_DTYPES[col] for col in columns if col in RATINGS_DTYPES}
+
+    if before is None and since is None:
+        return pd.read_csv(path, usecols=columns, dtype=dtypes)
+
+    parts = []
+    for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize):
+        mask = pd.Series(True, index=chunk.index)
+        if before is not None:
+            mask &= chunk["timestamp"] < before
+        if since is not None:
+            mask &= chunk["timestamp"] >= since
+        parts.append(chunk[mask])
+    if not parts:
+        return pd.DataFrame({col: pd.Series(dtype=RATINGS_DTYPES.get(col)) for col in usecols})
+    ratings = pd.concat(parts, ignore_index=True)
+    return ratings[list(usecols)]
@@ -25,6 +25,13 @@ RAW_DATA_DIR = ROOT_DIR / "data" / "raw"
 PROCESSED_DATA_DIR = ROOT_DIR / "data" / "processed"
 MODELS_DIR = ROOT_DIR / "models"
 
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.ratings_io import read_ratings  # noqa: E402
+from src.stage_timer import StageTimer  # noqa: E402
+from src.title_index import index_for_frame  # noqa: E402
+
 MAPPING_PATH = MODELS_DIR / "movie_mapping.pkl"
 RULES_PATH = MODELS_DIR / "association_rules.pkl"
 ARTIFACT_METADATA_PATH = MODELS_DIR / "artifacts_meta.json"
@@ -38,35 +45,50 @@ DEFAULT_MIN_LIFT = 1.0
 DEFAULT_MIN_MOVIE_LIKES = 10  # 5 → 10: Daha az film → 2x daha hızlı
 
 
-def load_raw_data(raw_dir: Path = RAW_DATA_DIR) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Ham CSV dosyalarını okur; dosya eksikse açıklayıcı hata verir."""
+def load_raw_data(
+    raw_dir: Path = RAW_DATA_DIR,
+    ratings_before: int | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Ham CSV dosyalarını okur; dosya eksikse açıklayıcı hata verir.
+
+    ``ratings_before`` (Unix timestamp) verilirse sadece bu andan önceki
+    rating'ler okunur (zamana göre train/test ayrımı için).
+    """
     required_files = ["ratings_small.csv", "links_small.csv", "movies_metadata.csv"]
     missing = [f for f in required_files if not (raw_dir / f).exists()]
     if missing:
         missing_list = ", ".join(missing)
         raise FileNotFoundError(f"Missing raw data files in {raw_dir}: {missing_list}")
 
-    ratings = pd.read_csv(
-        raw_dir / "ratings_small.csv",
-        dtype={"userId": "int64", "movieId": "int64", "rating": "float64", "timestamp": "int64"},
-        usecols=["userId", "movieId", "rating", "timestamp"],
-    )
+    ratings = read_ratings(raw_dir / "ratings_small.csv", before=ratings_before)
     links = pd.read_csv(raw_dir / "links_small.csv")
     metadata = pd.read_csv(raw_dir / "movies_metadata.csv", low_memory=False)
     return ratings, links, metadata
 
 
 def build_movie_mapping(links_df: pd.DataFrame, metadata_df: pd.DataFrame) -> pd.DataFrame:
-    """links_small ve movies_metadata'dan movieId -> title tablosu üretir."""
+    """
+    links_small ve movies_metadata'dan movieId -> title tablosu üretir.
+
+    ``tmdbId`` id tabanlı API istekleri, ``year`` (vizyon yılı, bilinmiyorsa 0) aynı
+    adlı filmleri ayırt etmek içindir.
+    """
     links = links_df[["movieId", "tmdbId"]].copy()
     links["tmdbId"] = pd.to_numeric(links["tmdbId"], errors="coerce").astype("Int64")
 
     metadata = metadata_df[["id", "title"]].copy()
     metadata["id"] = pd.to_numeric(metadata["id"], errors="coerce").astype("Int64")
+    if "release_date" in metadata_df:
+        metadata["year"] = pd.to_datetime(metadata_df["release_date"], errors="coerce").dt.year
+    else:
+        metadata["year"] = 0
 
     merged = links.merge(metadata, how="left", left_on="tmdbId", right_on="id")
-    mapping = merged[["movieId", "title"]].dropna(subset=["title"]).copy()
+    mapping = merged[["movieId", "tmdbId", "title", "year"]].dropna(subset=["title"]).copy()
     mapping["movieId"] = mapping["movieId"].astype("int64")
+    mapping["tmdbId"] = mapping["tmdbId"].astype("int64")
+    mapping["year"] = mapping["year"].fillna(0).astype("int32")
 
     # Aynı movieId için tekrarları temizle
     mapping = mapping.drop_duplicates(subset="movieId").reset_index(drop=True)
@@ -124,20 +146,40 @@ def generate_association_rules(
     min_confidence: float = DEFAULT_MIN_CONFIDENCE,
     min_lift: float = DEFAULT_MIN_LIFT,
     max_len: int = 2,
+    timer: StageTimer | None = None,
 ) -> pd.DataFrame:
-    """Apriori + association_rules ile kuralları üretir ve filtreler."""
+    """
+    Apriori + association_rules ile kuralları üretir ve filtreler.
+    ``timer`` verilirse "apriori" ve "rules" aşamaları buna kaydedilir.
+    """
     if basket_df.empty:
         return pd.DataFrame()
 
+    timer = timer if timer is not None else StageTimer()
     basket_bool = basket_df.astype(bool)
     # verbose=1 ile progress gösterimi (kullanıcı beklerken ne olduğunu görür)
     print(f"🔄 Apriori çalışıyor... (min_support={min_support:.3f}, matris boyutu: {basket_bool.shape})")
-    frequent_itemsets = apriori(basket_bool, min_support=min_support, use_colnames=True, max_len=max_len, verbose=1)
+    with timer.stage("apriori") as stage:
+        frequent_itemsets = apriori(basket_bool, min_support=min_support, use_colnames=True, max_len=max_len, verbose=1)
+        stage.rows = len(frequent_itemsets)
     if frequent_itemsets.empty:
         print("⚠️ Frequent itemset bulunamadı!")
         return pd.DataFrame()
 
     print(f"✅ {len(frequent_itemsets)} frequent itemset bulundu. Kurallar üretiliyor...")
+    with timer.stage("rules") as stage:
+        rules = _rules_from_itemsets(frequent_itemsets, min_support, min_confidence, min_lift)
+        stage.rows = len(rules)
+    return rules
+
+
+def _rules_from_itemsets(
+    frequent_itemsets: pd.DataFrame,
+    min_support: float,
+    min_confidence: float,
+    min_lift: float,
+) -> pd.DataFrame:
+    """Frequent itemset'lerden eşikleri geçen kuralları skorlu ve sıralı döndürür."""
     rules = association_rules(frequent_itemsets, metric="lift", min_threshold=min_lift)
     if rules.empty:
         return pd.DataFrame()
@@ -193,6 +235,7 @@ def artifact_params_match(metadata: dict | None, *,
     min_lift: float,
     min_movie_likes: int,
     max_len: int,
+    ratings_before: int | None = None,
 ) -> bool:
     """Metadata içindeki parametreler istenen değerlerle örtüşüyor mu?"""
     if not metadata:
@@ -204,6 +247,7 @@ def artifact_params_match(metadata: dict | None, *,
         and float(metadata.get("min_lift", -1)) == float(min_lift)
         and int(metadata.get("min_movie_likes", -1)) == int(min_movie_likes)
         and int(metadata.get("max_len", -1)) == int(max_len)
+        and metadata.get("ratings_before") == ratings_before
     )
 
 
@@ -211,40 +255,52 @@ def prepare_and_save_artifacts(
     raw_dir: Path = RAW_DATA_DIR,
     mapping_path: Path = MAPPING_PATH,
     rules_path: Path = RULES_PATH,
+    metadata_path: Path = ARTIFACT_METADATA_PATH,
     min_rating_for_like: float = DEFAULT_MIN_RATING,
     min_support: float = DEFAULT_MIN_SUPPORT,
     min_confidence: float = DEFAULT_MIN_CONFIDENCE,
     min_lift: float = DEFAULT_MIN_LIFT,
     min_movie_likes: int = DEFAULT_MIN_MOVIE_LIKES,
     max_len: int = 2,
+    ratings_before: int | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Tam pipeline: veriyi okuyup mapping ve kural tablolarını üretir ve kaydeder.
+    ``ratings_before`` verilirse kurallar sadece bu andan önceki rating'lerle çıkarılır.
     Dönen tuple: (mapping_df, rules_df)
     """
     print("\n" + "="*60)
     print("🎬 FİLM ÖNERİ SİSTEMİ - MODEL OLUŞTURMA")
     print("="*60)
     
+    timer = StageTimer()
     print("\n📂 Adım 1/5: Ham veriler yükleniyor...")
-    ratings, links, metadata = load_raw_data(raw_dir)
+    with timer.stage("load") as stage:
+        ratings, links, metadata = load_raw_data(raw_dir, ratings_before=ratings_before)
+        stage.rows = len(ratings)
+    if ratings_before is not None:
+        print(f"   ⏱️  Sadece timestamp < {ratings_before} olan rating'ler kullanılıyor")
     print(f"   ✅ {len(ratings):,} rating, {len(links):,} link, {len(metadata):,} film metadata yüklendi")
 
     print("\n🗺️  Adım 2/5: Film mapping oluşturuluyor...")
-    mapping_df = build_movie_mapping(links, metadata)
-    save_movie_mapping(mapping_df, mapping_path)
+    with timer.stage("mapping") as stage:
+        mapping_df = build_movie_mapping(links, metadata)
+        stage.rows = len(mapping_df)
     print(f"   ✅ {len(mapping_df):,} film eşleştirildi")
 
     print(f"\n⭐ Adım 3/5: Beğenilen filmler filtreleniyor (rating >= {min_rating_for_like})...")
-    liked = filter_liked_ratings(ratings, min_rating=min_rating_for_like)
-    print(f"   ✅ {len(liked):,} beğeni bulundu")
-    
-    print(f"\n🎯 Adım 4/5: Az izlenen filmler eleniyor (min_likes >= {min_movie_likes})...")
-    liked = filter_infrequent_movies(liked, min_likes=min_movie_likes)
+    with timer.stage("filter") as stage:
+        liked = filter_liked_ratings(ratings, min_rating=min_rating_for_like)
+        print(f"   ✅ {len(liked):,} beğeni bulundu")
+        print(f"\n🎯 Adım 4/5: Az izlenen filmler eleniyor (min_likes >= {min_movie_likes})...")
+        liked = filter_infrequent_movies(liked, min_likes=min_movie_likes)
+        stage.rows = len(liked)
     print(f"   ✅ {liked['movieId'].nunique():,} film kaldı")
     
     print("\n📊 Adım 5/5: User-Movie matrix ve association rules oluşturuluyor...")
-    basket_df = build_user_movie_matrix(liked)
+    with timer.stage("basket") as stage:
+        basket_df = build_user_movie_matrix(liked)
+        stage.rows = basket_df.shape[0]
     print(f"   ℹ️  Matrix boyutu: {basket_df.shape[0]:,} kullanıcı × {basket_df.shape[1]:,} film")
     print(f"   ℹ️  Bu işlem 30-60 saniye sürebilir...")
 
@@ -254,8 +310,12 @@ def prepare_and_save_artifacts(
         min_confidence=min_confidence,
         min_lift=min_lift,
         max_len=max_len,
+        timer=timer,
     )
-    save_association_rules(rules_df, rules_path)
+    with timer.stage("save") as stage:
+        save_movie_mapping(mapping_df, mapping_path)
+        save_association_rules(rules_df, rules_path)
+        stage.rows = len(rules_df)
     print(f"   ✅ {len(rules_df):,} kural oluşturuldu ve kaydedildi")
 
     metadata = {
@@ -265,8 +325,11 @@ def prepare_and_save_artifacts(
         "min_lift": float(min_lift),
         "min_movie_likes": int(min_movie_likes),
         "max_len": int(max_len),
+        "ratings_before": ratings_before,
+        "build_stages": timer.as_dict(),
     }
-    save_artifact_metadata(metadata)
+    save_artifact_metadata(metadata, metadata_path)
+    print(timer.report())
     
     print("\n" + "="*60)
     print("🎉 MODEL BAŞARIYLA OLUŞTURULDU!")
@@ -274,81 +337,47 @@ def prepare_and_save_artifacts(
     print(f"📁 Dosyalar kaydedildi:")
     print(f"   • {mapping_path}")
     print(f"   • {rules_path}")
-    print(f"   • {ARTIFACT_METADATA_PATH}")
+    print(f"   • {metadata_path}")
     print("\n💡 İpucu: Parametreler değişmedikçe bir daha bu işlem yapılmayacak!")
     print("="*60 + "\n")
     
     return mapping_df, rules_df
 
 
-def _normalize_title(title: str) -> str:
-    return title.strip().lower()
-
-
 def _titles_to_movie_ids(titles: Sequence[str], mapping_df: pd.DataFrame) -> tuple[list[int], list[str]]:
     """
-    Girilen film adlarını movieId listesine çevirir.
+    Girilen film adlarını movieId listesine çevirir (tam, yıl ayrımlı veya bulanık eşleşme).
     Dönen tuple: (bulunan_ids, olmayan_title_listesi)
     """
-    mapping_df = mapping_df.copy()
-    mapping_df["norm_title"] = mapping_df["title"].astype(str).apply(_normalize_title)
-    title_to_id = mapping_df.drop_duplicates(subset="norm_title").set_index("norm_title")["movieId"]
-
-    found_ids: list[int] = []
-    missing_titles: list[str] = []
-    for title in titles:
-        movie_id = title_to_id.get(_normalize_title(title))
-        if movie_id is None or pd.isna(movie_id):
-            missing_titles.append(title)
-        else:
-            found_ids.append(int(movie_id))
+    found_ids, missing_titles, _ = index_for_frame(mapping_df).resolve(titles, partial=False)
     return found_ids, missing_titles
 
 
-def recommend_with_association_rules(
-    liked_titles: Sequence[str],
-    top_n: int = 10,
-    mapping_path: Path = MAPPING_PATH,
-    rules_path: Path = RULES_PATH,
-) -> tuple[pd.DataFrame, list[str]]:
-    """
-    Kaydedilmiş association rules ile öneri üretir.
+RESULT_COLUMNS = ["title", "movieId", "score", "confidence", "lift", "support"]
 
-    Parameters
-    ----------
-    liked_titles : list[str]
-        Kullanıcının sevdiği / izlediği film adları.
-    top_n : int, optional
-        Döndürülecek öneri sayısı.
 
-    Returns
-    -------
-    tuple[pd.DataFrame, list[str]]
-        (öneriler DataFrame, bulunamayan film adları listesi)
-        DataFrame kolonları: title, movieId, score, confidence, lift, support
+def recommend_by_movie_ids(
+    liked_ids: Iterable[int],
+    rules_df: pd.DataFrame,
+    mapping_df: pd.DataFrame | None = None,
+    top_n: int = 10,
+) -> pd.DataFrame:
     """
-    empty_result = (pd.DataFrame(columns=["title", "movieId", "score", "confidence", "lift", "support"]), [])
-    
-    if not liked_titles:
-        return empty_result
+    movieId listesinden doğrudan öneri üretir (başlık çözümlemesi yapmaz).
 
-    mapping_df = load_movie_mapping(mapping_path)
-    rules_df = load_association_rules(rules_path)
-    if rules_df.empty:
-        return empty_result
-
-    liked_ids, missing_titles = _titles_to_movie_ids(liked_titles, mapping_df)
-    if not liked_ids:
-        # Hiç film bulunamadıysa boş öneri döndür.
-        return (pd.DataFrame(columns=["title", "movieId", "score", "confidence", "lift", "support"]), missing_titles)
-
-    liked_set: Set[int] = set(liked_ids)
+    Kurallar ve mapping çağıran tarafından bir kez yüklenip verilir; toplu
+    değerlendirme gibi tekrar eden çağrılarda pickle'lar yeniden okunmaz.
+    ``mapping_df`` verilmezse ``title`` kolonu boş kalır.
+    """
+    liked_set: Set[int] = {int(mid) for mid in liked_ids}
+    if not liked_set or rules_df.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
 
     # Antecedents tamamen liked_set'in alt kümesi olan kurallar
     subset_mask = rules_df["antecedents"].apply(lambda ants: bool(ants) and ants.issubset(liked_set))
     candidate_rules = rules_df[subset_mask]
     if candidate_rules.empty:
-        return (pd.DataFrame(columns=["title", "movieId", "score", "confidence", "lift", "support"]), missing_titles)
+        return pd.DataFrame(columns=RESULT_COLUMNS)
 
     suggestions: list[dict] = []
     for _, row in candidate_rules.iterrows():
@@ -366,7 +395,7 @@ def recommend_with_association_rules(
             )
 
     if not suggestions:
-        return (pd.DataFrame(columns=["title", "movieId", "score", "confidence", "lift", "support"]), missing_titles)
+        return pd.DataFrame(columns=RESULT_COLUMNS)
 
     recommendation_df = (
         pd.DataFrame(suggestions)
@@ -380,12 +409,54 @@ def recommend_with_association_rules(
         .reset_index()
     )
 
-    recommendation_df = recommendation_df.merge(mapping_df[["movieId", "title"]], on="movieId", how="left")
-    recommendation_df = recommendation_df[
-        ["title", "movieId", "score", "confidence", "lift", "support"]
-    ].sort_values(["score", "confidence", "lift"], ascending=False)
+    if mapping_df is not None:
+        recommendation_df = recommendation_df.merge(mapping_df[["movieId", "title"]], on="movieId", how="left")
+    else:
+        recommendation_df["title"] = None
+    recommendation_df = recommendation_df[RESULT_COLUMNS].sort_values(
+        ["score", "confidence", "lift"], ascending=False
+    )
+    return recommendation_df.head(top_n)
+
+
+def recommend_with_association_rules(
+    liked_titles: Sequence[str],
+    top_n: int = 10,
+    mapping_path: Path = MAPPING_PATH,
+    rules_path: Path = RULES_PATH,
+) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Kaydedilmiş association rules ile öneri üretir.
+
+    Parameters
+    ----------
+    liked_titles : list[str]
+        Kullanıcının sevdiği / izlediği film adları.
+    top_n : int, optional
+        Döndürülecek öneri sayısı.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, list[str]]
+        (öneriler DataFrame, bulunamayan film adları listesi)
+        DataFrame kolonları: title, movieId, score, confidence, lift, support
+    """
+    empty_result = (pd.DataFrame(columns=RESULT_COLUMNS), [])
+    
+    if not liked_titles:
+        return empty_result
+
+    mapping_df = load_movie_mapping(mapping_path)
+    rules_df = load_association_rules(rules_path)
+    if rules_df.empty:
+        return empty_result
+
+    liked_ids, missing_titles = _titles_to_movie_ids(liked_titles, mapping_df)
+    if not liked_ids:
+        # Hiç film bulunamadıysa boş öneri döndür.
+        return (pd.DataFrame(columns=RESULT_COLUMNS), missing_titles)
 
-    return (recommendation_df.head(top_n), missing_titles)
+    return (recommend_by_movie_ids(liked_ids, rules_df, mapping_df, top_n=top_n), missing_titles)
 
 
 if __name__ == "__main__":
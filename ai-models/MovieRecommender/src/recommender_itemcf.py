@@ -4,8 +4,10 @@ Profesyonel Standart: Tip korumalı, modüler ve artifact tabanlı yapı.
 """
 from __future__ import annotations
 
+import json
 import pickle
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Sequence
 
@@ -22,25 +24,38 @@ MODELS_DIR = ROOT_DIR / "models"
 # RATINGS_PATH = RAW_DATA_DIR / "ratings.csv"  <-- Bunu yoruma al veya sil
 RATINGS_PATH = RAW_DATA_DIR / "ratings_small.csv" # <-- Sadece bunu kullan
 
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.atomic_io import replace_file  # noqa: E402
+from src.ratings_io import parse_cutoff, read_ratings  # noqa: E402
+from src.stage_timer import StageTimer  # noqa: E402
+from src.title_index import index_for_frame  # noqa: E402
+
 MAPPING_PATH = MODELS_DIR / "movie_mapping.pkl"    # ARL'den gelen ortak mapping
 ITEM_SIM_PATH = MODELS_DIR / "item_similarity.pkl" # Bizim üreteceğimiz model
+ITEM_META_PATH = MODELS_DIR / "item_similarity_meta.json"  # Build parametreleri ve aşama süreleri
 
 # Parametreler
 MIN_VOTES_PER_MOVIE = 10  # Gürültüyü azaltmak için az oy alanları ele
 
-def load_data() -> pd.DataFrame:
-    """Ratings verisini yükler ve doğrular."""
-    if not RATINGS_PATH.exists():
+def load_data(ratings_before: int | None = None) -> pd.DataFrame:
+    """
+    Ratings verisini yükler ve doğrular.
+
+    ``ratings_before`` (Unix timestamp) verilirse sadece öncesindeki rating'ler okunur.
+    """
+    path = RATINGS_PATH
+    if not path.exists():
         # Yedek kontrol (data klasöründe olabilir mi?)
-        alt_path = ROOT_DIR / "data" / "ratings_small.csv"
-        if alt_path.exists():
-            print(f"📂 Veri okunuyor: {alt_path.name}")
-            return pd.read_csv(alt_path)
-        raise FileNotFoundError(f"Ratings dosyası bulunamadı: {RATINGS_PATH}")
+        path = ROOT_DIR / "data" / "ratings_small.csv"
+        if not path.exists():
+            raise FileNotFoundError(f"Ratings dosyası bulunamadı: {RATINGS_PATH}")
     
-    print(f"📂 Veri okunuyor: {RATINGS_PATH.name}")
-    df = pd.read_csv(RATINGS_PATH)
-    return df
+    print(f"📂 Veri okunuyor: {path.name}")
+    if ratings_before is not None:
+        print(f"   ⏱️  Sadece timestamp < {ratings_before} olan rating'ler")
+    return read_ratings(path, before=ratings_before)
 
 def create_item_similarity_matrix(ratings: pd.DataFrame) -> pd.DataFrame:
     """
@@ -81,12 +96,40 @@ def create_item_similarity_matrix(ratings: pd.DataFrame) -> pd.DataFrame:
     return item_sim_df
 
 def save_model(sim_df: pd.DataFrame):
-    """Hesaplanan modeli diske kaydeder."""
+    """Hesaplanan modeli diske kaydeder (geçici dosya + rename; okuyan yarım pickle görmez)."""
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    with open(ITEM_SIM_PATH, "wb") as f:
-        pickle.dump(sim_df, f)
+    replace_file(ITEM_SIM_PATH, lambda f: pickle.dump(sim_df, f))
     print(f"💾 Model kaydedildi: {ITEM_SIM_PATH}")
 
+def build_model(ratings_before: int | None = None) -> pd.DataFrame:
+    """
+    Tam build: veriyi okur, benzerlik matrisini hesaplar, modeli ve meta JSON'u kaydeder.
+    Meta JSON aşama bazında süre/bellek/satır sayılarını içerir.
+    """
+    timer = StageTimer()
+    with timer.stage("load") as stage:
+        ratings = load_data(ratings_before=ratings_before)
+        stage.rows = len(ratings)
+    with timer.stage("similarity") as stage:
+        sim_df = create_item_similarity_matrix(ratings)
+        stage.rows = sim_df.shape[0]
+    with timer.stage("save") as stage:
+        save_model(sim_df)
+        stage.rows = sim_df.shape[0]
+
+    meta = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "ratings_path": str(RATINGS_PATH),
+        "ratings_before": ratings_before,
+        "min_votes_per_movie": MIN_VOTES_PER_MOVIE,
+        "movie_count": int(sim_df.shape[0]),
+        "build_stages": timer.as_dict(),
+    }
+    payload = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+    replace_file(ITEM_META_PATH, lambda f: f.write(payload))
+    print(timer.report())
+    return sim_df
+
 def load_model() -> pd.DataFrame:
     """Modeli diskten yükler."""
     if not ITEM_SIM_PATH.exists():
@@ -94,59 +137,23 @@ def load_model() -> pd.DataFrame:
     with open(ITEM_SIM_PATH, "rb") as f:
         return pickle.load(f)
 
-def recommend_item_based(
-    liked_titles: Sequence[str], 
-    top_n: int = 10
-) -> tuple[pd.DataFrame, list[str]]:
-    """
-    Dışarıdan çağrılacak ana öneri fonksiyonu.
-    
-    Returns:
-        (results_df, missing_titles_list)
+def recommend_by_movie_ids(
+    liked_ids: Sequence[int],
+    sim_df: pd.DataFrame,
+    top_n: int = 10,
+    id_to_title: dict[int, str] | None = None,
+) -> pd.DataFrame:
     """
-    # 1. Gerekli dosyaları yükle
-    try:
-        sim_df = load_model()
-        # Mapping dosyası ARL tarafından oluşturulmuş olmalı
-        if not MAPPING_PATH.exists():
-            # ARL modülünü çağırıp oluşturmayı dene (Fallback)
-            print("⚠️ Mapping dosyası bulunamadı, oluşturulmaya çalışılıyor...")
-            try:
-                from src import recommender_arl
-                recommender_arl.prepare_and_save_artifacts()
-            except Exception:
-                raise FileNotFoundError("Mapping dosyası yok. Lütfen önce 'src/recommender_arl.py' çalıştırın.")
-        
-        mapping_df = pd.read_pickle(MAPPING_PATH)
-    except FileNotFoundError as e:
-        return pd.DataFrame(), [str(e)]
+    movieId listesinden doğrudan öneri üretir; modelde olmayan id'ler atlanır.
 
-    # 2. Title -> ID Dönüşümü
-    # Case insensitive eşleşme için
-    mapping_df['title_lower'] = mapping_df['title'].str.lower().str.strip()
-    title_to_id = mapping_df.set_index("title_lower")["movieId"].to_dict()
-    id_to_title = mapping_df.set_index("movieId")["title"].to_dict()
-    
-    liked_ids = []
-    missing_titles = []
-    
-    for title in liked_titles:
-        clean_title = title.strip().lower()
-        if clean_title in title_to_id:
-            mid = title_to_id[clean_title]
-            # Modelde bu ID var mı? (Filtrelemeye takılmış olabilir)
-            if mid in sim_df.index:
-                liked_ids.append(mid)
-            else:
-                # Film var ama yeterli oyu yoksa
-                missing_titles.append(f"{title} (Yetersiz Veri)")
-        else:
-            missing_titles.append(title)
-            
+    Benzerlik matrisi çağıran tarafından bir kez yüklenip verilir.
+    Kolonlar: movieId, title, similarity
+    """
+    liked_ids = [mid for mid in liked_ids if mid in sim_df.index]
     if not liked_ids:
-        return pd.DataFrame(), missing_titles
+        return pd.DataFrame(columns=["movieId", "title", "similarity"])
 
-    # 3. Öneri Hesaplama (Weighted Average Logic)
+    # Öneri Hesaplama (Weighted Average Logic)
     # Seçilen filmlerin benzerlik sütunlarını al
     selected_sims = sim_df.loc[:, liked_ids]
     
@@ -160,7 +167,8 @@ def recommend_item_based(
     # Sırala ve ilk N'i al
     top_scores = avg_scores.sort_values(ascending=False).head(top_n)
     
-    # 4. Sonuçları Formatla
+    # Sonuçları Formatla
+    id_to_title = id_to_title or {}
     results = []
     for mid, score in top_scores.items():
         results.append({
@@ -169,15 +177,101 @@ def recommend_item_based(
             "similarity": score
         })
         
-    return pd.DataFrame(results), missing_titles
+    return pd.DataFrame(results, columns=["movieId", "title", "similarity"])
+
+
+def load_resources() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Benzerlik matrisini ve (ARL tarafından üretilen) movie mapping'i yükler.
+
+    Returns:
+        (sim_df, mapping_df)
+    """
+    sim_df = load_model()
+    # Mapping dosyası ARL tarafından oluşturulmuş olmalı
+    if not MAPPING_PATH.exists():
+        # ARL modülünü çağırıp oluşturmayı dene (Fallback)
+        print("⚠️ Mapping dosyası bulunamadı, oluşturulmaya çalışılıyor...")
+        try:
+            from src import recommender_arl
+            recommender_arl.prepare_and_save_artifacts()
+        except Exception:
+            raise FileNotFoundError("Mapping dosyası yok. Lütfen önce 'src/recommender_arl.py' çalıştırın.")
+
+    return sim_df, pd.read_pickle(MAPPING_PATH)
+
+
+def resolve_titles(
+    liked_titles: Sequence[str],
+    mapping_df: pd.DataFrame,
+    sim_df: pd.DataFrame,
+) -> tuple[list[int], list[str], dict[int, str]]:
+    """
+    Başlıkları (büyük/küçük harf duyarsız; tam eşleşme yoksa yıl ayrımlı veya
+    bulanık) modeldeki movieId'lere çevirir.
+
+    Returns:
+        (liked_ids, missing_titles, id_to_title)
+    """
+    index = index_for_frame(mapping_df)
+    
+    liked_ids = []
+    missing_titles = []
+    
+    for title in liked_titles:
+        mid, _ = index.lookup(title, partial=False)
+        if mid is None:
+            missing_titles.append(title)
+        elif mid in sim_df.index:
+            # Modelde bu ID var (filtrelemeye takılmamış)
+            liked_ids.append(mid)
+        else:
+            # Film var ama yeterli oyu yoksa
+            missing_titles.append(f"{title} (Yetersiz Veri)")
+    return liked_ids, missing_titles, index.id_to_title
+
+
+def recommend_item_based(
+    liked_titles: Sequence[str], 
+    top_n: int = 10
+) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Dışarıdan çağrılacak ana öneri fonksiyonu.
+    
+    Returns:
+        (results_df, missing_titles_list)
+    """
+    # 1. Gerekli dosyaları yükle
+    try:
+        sim_df, mapping_df = load_resources()
+    except FileNotFoundError as e:
+        return pd.DataFrame(), [str(e)]
+
+    # 2. Title -> ID Dönüşümü
+    liked_ids, missing_titles, id_to_title = resolve_titles(liked_titles, mapping_df, sim_df)
+    if not liked_ids:
+        return pd.DataFrame(), missing_titles
+
+    # 3-4. Öneri Hesaplama ve Formatlama
+    return recommend_by_movie_ids(liked_ids, sim_df, top_n=top_n, id_to_title=id_to_title), missing_titles
 
 # --- PIPELINE ÇALIŞTIRICI ---
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Item-Based CF model eğitimi")
+    parser.add_argument(
+        "--before",
+        type=str,
+        default=None,
+        help="Sadece bu zamandan önceki rating'lerle eğit (Unix timestamp veya 2005-01-01)",
+    )
+    cli_args = parser.parse_args()
+
     print("🚀 Item-Based Model Eğitimi Başlatılıyor...")
     try:
-        ratings_data = load_data()
-        sim_matrix = create_item_similarity_matrix(ratings_data)
-        save_model(sim_matrix)
+        before = parse_cutoff(cli_args.before) if cli_args.before else None
+        sim_matrix = build_model(ratings_before=before)
         print("\n✅ İşlem Başarıyla Tamamlandı!")
         print(f"   Model Boyutu: {sim_matrix.shape[0]}x{sim_matrix.shape[1]} film")
     except Exception as e:
@@ -0,0 +1,107 @@
+"""
+Öneri yanıtları için süreç içi LRU + TTL önbellek.
+
+Anahtar çağıran tarafından kurulur; api_server ``(model, artefakt sürümü,
+sıralı id'ler, top_n)`` kullanır. Böylece model yeniden yüklendiğinde eski
+sürümün kayıtları hiç eşleşmez; ``invalidate(model)`` ile de hemen silinir::
+
+    cache = ResponseCache(max_entries=2048, ttl_seconds=600)
+    value = cache.get(key)
+    if value is MISS:
+        value = compute()
+        cache.put(key, value)
+
+Değerler kopyalanmadan saklanır; çağıran taraf döndürülen nesneyi değiştirmemelidir.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+MISS = object()
+
+
+class ResponseCache:
+    """
+    Boyut sınırlı (LRU tahliye) ve süreli (TTL) thread-safe önbellek.
+
+    ``max_entries <= 0`` veya ``ttl_seconds <= 0`` önbelleği kapatır;
+    ``ttl_seconds=None`` kayıtların süresiz tutulmasıdır.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float | None = 600.0,
+        *,
+        on_evict: Callable[[str, int], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._on_evict = on_evict
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (son kullanma zamanı, değer); sıra = en eski kullanılandan yeniye
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and (self.ttl_seconds is None or self.ttl_seconds > 0)
+
+    def _evicted(self, reason: str, count: int = 1) -> None:
+        if count and self._on_evict is not None:
+            self._on_evict(reason, count)
+
+    def get(self, key: Hashable) -> object:
+        """Kayıtlı değer; yoksa veya süresi dolmuşsa ``MISS``."""
+        if not self.enabled:
+            return MISS
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires, value = entry
+            if expires > self._clock():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+        self._evicted("ttl")
+        return MISS
+
+    def put(self, key: Hashable, value: object) -> None:
+        if not self.enabled:
+            return
+        expires = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            overflow = len(self._entries) - self.max_entries
+            for _ in range(max(overflow, 0)):
+                self._entries.popitem(last=False)
+        self._evicted("size", max(overflow, 0))
+
+    def invalidate(self, model: str | None = None) -> int:
+        """
+        ``model`` ile başlayan (tuple anahtarın ilk elemanı) kayıtları siler; None ise hepsini.
+
+        Silinen kayıt sayısını döndürür.
+        """
+        with self._lock:
+            if model is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries if isinstance(key, tuple) and key and key[0] == model]
+                for key in stale:
+                    del self._entries[key]
+                removed = len(stale)
+        self._evicted("invalidate", removed)
+        return removed
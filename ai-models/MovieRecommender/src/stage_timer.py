@@ -0,0 +1,91 @@
+"""
+Build pipeline'ları için hafif aşama zamanlayıcı.
+
+Her aşama için süre, satır sayısı ve bellek kaydedilir; sonuç ``as_dict`` ile
+artefakt meta JSON dosyalarına yazılır::
+
+    timer = StageTimer()
+    with timer.stage("load") as stage:
+        ratings = read_ratings(path)
+        stage.rows = len(ratings)
+    meta["build_stages"] = timer.as_dict()
+
+Bellek ölçümü iki kaynaktan gelir:
+- ``peak_rss_mb``: aşama sonunda sürecin o ana kadarki tepe RSS değeri (``resource``).
+- ``traced_peak_mb``: aşama içindeki Python/numpy tahsis tepesi; sadece
+  ``tracemalloc`` açıksa (``python -X tracemalloc ...``) dolar, aksi halde ek maliyet yoktur.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    """Sürecin şimdiye kadarki tepe RSS değeri (MB); desteklenmiyorsa None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+@dataclass
+class StageRecord:
+    name: str
+    seconds: float = 0.0
+    rows: int | None = None
+    peak_rss_mb: float | None = None
+    traced_peak_mb: float | None = None
+
+
+class StageTimer:
+    """Sıralı build aşamalarının süre/bellek kayıtlarını tutar."""
+
+    def __init__(self) -> None:
+        self.records: list[StageRecord] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """Bir aşamayı ölçer; ``rows`` alanı blok içinde doldurulabilir."""
+        record = StageRecord(name=name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = round(time.perf_counter() - start, 4)
+            record.peak_rss_mb = peak_rss_mb()
+            if tracing:
+                record.traced_peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            self.records.append(record)
+
+    def as_dict(self) -> dict:
+        """Meta JSON'a yazılacak özet."""
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": [asdict(record) for record in self.records],
+        }
+
+    def report(self) -> str:
+        """Konsol için aşama tablosu."""
+        lines = ["⏱️  Aşama süreleri:"]
+        for record in self.records:
+            rows = f"{record.rows:>12,} satır" if record.rows is not None else " " * 18
+            rss = f"{record.peak_rss_mb:>8.1f} MB" if record.peak_rss_mb is not None else ""
+            lines.append(f"   • {record.name:<10} {record.seconds:>9.3f} sn {rows} {rss}")
+        return "\n".join(lines)
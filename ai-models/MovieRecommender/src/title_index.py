@@ -0,0 +1,346 @@
+"""
+Film başlığı -> id çözümlemesi için ortak indeks (tüm öneri modülleri kullanır).
+
+Arama sırası:
+1. Tam eşleşme: normalize edilmiş başlık sözlüğü. Aynı başlıkta birden fazla
+   film varsa yıl verilmişse (``"Heat (1995)"`` veya ``year=``) o yıldaki seçilir,
+   yoksa katalogda ilk gelen.
+2. Kısmi eşleşme (opsiyonel): sorguyu içeren en kısa başlık (eşitlikte katalog
+   sırası); eski ``str.contains`` + ``str.len().idxmin()`` davranışıyla aynıdır.
+3. Bulanık eşleşme (opsiyonel): aksan/noktalama temizlenmiş başlıkların karakter
+   trigram ters indeksi üzerinden Dice benzerliği; yıl uyumu skoru artırır,
+   uyumsuz yıl düşürür. ``MIN_FUZZY_SCORE`` altı eşleşme sayılmaz.
+
+Tam eşleşme sözlüğü kurulumda, trigram indeksleri ilk ihtiyaçta bir kez kurulur;
+tam eşleşen isteklerde ek maliyet yoktur. DataFrame'den çözümleme yapan
+modüller ``index_for_frame`` ile aynı mapping nesnesi için aynı indeksi
+paylaşır (trigram indeksi de istek başına yeniden kurulmaz).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+MIN_PARTIAL_CHARS = 4  # Daha kısa sorgular kısmi eşleşmeye girmez ("Up" her şeye uyar)
+MIN_FUZZY_SCORE = 0.5
+FUZZY_CANDIDATES = 5
+YEAR_MATCH_BONUS = 0.15
+YEAR_NEAR_BONUS = 0.05  # ±1 yıl (farklı ülkelerde vizyon tarihi)
+YEAR_MISMATCH_PENALTY = 0.1
+
+_YEAR_SUFFIX = re.compile(r"^(?P<title>.*?)\s*[\(\[]\s*(?P<year>(?:18|19|20)\d{2})\s*[\)\]]\s*$")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_TRAILING_ARTICLE = re.compile(r"^(?P<title>.+), (?P<article>the|a|an)$")
+
+
+def normalize_title(title: str) -> str:
+    return str(title).strip().lower()
+
+
+def fuzzy_key(title: str) -> str:
+    """
+    Bulanık karşılaştırma anahtarı: aksanlar atılır, küçük harf, noktalama boşluk olur.
+
+    ``"Matrix, The"`` -> ``"the matrix"``, ``"Amélie"`` -> ``"amelie"``.
+    """
+    text = unicodedata.normalize("NFKD", str(title))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold().strip()
+    match = _TRAILING_ARTICLE.match(text)
+    if match:
+        text = f"{match['article']} {match['title']}"
+    text = text.replace("&", " and ")
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def split_title_year(title: str) -> tuple[str, int | None]:
+    """``"Heat (1995)"`` -> ``("Heat", 1995)``; yıl yoksa ``(title, None)``."""
+    match = _YEAR_SUFFIX.match(str(title))
+    if not match:
+        return str(title), None
+    return match["title"], int(match["year"])
+
+
+def year_from_date(value) -> int | None:
+    """``"1995-12-15"`` gibi bir tarihten yıl; geçersizse None."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    text = str(value)
+    return int(text[:4]) if len(text) >= 4 and text[:4].isdigit() else None
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _fuzzy_grams(key: str) -> set[str]:
+    return _trigrams(f"  {key} ") if key else set()
+
+
+@dataclass(frozen=True)
+class TitleMatch:
+    """Bulanık aramada bir aday."""
+
+    movie_id: int
+    title: str
+    year: int | None
+    score: float
+
+
+class TitleIndex:
+    """Başlık listesi üzerinde tam, kısmi ve bulanık arama."""
+
+    def __init__(
+        self,
+        titles: Sequence[str],
+        ids: Sequence[int],
+        years: Sequence[int | None] | None = None,
+        *,
+        normalize: Callable[[str], str] = normalize_title,
+    ) -> None:
+        self.normalize = normalize
+        self.titles = [str(title) for title in titles]
+        self.ids = [int(movie_id) for movie_id in ids]
+        self.id_to_title = dict(zip(self.ids, self.titles))
+        if years is None:
+            self.years = np.zeros(len(self.titles), dtype=np.int32)
+        else:
+            self.years = np.array([year or 0 for year in years], dtype=np.int32)  # 0 = bilinmiyor
+        self._normalized = [normalize(title) for title in self.titles]
+
+        # Tam eşleşme: başlık -> satırlar (katalog sırasıyla)
+        self._exact: dict[str, list[int]] = {}
+        for row, norm in enumerate(self._normalized):
+            self._exact.setdefault(norm, []).append(row)
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        title_col: str = "title",
+        id_col: str = "movieId",
+        year_col: str | None = "year",
+        **kwargs,
+    ) -> "TitleIndex":
+        years = None
+        if year_col is not None and year_col in frame.columns:
+            years = pd.to_numeric(frame[year_col], errors="coerce").fillna(0).astype(int).tolist()
+        return cls(frame[title_col].astype(str).tolist(), frame[id_col].tolist(), years, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    # -- tam eşleşme -------------------------------------------------------
+
+    def _pick_by_year(self, rows: list[int], year: int | None) -> int:
+        if year is not None and len(rows) > 1:
+            for row in rows:
+                if self.years[row] == year:
+                    return row
+        return rows[0]
+
+    def exact_row(self, title: str, year: int | None = None) -> int | None:
+        """Tam eşleşen satır; başlık sonunda ``(yıl)`` varsa yılsız hali de denenir."""
+        rows = self._exact.get(self.normalize(title))
+        if rows:
+            return self._pick_by_year(rows, year)
+        base, parsed_year = split_title_year(title)
+        if parsed_year is not None:
+            rows = self._exact.get(self.normalize(base))
+            if rows:
+                return self._pick_by_year(rows, year if year is not None else parsed_year)
+        return None
+
+    def exact(self, title: str, year: int | None = None) -> int | None:
+        """Normalize edilmiş tam eşleşmenin id'si; yoksa None."""
+        row = self.exact_row(title, year)
+        return None if row is None else self.ids[row]
+
+    # -- kısmi eşleşme -----------------------------------------------------
+
+    @cached_property
+    def _lengths(self) -> np.ndarray:
+        return np.fromiter((len(title) for title in self.titles), dtype=np.int64, count=len(self.titles))
+
+    @cached_property
+    def _substring_postings(self) -> dict[str, np.ndarray]:
+        postings: dict[str, list[int]] = defaultdict(list)
+        for row, norm in enumerate(self._normalized):
+            for gram in _trigrams(norm):
+                postings[gram].append(row)
+        return {gram: np.asarray(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def partial_row(self, title: str) -> int | None:
+        """Sorguyu içeren en kısa başlığın satır numarası; yoksa None."""
+        query = self.normalize(title)
+        if len(query) < MIN_PARTIAL_CHARS:
+            return None
+        lists = [self._substring_postings.get(gram) for gram in _trigrams(query)]
+        if any(rows is None for rows in lists):
+            return None
+        candidates = min(lists, key=len)
+        # Kısadan uzuna (eşitlikte katalog sırası) dene; ilk doğrulanan en iyisidir
+        order = np.lexsort((candidates, self._lengths[candidates]))
+        for row in candidates[order]:
+            if query in self._normalized[row]:
+                return int(row)
+        return None
+
+    # -- bulanık eşleşme ---------------------------------------------------
+
+    @cached_property
+    def _fuzzy_index(self) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """(trigram -> satırlar, satır başına trigram sayısı)."""
+        postings: dict[str, list[int]] = defaultdict(list)
+        sizes = np.zeros(len(self.titles), dtype=np.int32)
+        for row, title in enumerate(self.titles):
+            grams = _fuzzy_grams(fuzzy_key(title))
+            sizes[row] = len(grams)
+            for gram in grams:
+                postings[gram].append(row)
+        return {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}, sizes
+
+    def _fuzzy_scores(self, title: str, year: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """Ortak trigramı olan satırlar ve yıl ayarlı Dice skorları."""
+        postings, sizes = self._fuzzy_index
+        grams = _fuzzy_grams(fuzzy_key(title))
+        lists = [postings[gram] for gram in grams if gram in postings]
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.titles))
+        rows = np.flatnonzero(shared)
+        scores = 2.0 * shared[rows] / (len(grams) + sizes[rows])
+        if year is not None:
+            known = self.years[rows]
+            delta = np.abs(known - year)
+            scores = scores + np.where(
+                known == 0,
+                0.0,
+                np.where(delta == 0, YEAR_MATCH_BONUS, np.where(delta == 1, YEAR_NEAR_BONUS, -YEAR_MISMATCH_PENALTY)),
+            )
+        return rows, scores
+
+    def search(self, title: str, year: int | None = None, *, limit: int = FUZZY_CANDIDATES) -> list[TitleMatch]:
+        """
+        Bulanık arama: en yüksek skorlu ``limit`` aday (skor, sonra kısa başlık, sonra katalog sırası).
+
+        Başlık sonundaki ``(yıl)`` ayrıştırılır ve ``year`` verilmemişse kullanılır.
+        """
+        base, parsed_year = split_title_year(title)
+        year = year if year is not None else parsed_year
+        rows, scores = self._fuzzy_scores(base, year)
+        if len(rows) == 0:
+            return []
+        if len(rows) > limit:
+            keep = np.argpartition(-scores, limit - 1)[:limit]
+            threshold = scores[keep].min()
+            keep = np.flatnonzero(scores >= threshold)  # eşit skorlular sıralamada kaybolmasın
+            rows, scores = rows[keep], scores[keep]
+        order = np.lexsort((rows, self._lengths[rows], -scores))[:limit]
+        return [
+            TitleMatch(
+                movie_id=self.ids[row],
+                title=self.titles[row],
+                year=int(self.years[row]) or None,
+                score=round(float(scores[i]), 4),
+            )
+            for i, row in zip(order, rows[order])
+        ]
+
+    def fuzzy(self, title: str, year: int | None = None, *, min_score: float = MIN_FUZZY_SCORE) -> TitleMatch | None:
+        """En iyi bulanık aday; skoru ``min_score`` altındaysa None."""
+        matches = self.search(title, year, limit=1)
+        if not matches or matches[0].score < min_score:
+            return None
+        return matches[0]
+
+    # -- birleşik arama ----------------------------------------------------
+
+    def lookup(
+        self,
+        title: str,
+        *,
+        year: int | None = None,
+        partial: bool = True,
+        fuzzy: bool = True,
+    ) -> tuple[int | None, str | None]:
+        """
+        Başlığı id'ye çevirir.
+
+        Returns:
+            (id veya None, yöntem: "exact" / "partial" / "fuzzy" / None)
+        """
+        movie_id = self.exact(title, year)
+        if movie_id is not None:
+            return movie_id, "exact"
+        if partial:
+            row = self.partial_row(title)
+            if row is not None:
+                return self.ids[row], "partial"
+        if fuzzy:
+            match = self.fuzzy(title, year)
+            if match is not None:
+                return match.movie_id, "fuzzy"
+        return None, None
+
+    def resolve(
+        self,
+        titles: Iterable[str],
+        *,
+        partial: bool = True,
+        fuzzy: bool = True,
+    ) -> tuple[list[int], list[str], int]:
+        """
+        Birden çok başlığı çözer.
+
+        Returns:
+            (bulunan id'ler, bulunamayan başlıklar, tam olmayan eşleşme sayısı)
+        """
+        found: list[int] = []
+        missing: list[str] = []
+        fallbacks = 0
+        for title in titles:
+            movie_id, method = self.lookup(title, partial=partial, fuzzy=fuzzy)
+            if movie_id is None:
+                missing.append(title)
+            else:
+                found.append(movie_id)
+                fallbacks += method != "exact"
+        return found, missing, fallbacks
+
+
+FRAME_INDEX_CACHE_SIZE = 4  # ARL, item-CF ve API mapping'leri aynı anda tutulabilsin
+
+_frame_indexes: OrderedDict[int, tuple[pd.DataFrame, TitleIndex]] = OrderedDict()
+_frame_indexes_lock = threading.Lock()
+
+
+def index_for_frame(frame: pd.DataFrame) -> TitleIndex:
+    """
+    ``frame`` için ``TitleIndex.from_frame`` sonucunu mapping nesnesi başına bir kez kurar.
+
+    Anahtar nesne kimliğidir; mapping yeniden yüklenince (yeni nesne) indeks de
+    yeniden kurulur. Aynı nesne yerinde değiştirilirse indeks güncellenmez.
+    """
+    key = id(frame)
+    cached = _frame_indexes.get(key)
+    if cached is not None and cached[0] is frame:
+        return cached[1]
+    with _frame_indexes_lock:
+        cached = _frame_indexes.get(key)
+        if cached is None or cached[0] is not frame:
+            cached = (frame, TitleIndex.from_frame(frame))
+            _frame_indexes[key] = cached
+            while len(_frame_indexes) > FRAME_INDEX_CACHE_SIZE:
+                _frame_indexes.popitem(last=False)
+        else:
+            _frame_indexes.move_to_end(key)
+        return cached[1]
@@ -21,6 +21,7 @@ if str(CONTENT_BASED_DIR) not in sys.path:
 import evaluate_content as ec  # type: ignore  # noqa: E402  (lazy path injection)
 import recommender_content as rc  # type: ignore  # noqa: E402
 import user_profile as up  # type: ignore  # noqa: E402
+from src.id_links import load_id_links  # type: ignore  # noqa: E402
 
 DEFAULT_RATINGS_PATH = ec.DEFAULT_RATINGS
 DEFAULT_LINKS_PATH = ec.DEFAULT_LINKS
@@ -182,8 +183,7 @@ def load_bundle(force_reload: bool = False) -> rc.ArtifactBundle:
 
 @lru_cache(maxsize=4)
 def get_movielens_tmdb_ids(path: str) -> set[int]:
-    links = ec.load_links(Path(path))
-    return set(links["tmdbId"].astype(int).tolist())
+    return set(load_id_links(Path(path)).tmdb_ids.tolist())
 
 
 def _apply_movielens_postprocessing(
@@ -303,8 +303,7 @@ def get_metadata_stats() -> MetadataStats:
     bundle = load_bundle()
     metadata = bundle.metadata
     total_titles = len(metadata)
-    overview_series = metadata["overview"] if "overview" in metadata else pd.Series(dtype=str)
-    non_empty_overview = overview_series.fillna("").astype(str).str.strip().ne("").sum()
+    non_empty_overview = sum(1 for text in bundle.overviews.tolist() if text.strip())
     genres_series = metadata["genres"] if "genres" in metadata else pd.Series(dtype=str)
     genres_col = genres_series.dropna().astype(str)
     distinct_genres = (
@@ -349,6 +348,7 @@ def evaluate_model(
     n_hidden: int = 1,
     smart_hide: bool = True,
     min_hide_similarity: float = 0.05,
+    workers: int = 1,
 ) -> EvaluationResponse:
     eval_kwargs = dict(
         ratings_path=ratings_path,
@@ -363,6 +363,7 @@ def evaluate_model(
         n_hidden=n_hidden,
         smart_hide=smart_hide,
         min_hide_similarity=min_hide_similarity,
+        workers=workers,
     )
     if restrict_to_movielens and _EVAL_HAS_RESTRICT:
         eval_kwargs["restrict_to_links"] = True
@@ -407,6 +408,22 @@ def evaluate_model(
     )
 
 
+def _comparison_error(threshold: float, error: str) -> ComparisonResult:
+    return ComparisonResult(
+        threshold=threshold,
+        hit_rate=0.0,
+        hits=0,
+        tested=0,
+        skipped=0,
+        avg_hide_similarity=0.0,
+        total_hidden=0,
+        avg_recall=0.0,
+        error=error,
+        hit_rate_user=0.0,
+        users_with_hit=0,
+    )
+
+
 def evaluate_multiple_thresholds(
     *,
     ratings_path: Path,
@@ -421,9 +438,13 @@ def evaluate_multiple_thresholds(
     thresholds: list[float],
     n_hidden: int = 1,
     restrict_to_movielens: bool = False,
+    workers: int = 1,
 ) -> list[ComparisonResult]:
     """
     Farklı benzerlik eşikleri ile karşılaştırmalı değerlendirme yap.
+
+    Ratings verisi ve kullanıcı grupları bir kez hazırlanır; ``workers > 1``
+    iken tüm eşikler aynı process havuzunda değerlendirilir.
     
     Args:
         thresholds: Test edilecek benzerlik eşikleri listesi (örn: [0.10, 0.20, 0.30, 0.40])
@@ -431,70 +452,48 @@ def evaluate_multiple_thresholds(
     Returns:
         Her eşik için ComparisonResult listesi
     """
-    results = []
-    
-    for threshold in thresholds:
-        try:
-            response = evaluate_model(
-                ratings_path=ratings_path,
-                links_path=links_path,
-                n_users=n_users,
-                top_n=top_n,
-                mode=mode,
-                rating_threshold=rating_threshold,
-                min_liked=min_liked,
-                method=method,
-                seed=seed,
-                restrict_to_movielens=restrict_to_movielens,
-                n_hidden=n_hidden,
-                smart_hide=True,
-                min_hide_similarity=threshold,
-            )
-            
-            if response.error:
-                results.append(ComparisonResult(
-                    threshold=threshold,
-                    hit_rate=0.0,
-                    hits=0,
-                    tested=0,
-                    skipped=0,
-                    avg_hide_similarity=0.0,
-                    total_hidden=0,
-                    avg_recall=0.0,
-                    error=response.error,
-                    hit_rate_user=0.0,
-                    users_with_hit=0,
-                ))
-            else:
-                results.append(ComparisonResult(
-                    threshold=threshold,
-                    hit_rate=response.hit_rate or 0.0,
-                    hits=response.hits or 0,
-                    tested=response.tested or 0,
-                    skipped=response.skipped_no_similar or 0,
-                    avg_hide_similarity=response.avg_hide_similarity or 0.0,
-                    total_hidden=response.total_hidden or 0,
-                    avg_recall=response.avg_recall or 0.0,
-                    error=None,
-                    hit_rate_user=response.hit_rate_user or 0.0,
-                    users_with_hit=response.users_with_hit or 0,
-                ))
-        except Exception as exc:
-            results.append(ComparisonResult(
-                threshold=threshold,
-                hit_rate=0.0,
-                hits=0,
-                tested=0,
-                skipped=0,
-                avg_hide_similarity=0.0,
-                total_hidden=0,
-                avg_recall=0.0,
-                error=str(exc),
-                hit_rate_user=0.0,
-                users_with_hit=0,
-            ))
-    
-    return results
+    configs = [
+        ec.EvalConfig(
+            n_users=n_users,
+            top_n=top_n,
+            mode=mode,
+            min_liked=min_liked,
+            method=method,
+            seed=seed,
+            n_hidden=n_hidden,
+            smart_hide=True,
+            min_hide_similarity=threshold,
+        )
+        for threshold in thresholds
+    ]
+    try:
+        outputs = ec.evaluate_variants(
+            ratings_path,
+            links_path,
+            configs,
+            rating_threshold=rating_threshold,
+            restrict_to_links=restrict_to_movielens,
+            workers=workers,
+        )
+    except Exception as exc:
+        return [_comparison_error(threshold, str(exc)) for threshold in thresholds]
+
+    return [
+        ComparisonResult(
+            threshold=threshold,
+            hit_rate=result["hit_rate"] or 0.0,
+            hits=result["hits"] or 0,
+            tested=result["tested"] or 0,
+            skipped=result.get("skipped_no_similar") or 0,
+            avg_hide_similarity=result.get("avg_hide_similarity") or 0.0,
+            total_hidden=result.get("total_hidden") or 0,
+            avg_recall=result.get("avg_recall") or 0.0,
+            error=None,
+            hit_rate_user=result.get("hit_rate_user") or 0.0,
+            users_with_hit=result.get("users_with_hit") or 0,
+        )
+        for threshold, result in zip(thresholds, outputs)
+    ]
 
 
 def _extract_year(value: object) -> str | None:
@@ -567,7 +566,7 @@ def get_user_genre_profile(
     try:
         # Ratings ve links yükle
         ratings_df = ec.load_ratings(ratings_path)
-        links_df = ec.load_links(links_path)
+        links = load_id_links(links_path)
         bundle = rc.load_artifacts()
         
         # Kullanıcının beğendiği filmler
@@ -577,18 +576,15 @@ def get_user_genre_profile(
         if liked.empty:
             return None
         
-        # MovieId -> TmdbId mapping
-        movie_map = links_df.drop_duplicates(subset="movieId").set_index("movieId")["tmdbId"].to_dict()
+        # MovieId -> TmdbId (-1 = links'te yok)
+        liked_tmdb_ids = links.movie_to_tmdb(liked["movieId"].to_numpy()).tolist()
         
         # Genre sayımı
         genre_counter: dict[str, int] = {}
         total_movies = 0
         
-        for _, row in liked.iterrows():
-            movie_id = int(row["movieId"])
-            tmdb_id = movie_map.get(movie_id)
-            
-            if tmdb_id is None:
+        for tmdb_id in liked_tmdb_ids:
+            if tmdb_id < 0:
                 continue
             
             # Metadata'dan genre al
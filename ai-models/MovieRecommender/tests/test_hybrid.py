@@ -0,0 +1,102 @@
+"""src/hybrid.py: füzyon sıralaması, ağırlıklar ve skor normalizasyonu."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from src.hybrid import HybridConfig, fuse, normalize_scores, parse_weights  # noqa: E402
+
+
+def test_rrf_sums_contributions_across_models():
+    config = HybridConfig(weights={"arl": 1.0, "itemcf": 1.0}, method="rrf", rrf_k=1.0)
+    ids, scores = fuse({"arl": ([10, 20], [9.0, 1.0]), "itemcf": ([20, 30], [5.0, 4.0])}, config, top_n=3)
+    # 20: 1/3 + 1/2, 10: 1/2, 30: 1/3
+    assert ids.tolist() == [20, 10, 30]
+    assert scores == pytest.approx([1 / 3 + 1 / 2, 1 / 2, 1 / 3])
+
+
+def test_ties_are_ordered_by_id():
+    config = HybridConfig(weights={"arl": 1.0, "itemcf": 1.0}, method="rrf")
+    candidates = {"arl": ([7, 3], [1.0, 0.5]), "itemcf": ([3, 7], [1.0, 0.5])}
+    ids, scores = fuse(candidates, config, top_n=2)
+    assert ids.tolist() == [3, 7]
+    assert scores[0] == scores[1]
+
+
+def test_ties_at_the_cut_keep_the_smallest_ids():
+    config = HybridConfig(weights={"arl": 1.0}, method="weighted")
+    candidates = {"arl": ([40, 30, 20, 10], [1.0, 1.0, 1.0, 1.0])}
+    ids, _ = fuse(candidates, config, top_n=2)
+    assert ids.tolist() == [10, 20]
+
+
+def test_weighted_normalizes_each_list_by_its_peak():
+    config = HybridConfig(weights={"arl": 1.0, "content": 0.5}, method="weighted")
+    candidates = {"arl": ([1, 2], [200.0, 50.0]), "content": ([2, 3], [0.8, 0.4])}
+    ids, scores = fuse(candidates, config, top_n=3)
+    # 1: 200/200, 2: 50/200 + 0.5 * 0.8/0.8, 3: 0.5 * 0.4/0.8
+    assert ids.tolist() == [1, 2, 3]
+    assert scores == pytest.approx([1.0, 0.75, 0.25])
+
+
+def test_zero_weight_model_contributes_nothing():
+    config = HybridConfig(weights={"arl": 1.0, "itemcf": 0.0}, method="rrf")
+    assert config.active_models == ["arl"]
+    ids, _ = fuse({"arl": ([1], [1.0]), "itemcf": ([2, 1], [1.0, 0.5])}, config, top_n=5)
+    assert ids.tolist() == [1]
+
+
+def test_all_zero_weights_and_empty_lists_return_empty():
+    zero = HybridConfig(weights={"arl": 0.0}, method="rrf")
+    ids, scores = fuse({"arl": ([1, 2], [1.0, 0.5])}, zero, top_n=5)
+    assert ids.size == 0 and scores.size == 0
+
+    config = HybridConfig()
+    ids, scores = fuse({"arl": ([], []), "content": ([], [])}, config, top_n=5)
+    assert ids.dtype == np.int64 and ids.size == 0 and scores.size == 0
+    assert fuse({}, config, top_n=5)[0].size == 0
+
+
+def test_exclude_and_top_n():
+    config = HybridConfig(weights={"arl": 1.0}, method="rrf")
+    ids, _ = fuse({"arl": ([5, 6, 7], [3.0, 2.0, 1.0])}, config, top_n=5, exclude=[5])
+    assert ids.tolist() == [6, 7]
+    assert fuse({"arl": ([5], [1.0])}, config, top_n=5, exclude={5})[0].size == 0
+    assert fuse({"arl": ([5, 6], [1.0, 0.5])}, config, top_n=0)[0].size == 0
+
+
+def test_config_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        HybridConfig(method="borda")
+    with pytest.raises(ValueError):
+        HybridConfig(weights={"knn": 1.0})
+    with pytest.raises(ValueError):
+        HybridConfig(weights={"arl": -1.0})
+
+
+def test_parse_weights_fills_missing_models_with_zero():
+    assert parse_weights("arl=1, content=0.5") == {"arl": 1.0, "itemcf": 0.0, "content": 0.5}
+    assert parse_weights(["itemcf=2"]) == {"arl": 0.0, "itemcf": 2.0, "content": 0.0}
+    assert parse_weights("") == {"arl": 0.0, "itemcf": 0.0, "content": 0.0}
+
+
+def test_parse_weights_rejects_malformed_items():
+    with pytest.raises(ValueError):
+        parse_weights("arl")
+    with pytest.raises(ValueError):
+        parse_weights("arl=abc")
+    # Bilinmeyen model adını HybridConfig reddeder
+    with pytest.raises(ValueError):
+        HybridConfig(weights=parse_weights("knn=1"))
+
+
+def test_normalize_scores():
+    assert normalize_scores([2.0, 1.0, -3.0]).tolist() == [1.0, 0.5, 0.0]
+    assert normalize_scores([-1.0, 0.0]).tolist() == [0.0, 0.0]
+    assert normalize_scores(np.array([])).size == 0
@@ -0,0 +1,107 @@
+"""src/micro_batch.py: sonuç dağıtımı, lider devri ve hata iletimi."""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from src.micro_batch import MicroBatcher  # noqa: E402
+
+TIMEOUT = 5.0
+
+
+class BlockingBatchFn:
+    """İlk grubu ``release`` gelene kadar bekletir; böylece sonraki istekler birikir."""
+
+    def __init__(self, fail_on=None) -> None:
+        self.batches = []
+        self.first_started = threading.Event()
+        self.release = threading.Event()
+        self.fail_on = fail_on
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if len(self.batches) == 1:
+            self.first_started.set()
+            assert self.release.wait(TIMEOUT)
+        if self.fail_on is not None and self.fail_on in items:
+            raise ValueError(f"bad item: {self.fail_on}")
+        return [item * 10 for item in items]
+
+
+def submit_in_threads(batcher, items):
+    results, errors = {}, {}
+
+    def call(item):
+        try:
+            results[item] = batcher.submit(item)
+        except Exception as exc:  # noqa: BLE001
+            errors[item] = exc
+
+    threads = [threading.Thread(target=call, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def join_all(threads):
+    for thread in threads:
+        thread.join(TIMEOUT)
+        assert not thread.is_alive()
+
+
+def test_idle_submit_runs_immediately():
+    sizes = []
+    batcher = MicroBatcher(lambda items: [item + 1 for item in items], max_wait_ms=10_000,
+                           on_batch=lambda size, waited: sizes.append((size, waited)))
+    assert batcher.submit(1) == 2
+    assert sizes[0][0] == 1 and sizes[0][1] < 1.0  # boşta lider beklemez
+
+
+def test_requests_arriving_during_a_batch_are_grouped_and_handed_a_new_leader():
+    batch_fn = BlockingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=10_000)
+
+    first, first_results, _ = submit_in_threads(batcher, [1])
+    assert batch_fn.first_started.wait(TIMEOUT)
+    # İlk grup çalışırken gelenlerden biri yeni grubun lideri olur; grup dolunca çalışır
+    others, results, errors = submit_in_threads(batcher, [2, 3, 4])
+    join_all(others)
+    batch_fn.release.set()
+    join_all(first)
+
+    assert first_results == {1: 10}
+    assert results == {2: 20, 3: 30, 4: 40} and errors == {}
+    assert batch_fn.batches[0] == [1]
+    assert sorted(batch_fn.batches[1]) == [2, 3, 4]
+    assert len(batch_fn.batches) == 2
+
+
+def test_batch_error_is_raised_in_every_caller_of_the_group():
+    batch_fn = BlockingBatchFn(fail_on=3)
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=10_000)
+
+    first, first_results, _ = submit_in_threads(batcher, [1])
+    assert batch_fn.first_started.wait(TIMEOUT)
+    others, results, errors = submit_in_threads(batcher, [2, 3, 4])
+    join_all(others)
+    batch_fn.release.set()
+    join_all(first)
+
+    assert first_results == {1: 10}
+    assert results == {}
+    assert sorted(errors) == [2, 3, 4]
+    assert all(isinstance(exc, ValueError) for exc in errors.values())
+    # Hata sonraki grupları etkilemez
+    assert batcher.submit(5) == 50
+
+
+def test_result_count_mismatch_raises():
+    batcher = MicroBatcher(lambda items: [], max_wait_ms=0)
+    with pytest.raises(RuntimeError):
+        batcher.submit(1)
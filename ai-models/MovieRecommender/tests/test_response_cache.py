@@ -0,0 +1,93 @@
+"""src/response_cache.py: TTL, LRU tahliyesi ve invalidate."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.append(str(PROJECT_DIR))
+
+from src.response_cache import MISS, ResponseCache  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(**kwargs):
+    evictions = []
+    cache = ResponseCache(on_evict=lambda reason, count: evictions.append((reason, count)), **kwargs)
+    return cache, evictions
+
+
+@pytest.mark.parametrize("ttl", [0, 0.0, -5])
+def test_non_positive_ttl_disables_the_cache(ttl):
+    cache, evictions = make_cache(ttl_seconds=ttl)
+    assert not cache.enabled
+    cache.put(("arl", 1), "value")
+    assert cache.get(("arl", 1)) is MISS
+    assert len(cache) == 0 and evictions == []
+
+
+def test_zero_max_entries_disables_the_cache():
+    cache, _ = make_cache(max_entries=0)
+    cache.put("key", "value")
+    assert not cache.enabled and cache.get("key") is MISS
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache, evictions = make_cache(ttl_seconds=10, clock=clock)
+    cache.put("key", "value")
+    clock.now = 9.9
+    assert cache.get("key") == "value"
+    clock.now = 10.0
+    assert cache.get("key") is MISS
+    assert evictions == [("ttl", 1)] and len(cache) == 0
+
+
+def test_none_ttl_never_expires():
+    clock = FakeClock()
+    cache, _ = make_cache(ttl_seconds=None, clock=clock)
+    cache.put("key", "value")
+    clock.now = 1e12
+    assert cache.enabled and cache.get("key") == "value"
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache, evictions = make_cache(max_entries=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" artık en eski
+    cache.put("c", 3)
+    assert cache.get("b") is MISS
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert evictions == [("size", 1)]
+
+
+def test_invalidate_by_model():
+    cache, evictions = make_cache(ttl_seconds=None)
+    cache.put(("arl", 1, (1, 2), 10), "arl")
+    cache.put(("content", 1, (1,), 10), "content")
+    cache.put("plain", "plain")
+    assert cache.invalidate("arl") == 1
+    assert cache.get(("arl", 1, (1, 2), 10)) is MISS
+    assert cache.get(("content", 1, (1,), 10)) == "content"
+    assert cache.get("plain") == "plain"
+    assert cache.invalidate("itemcf") == 0
+    assert evictions == [("invalidate", 1)]
+
+
+def test_invalidate_all():
+    cache, evictions = make_cache(ttl_seconds=None)
+    cache.put(("arl", 1), "a")
+    cache.put(("content", 1), "c")
+    assert cache.invalidate() == 2
+    assert len(cache) == 0
+    assert evictions == [("invalidate", 2)]
@@ -1,5 +1,6 @@
 module.exports = {
   MODEL_1_URL: "http://localhost:9001/recommend",         // Association Rules
   MODEL_2_URL: "http://localhost:9001/recommend/content", // Content-Based
-  MODEL_3_URL: "http://localhost:9001/recommend/itemcf"   // Item-Based Collaborative Filtering
+  MODEL_3_URL: "http://localhost:9001/recommend/itemcf",  // Item-Based Collaborative Filtering
+  MODEL_ALL_URL: "http://localhost:9001/recommend/all"    // All three models in one call
 };
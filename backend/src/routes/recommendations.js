@@ -3,7 +3,7 @@ const router = express.Router();
 const axios = require('axios');
 const { Op } = require('sequelize');
 const authMiddleware = require('../middleware/authMiddleware');
-const { MODEL_1_URL, MODEL_2_URL, MODEL_3_URL } = require('../config/recommenderServices');
+const { MODEL_1_URL, MODEL_2_URL, MODEL_3_URL, MODEL_ALL_URL } = require('../config/recommenderServices');
 const { Movie, User } = require('../models');
 const { ensureMoviePoster } = require('../services/posterService');
 const { getTmdbRating } = require('../services/tmdbService');
@@ -17,242 +17,167 @@ async function hydrateMovies(movieIds) {
   });
 }
 
-// Get recommendations from Model 1 (Association Rules)
-router.get('/model1', authMiddleware, async (req, res) => {
-  try {
-    // 1. Get user's favorite movies
-    const user = await User.findByPk(req.user.id, {
-      include: [{ model: Movie, as: 'Favorites' }]
-    });
-
-    if (!user || !user.Favorites || user.Favorites.length === 0) {
-      return res.json([]); // No favorites, no recommendations
-    }
-
-    const likedTitles = user.Favorites.map(m => m.title);
-
-    // 2. Call Python API
-    const response = await axios.post(MODEL_1_URL, { 
-      liked_movies: likedTitles,
-      top_n: 10
-    });
-
-    if (!response.data.success) {
-      console.error('[Model 1] Python API returned error:', response.data.error);
-      throw new Error(response.data.error || 'Unknown error from model service');
-    }
-
-    const recommendations = response.data.recommendations;
-
-    if (recommendations.length === 0) {
-      return res.json([]);
-    }
-
-    // 3. Get recommended titles
-    const recommendedTitles = recommendations.map(r => r.title);
-
-    // 4. Fetch full movie objects from our DB
-    const movies = await Movie.findAll({
-      where: {
-        title: {
-          [Op.in]: recommendedTitles
-        }
-      }
-    });
-
-    // Log missing movies for debugging
-    const foundTitles = movies.map(m => m.title);
-    const missingTitles = recommendedTitles.filter(t => !foundTitles.includes(t));
-    if (missingTitles.length > 0) {
-      console.log('[Model 1] Movies not found in DB:', missingTitles);
-    }
+// Favorites with a TMDB id are sent as ids so neither side matches titles;
+// the rest fall back to titles.
+function buildLikedPayload(favorites) {
+  return {
+    liked_tmdb_ids: favorites.filter(m => m.tmdbId != null).map(m => m.tmdbId),
+    liked_movies: favorites.filter(m => m.tmdbId == null).map(m => m.title),
+    top_n: 10
+  };
+}
 
-    // 5. Create a map of title -> score for ordering
-    const scoreMap = new Map();
-    recommendations.forEach(r => {
-      scoreMap.set(r.title, r.score || 0);
-    });
-    
-    // 6. Ensure posters are available and fetch ratings
-    const moviesWithRatings = await Promise.all(movies.map(async (movie) => {
-      await ensureMoviePoster(movie);
-      const tmdbRating = await getTmdbRating(movie);
-      const movieData = movie.toJSON();
-      movieData.tmdbRating = tmdbRating;
-      movieData.score = scoreMap.get(movie.title) || 0;
-      return movieData;
-    }));
+// Content-Based returns `tmdb_id`, the other models `tmdbId`
+function recommendationTmdbId(r) {
+  return r.tmdbId ?? r.tmdb_id ?? null;
+}
 
-    // 7. Sort by score (descending) to preserve original order
-    moviesWithRatings.sort((a, b) => b.score - a.score);
+// Key linking a recommendation to a DB movie: TMDB id when known, else title
+function recommendationKey(r) {
+  const tmdbId = recommendationTmdbId(r);
+  return tmdbId != null ? `tmdb:${tmdbId}` : `title:${r.title}`;
+}
 
-    res.json(moviesWithRatings);
-  } catch (error) {
-    console.error('Model 1 Error:', error.message);
-    if (error.response) {
-        console.error('Python API Response Data:', error.response.data);
-    }
-    res.json([]);
+function lookupByMovie(map, movie) {
+  if (movie.tmdbId != null && map.has(`tmdb:${movie.tmdbId}`)) {
+    return map.get(`tmdb:${movie.tmdbId}`);
   }
-});
+  return map.get(`title:${movie.title}`);
+}
 
-// Get recommendations from Model 2 (Content-Based)
-router.get('/model2', authMiddleware, async (req, res) => {
-  try {
-    // 1. Get user's favorite movies
-    const user = await User.findByPk(req.user.id, {
-      include: [{ model: Movie, as: 'Favorites' }]
-    });
+// Fetch recommended movies from our DB by TMDB id (title only for id-less results)
+async function findRecommendedMovies(recommendations, label) {
+  const tmdbIds = recommendations.map(recommendationTmdbId).filter(id => id != null);
+  const titles = recommendations.filter(r => recommendationTmdbId(r) == null).map(r => r.title);
+  const conditions = [];
+  if (tmdbIds.length > 0) conditions.push({ tmdbId: { [Op.in]: tmdbIds } });
+  if (titles.length > 0) conditions.push({ title: { [Op.in]: titles } });
+
+  const movies = await Movie.findAll({ where: { [Op.or]: conditions } });
+
+  // Log missing movies for debugging
+  const found = new Set();
+  movies.forEach(m => {
+    if (m.tmdbId != null) found.add(`tmdb:${m.tmdbId}`);
+    found.add(`title:${m.title}`);
+  });
+  const missing = recommendations.filter(r => !found.has(recommendationKey(r))).map(r => r.title);
+  if (missing.length > 0) {
+    console.log(`[${label}] Movies not found in DB:`, missing);
+  }
+  return movies;
+}
 
-    if (!user || !user.Favorites || user.Favorites.length === 0) {
-      return res.json([]); 
-    }
+// How each model's results are presented: `field` carries the model score
+const MODEL_VIEWS = {
+  model1: { label: 'Model 1', key: 'association_rules', field: 'score', scoreOf: r => r.score || 0 },
+  model2: { label: 'Model 2', key: 'content_based', field: 'similarity', scoreOf: r => r.similarity || 0 },
+  model3: { label: 'Model 3', key: 'item_based_cf', field: 'similarity', scoreOf: r => r.similarity || r.score || 0 }
+};
+
+// DB movies for one model's recommendations with posters, TMDB ratings and the
+// model score, sorted by that score to preserve the model's order
+async function hydrateRecommendations(recommendations, view) {
+  if (recommendations.length === 0) {
+    return [];
+  }
 
-    const likedTitles = user.Favorites.map(m => m.title);
+  const movies = await findRecommendedMovies(recommendations, view.label);
 
-    // 2. Call Python API
-    const response = await axios.post(MODEL_2_URL, { 
-      liked_movies: likedTitles,
-      top_n: 10
-    });
+  const scoreMap = new Map();
+  recommendations.forEach(r => {
+    scoreMap.set(recommendationKey(r), view.scoreOf(r));
+  });
 
-    if (!response.data.success) {
-      console.error('[Model 2] Python API returned error:', response.data.error);
-      throw new Error(response.data.error || 'Unknown error from model service');
-    }
+  const moviesWithRatings = await Promise.all(movies.map(async (movie) => {
+    await ensureMoviePoster(movie);
+    const tmdbRating = await getTmdbRating(movie);
+    const movieData = movie.toJSON();
+    movieData.tmdbRating = tmdbRating;
+    movieData[view.field] = lookupByMovie(scoreMap, movie) || 0;
+    return movieData;
+  }));
+
+  moviesWithRatings.sort((a, b) => b[view.field] - a[view.field]);
+  return moviesWithRatings;
+}
 
-    const recommendations = response.data.recommendations;
+async function getFavorites(userId) {
+  const user = await User.findByPk(userId, {
+    include: [{ model: Movie, as: 'Favorites' }]
+  });
+  return user && user.Favorites ? user.Favorites : [];
+}
 
-    if (recommendations.length === 0) {
-      return res.json([]);
-    }
+function logModelError(label, error) {
+  console.error(`${label} Error:`, error.message);
+  if (error.response) {
+      console.error('Python API Response Data:', error.response.data);
+  }
+}
 
-    // 3. Get recommended titles with their similarity scores
-    const recommendedTitles = recommendations.map(r => r.title);
+// One route per model; the frontend uses /all, which asks the AI server once
+function singleModelRoute(name, url) {
+  const view = MODEL_VIEWS[name];
+  return async (req, res) => {
+    try {
+      const favorites = await getFavorites(req.user.id);
+      if (favorites.length === 0) {
+        return res.json([]); // No favorites, no recommendations
+      }
 
-    // 4. Fetch full movie objects from our DB
-    const movies = await Movie.findAll({
-      where: {
-        title: {
-          [Op.in]: recommendedTitles
-        }
+      const response = await axios.post(url, buildLikedPayload(favorites));
+      if (!response.data.success) {
+        console.error(`[${view.label}] Python API returned error:`, response.data.error);
+        throw new Error(response.data.error || 'Unknown error from model service');
       }
-    });
 
-    // Log missing movies for debugging
-    const foundTitles = movies.map(m => m.title);
-    const missingTitles = recommendedTitles.filter(t => !foundTitles.includes(t));
-    if (missingTitles.length > 0) {
-      console.log('[Model 2] Movies not found in DB:', missingTitles);
+      res.json(await hydrateRecommendations(response.data.recommendations, view));
+    } catch (error) {
+      logModelError(view.label, error);
+      res.json([]);
     }
-    
-    // 5. Create a map of title -> similarity for ordering
-    const similarityMap = new Map();
-    recommendations.forEach(r => {
-      similarityMap.set(r.title, r.similarity || 0);
-    });
-
-    // 6. Ensure posters are available and fetch ratings
-    const moviesWithRatings = await Promise.all(movies.map(async (movie) => {
-      await ensureMoviePoster(movie);
-      const tmdbRating = await getTmdbRating(movie);
-      const movieData = movie.toJSON();
-      movieData.tmdbRating = tmdbRating;
-      movieData.similarity = similarityMap.get(movie.title) || 0;
-      return movieData;
-    }));
-
-    // 7. Sort by similarity (descending) to preserve original order
-    moviesWithRatings.sort((a, b) => b.similarity - a.similarity);
+  };
+}
 
-    res.json(moviesWithRatings);
+// Get recommendations from Model 1 (Association Rules)
+router.get('/model1', authMiddleware, singleModelRoute('model1', MODEL_1_URL));
 
-  } catch (error) {
-    console.error('Model 2 Error:', error.message);
-    if (error.response) {
-        console.error('Python API Response Data:', error.response.data);
-    }
-    res.json([]);
-  }
-});
+// Get recommendations from Model 2 (Content-Based)
+router.get('/model2', authMiddleware, singleModelRoute('model2', MODEL_2_URL));
 
 // Get recommendations from Model 3 (Item-Based CF)
-router.get('/model3', authMiddleware, async (req, res) => {
-  try {
-    // 1. Get user's favorite movies
-    const user = await User.findByPk(req.user.id, {
-      include: [{ model: Movie, as: 'Favorites' }]
-    });
+router.get('/model3', authMiddleware, singleModelRoute('model3', MODEL_3_URL));
 
-    if (!user || !user.Favorites || user.Favorites.length === 0) {
-      return res.json([]); 
+// Get recommendations from all three models with a single AI server call:
+// favorites are resolved once there and the models are scored concurrently
+router.get('/all', authMiddleware, async (req, res) => {
+  const result = Object.fromEntries(Object.keys(MODEL_VIEWS).map(name => [name, []]));
+  try {
+    const favorites = await getFavorites(req.user.id);
+    if (favorites.length === 0) {
+      return res.json(result);
     }
 
-    const likedTitles = user.Favorites.map(m => m.title);
-
-    // 2. Call Python API
-    const response = await axios.post(MODEL_3_URL, { 
-      liked_movies: likedTitles,
-      top_n: 10
-    });
-
+    const response = await axios.post(MODEL_ALL_URL, buildLikedPayload(favorites));
     if (!response.data.success) {
-      console.error('[Model 3] Python API returned error:', response.data.error);
+      console.error('[All Models] Python API returned error:', response.data.error);
       throw new Error(response.data.error || 'Unknown error from model service');
     }
 
-    const recommendations = response.data.recommendations;
-
-    if (recommendations.length === 0) {
-      return res.json([]);
-    }
-
-    // 3. Get recommended titles
-    const recommendedTitles = recommendations.map(r => r.title);
-
-    // 4. Fetch full movie objects from our DB
-    const movies = await Movie.findAll({
-      where: {
-        title: {
-          [Op.in]: recommendedTitles
-        }
+    await Promise.all(Object.entries(MODEL_VIEWS).map(async ([name, view]) => {
+      const model = response.data.models[view.key];
+      if (!model || !model.success) {
+        console.error(`[${view.label}] Python API returned error:`, model ? model.error : 'missing');
+        return;
       }
-    });
-
-    // Log missing movies for debugging
-    const foundTitles = movies.map(m => m.title);
-    const missingTitles = recommendedTitles.filter(t => !foundTitles.includes(t));
-    if (missingTitles.length > 0) {
-      console.log('[Model 3] Movies not found in DB:', missingTitles);
-    }
-
-    // 5. Create a map of title -> similarity for ordering
-    const similarityMap = new Map();
-    recommendations.forEach(r => {
-      similarityMap.set(r.title, r.similarity || r.score || 0);
-    });
-    
-    // 6. Ensure posters are available and fetch ratings
-    const moviesWithRatings = await Promise.all(movies.map(async (movie) => {
-      await ensureMoviePoster(movie);
-      const tmdbRating = await getTmdbRating(movie);
-      const movieData = movie.toJSON();
-      movieData.tmdbRating = tmdbRating;
-      movieData.similarity = similarityMap.get(movie.title) || 0;
-      return movieData;
+      result[name] = await hydrateRecommendations(model.recommendations, view);
     }));
 
-    // 7. Sort by similarity (descending) to preserve original order
-    moviesWithRatings.sort((a, b) => b.similarity - a.similarity);
-
-    res.json(moviesWithRatings);
-
+    res.json(result);
   } catch (error) {
-    console.error('Model 3 Error:', error.message);
-    if (error.response) {
-        console.error('Python API Response Data:', error.response.data);
-    }
-    res.json([]);
+    logModelError('All Models', error);
+    res.json(result);
   }
 });
 
@@ -12,7 +12,7 @@ interface Movie {
 
 const Home = () => {
   const [movies, setMovies] = useState<Movie[]>([]);
-  const [recommendations, setRecommendations] = useState<Movie[]>([]);
+  const [allRecommendations, setAllRecommendations] = useState<Record<string, Movie[]>>({});
   const [model, setModel] = useState('model1');
   
   // Search & Pagination State
@@ -41,9 +41,13 @@ const Home = () => {
     fetchUserData();
   }, [debouncedSearch, page]);
 
+  // All three models arrive in one request; switching tabs needs no refetch
+  const favoritesKey = favorites.join(',');
   useEffect(() => {
     fetchRecommendations();
-  }, [model]);
+  }, [favoritesKey]);
+
+  const recommendations = allRecommendations[model] || [];
 
   const fetchUserData = async () => {
     try {
@@ -85,8 +89,8 @@ const Home = () => {
 
   const fetchRecommendations = async () => {
     try {
-      const res = await api.get(`/recommendations/${model}`);
-      setRecommendations(res.data);
+      const res = await api.get('/recommendations/all');
+      setAllRecommendations(res.data);
     } catch (err) {
       console.error(err);
     }